@@ -0,0 +1,85 @@
+"""Memory held by decoded list_transactions pages, with and without string pooling
+
+    python benchmarks/decode_memory.py [--records 100000] [--page 1000]
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+
+from brokermint import Client, InMemoryTransport
+
+
+STATUSES = ("listing", "pending", "closed", "cancelled")
+CITIES = ("Denver", "Boulder", "Aurora", "Lakewood", "Golden", "Littleton")
+ROLES = ("Listing Agent", "Buyer Agent", "Escrow Officer", "Lender")
+
+
+def make_page(start: int, n: int) -> bytes:
+    records = [
+        {
+            "id": i,
+            "address": f"{i} Main Street",
+            "city": CITIES[i % len(CITIES)],
+            "state": "CO",
+            "zip": f"80{i % 300:03d}",
+            "status": STATUSES[i % len(STATUSES)],
+            "transaction_type": "Purchase" if i % 3 else "Lease",
+            "price": 350000.0 + i,
+            "closing_date": 1600000000000 + i * 86400000,
+            "owner": {"id": i % 50, "type": "User", "name": f"Agent {i % 50}"},
+            "role": ROLES[i % len(ROLES)],
+        }
+        for i in range(start, start + n)
+    ]
+    return json.dumps(records).encode()
+
+
+def measure(records: int, page: int, intern_strings):
+    pages = {}
+
+    def handler(method, path, params, body):
+        start = int(params.get("starting_from_id") or 1)
+        if start > records:
+            return []
+        if start not in pages:
+            pages[start] = make_page(start, min(page, records - start + 1))
+        return pages[start]
+
+    client = Client(
+        "key",
+        transport=InMemoryTransport(handler),
+        json_backend="json",
+        intern_strings=intern_strings,
+    )
+
+    # Encode every page up front so only decoding is timed and measured
+    list(client.paginate("list_transactions", count=page))
+    start = time.perf_counter()
+    list(client.paginate("list_transactions", count=page))
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    kept = [r for p in client.paginate("list_transactions", count=page) for r in p]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return len(kept), current, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=100000)
+    parser.add_argument("--page", type=int, default=1000)
+    args = parser.parse_args()
+    print(f"{'mode':<22}{'records':>10}{'MiB held':>12}{'seconds':>10}")
+    for name, option in (
+        ("plain", False),
+        ("intern_strings", True),
+        ("intern_strings fields", {"fields": ["city", "state", "status", "role"]}),
+    ):
+        n, held, elapsed = measure(args.records, args.page, option)
+        print(f"{name:<22}{n:>10}{held / 2 ** 20:>12.1f}{elapsed:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
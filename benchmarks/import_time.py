@@ -0,0 +1,59 @@
+"""Measure cold-start cost of importing brokermint and constructing a Client
+
+Each measurement runs in a fresh interpreter so nothing is cached in
+sys.modules.
+
+    python benchmarks/import_time.py [--runs 20]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+
+SNIPPETS = {
+    "python startup": "pass",
+    "import brokermint": "import brokermint",
+    "construct Client": "import brokermint; brokermint.Client('key')",
+    "create session": "import brokermint; brokermint.Client('key').session",
+}
+
+TIMER = """
+import time
+start = time.perf_counter()
+{snippet}
+print(time.perf_counter() - start)
+"""
+
+
+def measure(snippet: str, runs: int):
+    timings = []
+    for _ in range(runs):
+        output = subprocess.check_output(
+            [sys.executable, "-c", TIMER.format(snippet=snippet)]
+        )
+        timings.append(float(output) * 1000)
+    return timings
+
+
+def imported_modules(snippet: str):
+    code = f"import sys; before = set(sys.modules); {snippet}; print(len(set(sys.modules) - before))"
+    return int(subprocess.check_output([sys.executable, "-c", code]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+    print(f"{'':<20}{'median ms':>12}{'min ms':>12}{'modules':>10}")
+    for name, snippet in SNIPPETS.items():
+        timings = measure(snippet, args.runs)
+        print(
+            f"{name:<20}{statistics.median(timings):>12.2f}"
+            f"{min(timings):>12.2f}{imported_modules(snippet):>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Compare JSON backends decoding a large list_transactions page
+
+    python benchmarks/json_decode.py [--records 1000] [--runs 20]
+"""
+
+import argparse
+import gzip
+import json
+import time
+
+from brokermint.decoding import BACKENDS, available, get_loads
+
+
+def make_page(n: int) -> bytes:
+    records = [
+        {
+            "id": 100000 + i,
+            "address": f"{i} Main Street",
+            "city": "Denver",
+            "state": "CO",
+            "zip": "80202",
+            "status": ("listing", "pending", "closed", "cancelled")[i % 4],
+            "price": 350000.0 + i,
+            "closing_date": 1600000000000 + i * 86400000,
+            "owner": {"id": i % 50, "type": "User", "name": "Agent Name"},
+            "custom_attributes": [
+                {"name": "source", "label": "Source", "type": "text", "value": "web"}
+            ],
+        }
+        for i in range(n)
+    ]
+    return json.dumps(records).encode()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=1000)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+    body = make_page(args.records)
+    print(
+        f"page:  {args.records} records, {len(body) / 1024:.0f} KiB raw, "
+        f"{len(gzip.compress(body)) / 1024:.0f} KiB gzip"
+    )
+    print(f"{'backend':<10}{'ms / page':>12}")
+    for backend in BACKENDS[1:]:
+        if not available(backend):
+            print(f"{backend:<10}{'not installed':>12}")
+            continue
+        loads = get_loads(backend)
+        loads(body)
+        start = time.perf_counter()
+        for _ in range(args.runs):
+            loads(body)
+        print(f"{backend:<10}{(time.perf_counter() - start) / args.runs * 1000:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""Stress a single Client shared by many threads and report how throughput scales
+
+Every thread sends GET requests through one client with the circuit breaker,
+hedging and string pooling enabled, so their shared state is exercised.  With
+--server, requests go over the requests transport to a local HTTP server that
+answers after --latency seconds; otherwise the in-memory transport sleeps for
+--latency.  Throughput should grow with the thread count until the server or
+the GIL saturates, instead of flattening on a client-wide lock.
+
+    python benchmarks/thread_scaling.py [--requests 200] [--latency 0.005] [--server]
+"""
+
+import argparse
+import http.server
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import brokermint as bm
+
+
+BODY = json.dumps({"id": 1, "status": "closed", "city": "Denver"}).encode()
+
+
+def make_handler(latency: float):
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        # Buffer writes so headers and body leave in one packet
+        wbufsize = 65536
+
+        def do_GET(self):
+            time.sleep(latency)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(BODY)))
+            self.end_headers()
+            self.wfile.write(BODY)
+            self.wfile.flush()
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def make_client(args, base_url: str = None):
+    if base_url is None:
+
+        def handler(method, path, params, body):
+            time.sleep(args.latency)
+            return BODY
+
+        transport = bm.InMemoryTransport(handler)
+    else:
+        transport = "requests"
+    client = bm.Client(
+        "key",
+        transport=transport,
+        circuit_breaker=True,
+        hedge=True,
+        intern_strings=True,
+    )
+    if base_url is not None:
+        client.BASE_URL = base_url
+    return client
+
+
+def run(client, threads: int, requests: int):
+    sessions, errors = set(), []
+    endpoints = (client.get_transaction, client.get_contact, client.get_user)
+
+    def work(worker: int):
+        try:
+            for i in range(requests):
+                endpoints[(worker + i) % len(endpoints)](i)
+            if getattr(client.transport, "name", None) == "requests":
+                sessions.add(id(client.session))
+        except Exception as e:
+            errors.append(e)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(work, range(threads)))
+    elapsed = time.perf_counter() - start
+    return threads * requests / elapsed, len(sessions), errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.005)
+    parser.add_argument("--server", action="store_true")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32, 64])
+    args = parser.parse_args()
+
+    server, base_url = None, None
+    if args.server:
+        server = http.server.ThreadingHTTPServer(
+            ("127.0.0.1", 0), make_handler(args.latency)
+        )
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f"http://127.0.0.1:{server.server_port}/api"
+
+    client = make_client(args, base_url)
+    print(f"{'threads':>8}{'requests/s':>14}{'speedup':>10}{'sessions':>10}")
+    baseline = None
+    for threads in args.threads:
+        throughput, sessions, errors = run(client, threads, args.requests)
+        if errors:
+            raise errors[0]
+        baseline = baseline or throughput
+        print(
+            f"{threads:>8}{throughput:>14.0f}{throughput / baseline:>10.1f}"
+            f"{sessions or '-':>10}"
+        )
+    client.transport.close()
+    if server is not None:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
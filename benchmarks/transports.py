@@ -0,0 +1,75 @@
+"""Compare per-request overhead of the built-in transports
+
+Requests are made against a local HTTP server (and the in-memory transport),
+so the numbers reflect client-side overhead rather than network latency.
+
+    python benchmarks/transports.py [--requests 500]
+"""
+
+import argparse
+import http.server
+import json
+import threading
+import time
+
+import brokermint as bm
+
+
+BODY = json.dumps([{"id": i, "status": "closed"} for i in range(50)]).encode()
+
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    # Buffer writes so headers and body leave in one packet
+    wbufsize = 65536
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+        self.wfile.flush()
+
+    def log_message(self, *args):
+        pass
+
+
+def run(client, n: int) -> float:
+    start = time.perf_counter()
+    for _ in range(n):
+        client.list_transactions(count=50)
+    return (time.perf_counter() - start) / n * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}/api"
+
+    transports = {
+        "memory": lambda: bm.InMemoryTransport(lambda *a: BODY),
+        "requests": lambda: "requests",
+        "httpx": lambda: "httpx",
+        "urllib3": lambda: "urllib3",
+    }
+    print(f"{'transport':<12}{'us / request':>14}")
+    for name, factory in transports.items():
+        try:
+            client = bm.Client("key", transport=factory())
+            client.BASE_URL = base_url
+            run(client, 10)
+        except ImportError as e:
+            print(f"{name:<12}{'skipped':>14}  ({e.msg.split('.')[0]})")
+            continue
+        print(f"{name:<12}{run(client, args.requests):>14.1f}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
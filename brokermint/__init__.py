@@ -1,6 +1,58 @@
 """Python interface to Brokermint's API"""
 
+import importlib
+import sys
+
 __version__ = "0.0.4"
 
 
-from .base import Client  # noqa
+# Public names and the submodule that defines them.  Submodules are only
+# imported on first attribute access so that `import brokermint` stays cheap.
+_LAZY = {
+    "Client": ".base",
+    "AsyncClient": ".aio",
+    "ChangeDetector": ".changes",
+    "ChangeFeed": ".feed",
+    "CommissionRollup": ".commissions",
+    "ParticipantIndex": ".participants",
+    "LookupCoalescer": ".coalesce",
+    "ReferenceData": ".reference",
+    "dump_account": ".export",
+    "Journal": ".journal",
+    "Snapshot": ".snapshot",
+    "SnapshotWriter": ".snapshot",
+    "HedgePolicy": ".hedge",
+    "Transport": ".transport",
+    "InMemoryTransport": ".transport",
+    "BrokermintError": ".exceptions",
+    "APIError": ".exceptions",
+    "ValidationError": ".exceptions",
+    "NotFound": ".exceptions",
+    "RateLimited": ".exceptions",
+    "ServerError": ".exceptions",
+    "CircuitOpenError": ".exceptions",
+    "DeadlineExceeded": ".exceptions",
+    "LoadShedError": ".exceptions",
+}
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name):
+    try:
+        module = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
+
+
+if sys.version_info < (3, 7):
+
+    # Module level __getattr__ (PEP 562) is unavailable, import eagerly
+    from .base import Client  # noqa
@@ -0,0 +1,194 @@
+"""Asynchronous client"""
+
+from typing import Iterable, List, Tuple, Union
+import os
+
+from . import decoding
+from .base import Client
+from .endpoints import Endpoints
+from .exceptions import error_for_response
+from .projection import ShortFields, normalize_fields, project
+from .transport import AsyncHttpxTransport
+
+
+class AsyncClient(Endpoints):
+    """Client whose endpoint methods return coroutines
+
+    Every endpoint method of Client (get_*, list_*, create_*, update_*,
+    delete_*, ...) is available and must be awaited.  Requests are sent through
+    an httpx.AsyncClient which, with http2=True, multiplexes concurrent
+    requests as streams over a few connections, falling back to HTTP/1.1 when
+    HTTP/2 is unavailable.  Use asyncio.wait_for to bound the time spent on a
+    call.
+
+    Only the endpoint methods and paginate are shared with Client.  Helpers
+    built on synchronous calls (scan, to_frame, as_arrow, dump_account,
+    snapshot, walk_tasks, the upsert_* methods and deadline) and the journal,
+    hedge and adaptive_paging options belong to Client alone.
+
+    Parameters
+    ----------
+    api_key: str, optional
+        Brokermint API key.  Defaults to the BM_API_KEY environment variable
+    http2: bool, default True, optional
+        Negotiate HTTP/2
+    max_connections: int, default 10, optional
+        Maximum number of open connections
+    transport: AsyncHttpxTransport, optional
+        Asynchronous transport used to send requests
+    timeout: float or tuple, default (3.05, 30), optional
+        Seconds to wait for the server to accept a connection and to send a
+        response, either as a single number or a (connect, read) tuple
+    circuit_breaker: bool or dict, default False, optional
+        Fail fast on endpoint groups with a high error rate, as for Client
+    json_backend: str, default 'auto', optional
+        Library used to decode responses, one of auto, json, orjson or simdjson
+    intern_strings: bool or dict, default False, optional
+        Share one str object between equal values across decoded responses, as
+        for Client
+    """
+
+    def __init__(
+        self,
+        api_key=None,
+        *,
+        http2: bool = True,
+        max_connections: int = 10,
+        transport: AsyncHttpxTransport = None,
+        timeout: Union[float, Tuple[float, float]] = Client.DEFAULT_TIMEOUT,
+        circuit_breaker: Union[bool, dict] = False,
+        json_backend: str = "auto",
+        intern_strings: Union[bool, dict] = False,
+    ):
+        self.api_key = api_key or os.getenv("BM_API_KEY")
+        self.timeout = timeout
+        self.json_backend = json_backend
+        self._loads = decoding.get_loads(json_backend)
+        if intern_strings is True:
+            intern_strings = {}
+        self.strings = (
+            decoding.StringPool(**intern_strings) if intern_strings is not False else None
+        )
+        self.headers = {"Accept-Encoding": decoding.accept_encoding()}
+        self.transport = transport or AsyncHttpxTransport(
+            http2=http2, max_connections=max_connections
+        )
+        if circuit_breaker is True:
+            circuit_breaker = {}
+        self._breaker_options = circuit_breaker if circuit_breaker is not False else None
+        self._breakers = {}
+        self._short_fields = ShortFields()
+
+    _breaker = Client._breaker
+    _acquire_breaker = Client._acquire_breaker
+    _intern = Client._intern
+
+    def _decode(self, response, intern: bool = True):
+        """Decode the body of a response, raising for error statuses"""
+        if response.status_code < 400:
+            try:
+                payload = self._loads(response.content)
+            except ValueError:
+                return response.text or None
+            return self._intern(payload) if intern else payload
+        raise error_for_response(response, self._loads)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    async def aclose(self):
+        """Close the underlying connections"""
+        await self.transport.aclose()
+
+    async def _get_data(
+        self,
+        key: str,
+        method: str,
+        *,
+        within: str = None,
+        uri_params: dict = None,
+        params: dict = None,
+        data: dict = None,
+        files: dict = None,
+        required_fields: List[str] = None,
+        fields: Union[str, Iterable[str]] = None,
+    ):
+        url = self._construct_url(key, method, within, uri_params)
+        if fields is not None:
+            fields = normalize_fields(fields)
+            auto = params is not None and "full_info" in params
+            if auto and params["full_info"] is None:
+
+                # Full records are requested until a synchronous call has learnt
+                # whether short ones hold every field
+                full_info = self._short_fields.full_info((key, method), fields)
+                params = {**params, "full_info": 1 if full_info is None else full_info}
+        params = self._construct_params(params)
+        response = await self._make_request(
+            url, method, params, data, files, required_fields, group=key
+        )
+        if fields is None:
+            return self._decode(response)
+        return self._intern(project(self._decode(response, intern=False), fields))
+
+    async def _make_request(
+        self,
+        url: str,
+        method: str,
+        params: dict,
+        data: dict,
+        files: dict,
+        required_fields: List[str],
+        *,
+        group: str = None,
+    ):
+        self._check_required_fields(data, required_fields)
+        breaker, token = self._acquire_breaker(group)
+        success = False
+        try:
+            response = await self.transport.request(
+                self.METHOD_MAPPING[method],
+                url,
+                params=params,
+                json=data,
+                files=files,
+                headers=self.headers,
+                timeout=self.timeout,
+            )
+            success = response.status_code < 500 and response.status_code != 429
+        finally:
+            if breaker is not None:
+                breaker.release(token, success)
+        return response
+
+    async def paginate(self, method: str, *args, **kwargs):
+        """Iterate asynchronously through every page of a paginated list method
+
+        Parameters
+        ----------
+        method: str, required
+            Name of a paginated list method, i.e. list_transactions, list_contacts,
+            list_users or list_transaction_backups
+        *args
+            Positional arguments passed to the list method
+        **kwargs
+            Keyword arguments passed to the list method
+        """
+        if method not in self.PAGINATED_METHODS:
+            raise ValueError(
+                f"{method} is not paginated.  Choose one of:  {', '.join(self.PAGINATED_METHODS)}"
+            )
+        func = getattr(self, method)
+        count = kwargs.get("count") or self.DEFAULT_COUNT
+        kwargs["count"] = count
+        while True:
+            page = await func(*args, **kwargs)
+            if not isinstance(page, list) or not page:
+                return
+            yield page
+            if len(page) < count:
+                return
+            kwargs["starting_from_id"] = max(r["id"] for r in page) + 1
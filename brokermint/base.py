@@ -1,132 +1,254 @@
-from typing import Union, List
+from typing import Callable, Iterable, Union, List, Tuple
 import os
-import requests
-
-
-class Client:
-
-    BASE_URL = "https://my.brokermint.com/api"
-
-    METHOD_MAPPING = {
-        "list": "GET",
-        "retrieve": "GET",
-        "create": "POST",
-        "update": "PUT",
-        "destroy": "DELETE",
-    }
-
-    ENDPOINTS = {
-        "users": {
-            "list": "/v1/users",
-            "retrieve": "/v1/users/{user_id}",
-            "update": "/v1/users/{user_id}",
-            "create": "/v1/users",
-        },
-        "user_commission_plans": {
-            "list": "/v1/users/{user_id}/commision_plans",
-            "create": "/v1/users/{user_id}/commission_plans",
-            "delete": "/v1/users/{user_id}/commission_plans/{plan_id}",
-        },
-        "contacts": {
-            "list": "/v1/contacts",
-            "create": "/v1/contacts",
-            "retrieve": "/v1/contacts/{contact_id}",
-            "update": "/v1/contacts/{contact_id}",
-            "destroy": "/v1/contacts/{contact_id}",
-        },
-        "commission_plans": {
-            "list": "/v1/commission_plans",
-        },
-        "transactions": {
-            "list": "/v2/transactions",
-            "create": "/v2/transactions",
-            "retrieve": "/v2/transactions/{transaction_id}",
-            "update": "/v2/transactions/{transaction_id}",
-            "destroy": "/v2/transactions/{transaction_id}",
-        },
-        "transaction_participants": {
-            "all": {
-                "list": "/v1/transactions/{transaction_id}/participants",
-            },
-            "users": {
-                "list": "/v1/transactions/{transaction_id}/participants/users",
-                "create": "/v1/transactions/{transaction_id}/participants/users",
-                "retrieve": "/v1/transactions/{transaction_id}/participants/users/{user_id}",
-                "update": "/v1/transactions/{transaction_id}/participants/users/{user_id}",
-                "destroy": "/v1/transactions/{transaction_id}/participants/users/{user_id}",
-            },
-            "contacts": {
-                "list": "/v1/transactions/{transaction_id}/participants/contacts",
-                "create": "/v1/transactions/{transaction_id}/participants/contacts",
-                "retrieve": "/v1/transactions/{transaction_id}/participants/contacts/{contact_id}",
-                "update": "/v1/transactions/{transaction_id}/participants/contacts/{contact_id}",
-                "destroy": "/v1/transactions/{transaction_id}/participants/contacts/{contact_id}",
-            },
-        },
-        "transaction_commissions": {
-            "list": "/v1/transactions/{transaction_id}/commissions",
-        },
-        "transaction_checklists": {
-            "list": "/v1/transactions/{transaction_id}/checklists",
-            "retrieve": "/v1/transactions/{transaction_id}/checklists/{checklist_id}",
-        },
-        "transaction_tasks": {
-            "tasks": {
-                "list": "/v1/transactions/{transaction_id}/checklists/{checklist_id}/tasks",
-                "create": "/v1/transactions/{transaction_id}/checklists/{checklist_id}/tasks",
-                "retrieve": "/v1/transactions/{transaction_id}/checklists/{checklist_id}/tasks/{task_id}",
-                "update": "/v1/transactions/{transaction_id}/checklists/{checklist_id}/tasks/{task_id}",
-            },
-            "document": {
-                "create": "/v1/transactions/{transaction_id}/checklists/{checklist_id}/tasks/{task_id}/submit_document",
-            },
-            "comment": {
-                "create": "/v1/transactions/{transaction_id}/checklists/{checklist_id}/tasks/{task_id}/add_comment",
-            },
-        },
-        "transaction_documents": {
-            "create": "/v1/transactions/{transaction_id}/documents",
-            "retrieve": "/v1/transactions/{transaction_id}/documents/{document_id}",
-        },
-        "transaction_notes": {
-            "create": "/v1/transactions/{transaction_id}/notes",
-        },
-        "transaction_backups": {
-            "all": {
-                "list": "/v1/transactions/{transaction_id}/backups",
-            },
-            "latest": {
-                "retrieve": "/v1/transactions/{transaction_id}/backup",
-            },
-        },
-        "transaction_offers": {
-            "all": {
-                "list": "/v1/transactions/{transaction_id}/offers",
-                "retrieve": "/v1/transactions/{transaction_id}/offers/{offer_id}",
-            },
-            "attachment": {
-                "retrieve": "/v1/transactions/{transaction_id}/offers/{offer_id}/attachments/{attachment_id}",
-            },
-        },
-        "incoming_transactions": {
-            "create": "/v1/incoming_transactions",
-        },
-        "reports": {
-            "all": {
-                "list": "/v2/reports",
-            },
-            "filters": {
-                "list": "/v2/reports/{report_id}/filters",
-            },
-            "data": {
-                "retrieve": "/v2/reports/{report_id}",
-            },
-        },
-        "sso": {"retrieve": "/v1/users/{user_id}/sso_token"},
-    }
-
-    def __init__(self, api_key=None):
+import threading
+import time
+
+from . import deadline as _deadline, decoding, journal as _journal
+from .breaker import CircuitBreaker
+from .endpoints import Endpoints
+from .exceptions import DeadlineExceeded, error_for_response
+from .projection import ShortFields, normalize_fields, project
+from .utils import as_records, concurrent_map, missing_as
+
+
+class Client(Endpoints):
+
+    # (connect, read) timeouts in seconds
+    DEFAULT_TIMEOUT = (3.05, 30)
+
+    def __init__(
+        self,
+        api_key=None,
+        *,
+        session: "requests.Session" = None,
+        transport: Union[str, "Transport"] = None,
+        timeout: Union[float, Tuple[float, float]] = DEFAULT_TIMEOUT,
+        circuit_breaker: Union[bool, dict] = False,
+        json_backend: str = "auto",
+        journal: Union[str, "Journal"] = None,
+        hedge: Union[bool, dict, "HedgePolicy"] = False,
+        adaptive_paging: Union[bool, dict] = False,
+        intern_strings: Union[bool, dict] = False,
+    ):
+        """Client used to interact with the Brokermint API
+
+        A client can be shared by any number of threads.  Connection state is
+        kept per thread (requests) or in thread-safe pools (httpx, urllib3), and
+        shared caches and counters are guarded by per-key locks, so threads only
+        contend when they touch the same endpoint group.
+
+        Parameters
+        ----------
+        api_key: str, optional
+            Brokermint API key.  Defaults to the BM_API_KEY environment variable
+        session: requests.Session, optional
+            Session used by the default requests transport, shared by every
+            thread.  By default each thread gets its own session
+        transport: str or Transport, optional
+            Transport used to send requests, either an instance of
+            brokermint.transport.Transport or one of requests (default), httpx,
+            http2 or urllib3
+        timeout: float or tuple, default (3.05, 30), optional
+            Seconds to wait for the server to accept a connection and to send a
+            response, either as a single number or a (connect, read) tuple
+        circuit_breaker: bool or dict, default False, optional
+            Fail fast on endpoint groups (keys in ENDPOINTS) with a high error
+            rate.  Pass True for the defaults or a dictionary of keyword
+            arguments for brokermint.breaker.CircuitBreaker
+        json_backend: str, default 'auto', optional
+            Library used to decode responses, one of auto, json, orjson or
+            simdjson.  auto uses orjson when it is installed
+        journal: str or Journal, optional
+            Record every create, update and delete request, and its outcome, in
+            an append-only journal so interrupted jobs can be resumed.  Either a
+            brokermint.journal.Journal or the path of its file
+        hedge: bool, dict or HedgePolicy, default False, optional
+            Send a duplicate of GET requests slower than the usual latency of
+            their endpoint group and use the first response.  Pass True for the
+            defaults, a dictionary of keyword arguments for
+            brokermint.hedge.HedgePolicy, or a policy instance
+        adaptive_paging: bool or dict, default False, optional
+            Tune the count of each page requested by paginate from the size and
+            latency of previous pages.  Pass True for the defaults or a
+            dictionary of keyword arguments for
+            brokermint.paging.PageSizeTuner, e.g. {'min_count': 100}
+        intern_strings: bool or dict, default False, optional
+            Share one str object between equal values (statuses, roles, cities,
+            ...) across decoded responses to cut the memory used by large result
+            sets.  Pass True for the defaults or a dictionary of keyword
+            arguments for brokermint.decoding.StringPool, e.g.
+            {'fields': ['status', 'city', 'state']}
+        """
         self.api_key = api_key or os.getenv("BM_API_KEY")
+        self.timeout = timeout
+        self.json_backend = json_backend
+        self._loads = decoding.get_loads(json_backend)
+        if intern_strings is True:
+            intern_strings = {}
+        self.strings = (
+            decoding.StringPool(**intern_strings) if intern_strings is not False else None
+        )
+        if isinstance(journal, str):
+            journal = _journal.Journal(journal)
+        self.journal = journal
+
+        # Negotiate compressed responses with every transport
+        self.headers = {"Accept-Encoding": decoding.accept_encoding()}
+
+        if session is not None and transport is None:
+            from .transport import RequestsTransport
+
+            transport = RequestsTransport(session)
+        self._transport = transport
+        self._transport_lock = threading.Lock()
+        if circuit_breaker is True:
+            circuit_breaker = {}
+        self._breaker_options = circuit_breaker if circuit_breaker is not False else None
+        self._breakers = {}
+        if hedge is True:
+            hedge = {}
+        if isinstance(hedge, dict):
+            from .hedge import HedgePolicy
+
+            hedge = HedgePolicy(**hedge)
+        self.hedge = hedge or None
+        if adaptive_paging is True:
+            adaptive_paging = {}
+        self._paging_options = (
+            adaptive_paging if adaptive_paging is not False else None
+        )
+        self._page_tuners = {}
+        self._local = threading.local()
+        self._short_fields = ShortFields()
+
+    def _worker_options(self) -> dict:
+        """Keyword arguments building an equivalent client in another process
+
+        Only picklable options are kept:  a transport instance that cannot be
+        pickled is replaced by the name of its built-in transport, and the
+        journal is left out.
+        """
+        import pickle
+
+        from .transport import TRANSPORTS
+
+        transport = self._transport
+        if transport is not None and not isinstance(transport, str):
+            try:
+                pickle.dumps(transport)
+            except Exception:
+                name = getattr(transport, "name", None)
+                transport = name if name in TRANSPORTS else None
+        hedge = self.hedge
+        if hedge is not None:
+            hedge = {
+                "percentile": hedge.percentile,
+                "budget": hedge.budget,
+                "burst": hedge.burst,
+                "min_delay": hedge.min_delay,
+                "window": hedge.window,
+                "min_samples": hedge.min_samples,
+                "groups": None if hedge.groups is None else sorted(hedge.groups),
+                "max_workers": hedge.max_workers,
+            }
+        strings = self.strings
+        if strings is not None:
+            strings = {
+                "max_length": strings.max_length,
+                "max_size": strings.max_size,
+                "fields": None if strings.fields is None else sorted(strings.fields),
+            }
+        breaker, paging = self._breaker_options, self._paging_options
+        return {
+            "transport": transport,
+            "timeout": self.timeout,
+            "circuit_breaker": False if breaker is None else breaker,
+            "json_backend": self.json_backend,
+            "hedge": hedge or False,
+            "adaptive_paging": False if paging is None else paging,
+            "intern_strings": False if strings is None else strings,
+        }
+
+    @property
+    def transport(self):
+        """Transport used to send requests
+
+        The HTTP library is imported and the transport created on first use,
+        keeping import and construction of the client cheap.  Transports reuse
+        connections across requests instead of opening one per call.
+        """
+        transport = self._transport
+        if transport is None or isinstance(transport, str):
+            from .transport import get_transport
+
+            with self._transport_lock:
+                if self._transport is None or isinstance(self._transport, str):
+                    self._transport = get_transport(self._transport)
+                transport = self._transport
+        return transport
+
+    @property
+    def session(self):
+        """Session the requests transport uses in the calling thread"""
+        return self.transport.session
+
+    def _breaker(self, group: str):
+        breaker = self._breakers.get(group)
+        if breaker is None:
+            breaker = self._breakers.setdefault(
+                group, CircuitBreaker(group, **self._breaker_options)
+            )
+        return breaker
+
+    def _page_tuner(self, method: str, full_info=None):
+        """Page size tuner shared by paginations of a method and full_info"""
+        from .paging import PageSizeTuner
+
+        key = (method, full_info)
+        tuner = self._page_tuners.get(key)
+        if tuner is None:
+            tuner = self._page_tuners.setdefault(
+                key, PageSizeTuner(**self._paging_options)
+            )
+        return tuner
+
+    def _acquire_breaker(self, group: str):
+        """Reserve a slot on the group's circuit breaker, if breakers are enabled,
+        returning the breaker and the token to release it with"""
+        if self._breaker_options is None or group is None:
+            return None, None
+        breaker = self._breaker(group)
+        return breaker, breaker.acquire()
+
+    def deadline(self, seconds: float):
+        """Limit the total time spent on requests made within a with block
+
+        Every request derives its timeout from the remaining budget and raises
+        DeadlineExceeded once it is spent.  Multi-call helpers (paginate,
+        to_frame, fetch_commissions, ...) stop early and return partial results
+        instead.  The deadline applies to the current thread and the worker
+        threads those helpers start.
+
+        Parameters
+        ----------
+        seconds: float, required
+            Budget, in seconds
+        """
+        return _deadline.scope(seconds)
+
+    def _request_timeout(self):
+        """Timeout for the next request, bounded by the current deadline"""
+        deadline = _deadline.current()
+        if deadline is None:
+            return self.timeout
+        remaining = deadline.remaining()
+        if remaining <= 0:
+            raise DeadlineExceeded()
+        if isinstance(self.timeout, tuple):
+            return tuple(
+                remaining if t is None else min(t, remaining) for t in self.timeout
+            )
+        return remaining if self.timeout is None else min(self.timeout, remaining)
 
     def _get_data(
         self,
@@ -139,6 +261,7 @@ class Client:
         data: dict = None,
         files: dict = None,
         required_fields: List[str] = None,
+        fields: Union[str, Iterable[str]] = None,
     ):
         """Entrypoint to getting data from Brokermint API
 
@@ -159,55 +282,77 @@ class Client:
             Dictionary used to upload files
         required_fields: list, optional
             Fields required when creating or updating data
+        fields: str or iterable, optional
+            Keep only these fields (and id) of the records returned.  When params
+            has a full_info of None, short records are requested if they are
+            known to hold every field and full records otherwise
         """
         url = self._construct_url(key, method, within, uri_params)
-        params = self._construct_params(params)
-        response = self._make_request(url, method, params, data, files, required_fields)
-        try:
-            return response.json()
-        except ValueError:
-            return {"error": response.text}
-
-    def _construct_url(self, key: str, method: str, within: str, uri_params: dict):
-        """Construct the URL used in the request
-
-        Parameters
-        ----------
-        key: str, required
-            Dictionary key in self.ENDPOINTS dictionary
-        method: str, required
-            Type of request to perform
-        within: str, optional
-            Grouped endpoints can have sub-groups that further define how URL is
-            structured.  This is a key that will match that sub-group.
-        uri_params: dict, optional
-            Parameters injected into the URL
-        """
-        endpoint = (
-            self.ENDPOINTS[key][within][method]
-            if within
-            else self.ENDPOINTS[key][method]
-        )
-        if uri_params:
-            endpoint = endpoint.format(**uri_params)
-        return f"{self.BASE_URL}{endpoint}"
 
-    def _construct_params(self, params: dict):
-        """Construct the query parameters used in the request
-
-        Parameters
-        ----------
-        params: dict, required
-            Dictionary containing query parameters used to filter data
-        """
-        try:
-            new_params = {k: v for k, v in params.items() if v is not None}
-        except AttributeError:
-
-            # No parameters given
-            new_params = {}
-        new_params["api_key"] = self.api_key
-        return new_params
+        def request(params):
+            response = self._make_request(
+                url,
+                method,
+                self._construct_params(params),
+                data,
+                files,
+                required_fields,
+                group=key,
+            )
+
+            # Strings are pooled after projection, so dropped fields don't
+            # take up room in the pool
+            return self._decode(response, intern=fields is None)
+
+        if fields is None:
+            return request(params)
+        fields = normalize_fields(fields)
+        endpoint = (key, method)
+        auto = (
+            params is not None and "full_info" in params and params["full_info"] is None
+        )
+        if auto:
+            params = {
+                **params,
+                "full_info": self._short_fields.full_info(endpoint, fields),
+            }
+        payload = request(params)
+        if auto and not params["full_info"]:
+            learnt = self._short_fields.learn(endpoint, payload)
+            if learnt and self._short_fields.full_info(endpoint, fields):
+
+                # Short records lack some of the fields, fetch full ones
+                params["full_info"] = 1
+                payload = request(params)
+        return self._intern(project(payload, fields))
+
+    def _intern(self, payload):
+        """Pool the strings of a decoded response, if intern_strings is enabled"""
+        return payload if self.strings is None else self.strings.intern(payload)
+
+    def _decode(self, response, intern: bool = True):
+        """Decode the body of a response, raising for error statuses
+
+        Responses with a status of 400 or above raise the matching APIError
+        subclass (ValidationError, NotFound, RateLimited, ServerError).
+        Successful responses without a JSON body return their text, or None when
+        empty.  With intern_strings enabled, decoded strings are pooled.
+
+        Parameters
+        ----------
+        response: Response, required
+            Response returned by the transport
+        intern: bool, default True, optional
+            Pool the decoded strings
+        """
+        self._local.response_size = len(response.content or b"")
+        if response.status_code < 400:
+            try:
+                payload = self._loads(response.content)
+            except ValueError:
+                return response.text or None
+            return self._intern(payload) if intern else payload
+        raise error_for_response(response, self._loads)
 
     def _make_request(
         self,
@@ -217,6 +362,8 @@ class Client:
         data: dict,
         files: dict,
         required_fields: List[str],
+        *,
+        group: str = None,
     ):
         """Request data from the API
 
@@ -234,1214 +381,497 @@ class Client:
             Dictionary used to upload files
         required_fields: list, optional
             Fields required when creating or updating data
-        """
-        if required_fields is not None and data is not None:
-            if not all(k in data for k in required_fields):
-                raise ValueError(
-                    f"The data argument is missing one of the required fields:  {', '.join(required_fields)}"
-                )
-        response = requests.request(
-            self.METHOD_MAPPING[method],
-            url,
-            params=params,
-            json=data,
-            files=files,
-        )
+        group: str, optional
+            Endpoint group (key in self.ENDPOINTS) used by the circuit breaker
+        """
+        self._check_required_fields(data, required_fields)
+        timeout = self._request_timeout()
+        transport = self.transport
+        http_method = self.METHOD_MAPPING[method]
+        journal_key = None
+        if self.journal is not None and http_method != "GET":
+            journal_key = _journal.current_key() or _journal.operation_key(
+                http_method, url, data
+            )
+            self.journal.start(journal_key, http_method, url, data)
+        try:
+            breaker, token = self._acquire_breaker(group)
+        except Exception as e:
+            if journal_key is not None:
+                self.journal.finish(journal_key, error=repr(e))
+            raise
+
+        def send():
+            return transport.request(
+                http_method,
+                url,
+                params=params,
+                json=data,
+                files=files,
+                headers=self.headers,
+                timeout=timeout,
+            )
+
+        success = False
+        try:
+            if (
+                self.hedge is not None
+                and http_method == "GET"
+                and self.hedge.applies_to(group)
+            ):
+                response = self.hedge.send(group, send)
+            else:
+                response = send()
+            success = response.status_code < 500 and response.status_code != 429
+        except Exception as e:
+            if journal_key is not None:
+                self.journal.finish(journal_key, error=repr(e))
+            if isinstance(e, transport.timeout_errors):
+                deadline = _deadline.current()
+                if deadline is not None and deadline.expired:
+                    if timeout != self.timeout:
+                        # The timeout was shortened to the deadline, so it
+                        # says nothing about the health of the endpoint group
+                        success = None
+                    raise DeadlineExceeded() from None
+            raise
+        finally:
+            if breaker is not None:
+                breaker.release(token, success)
+        if journal_key is not None:
+            self.journal.finish(journal_key, response.status_code)
         return response
 
-    def list_users(
+    def paginate(
         self,
-        *,
-        count: int = None,
-        starting_from_id: int = None,
-        active: int = None,
-        created_since: Union[str, int] = None,
-        updated_since: Union[str, int] = None,
-        external_ids: str = None,
-        emails: str = None,
-        full_info: int = None,
-    ):
-        """List of available users in account
-
-        Parameters
-        ----------
-        count: int, default 1000, optional
-            Specifies the number of items to retrieve
-        starting_from_id: int, optional
-            Specifies the ID of entity to retrieve records starting from
-        active: int, optional
-            Filter active/inactive users.  By default all users are returned.  Use
-            1 to query active users only or 0 to query inactive.
-        created_since: str or int, optional
-            Filter users created since specified date.  Date format:  YYYY-MM-DD or
-            13-digit unix timestamp
-        updated_since: str or int, optional
-            Filter users updated since specified date.  Date format:  YYYY-MM-DD or
-            13-digit unix timestamp
-        external_ids: str, optional
-            Filter users by the comma separated list of external IDs
-        emails: str, optional
-            Filter users by the comma separated list of emails
-        full_info: int, default 0, optional
-            Specifies whether to retrieve short or full user information.
-        """
-        params = {
-            "count": count,
-            "starting_from_id": starting_from_id,
-            "active": active,
-            "created_since": created_since,
-            "updated_since": updated_since,
-            "external_ids": external_ids,
-            "emails": emails,
-            "full_info": full_info,
-        }
-        return self._get_data("users", "list", params=params)
-
-    def create_user(self, data: dict, *, send_instructions: int = None):
-        """Create User
-
-        Parameters
-        ----------
-        data: dict, required
-            Data used to create the user.  Fields available are:
-                email: str, required
-                first_name: str, required
-                last_name: str, required
-                company: str, optional
-                role: str, optional
-                team: str, optional
-                external_id: str, optional
-                    External identifier passed during user creation, this value is
-                    available through users API only, users can be filtered by this
-                    field to see whether such user already exists
-                birthday: int, optional
-                    13-digit unix timestamp
-                anniversary_date: str
-                phone: str
-        send_instructions: int, default 0, optional
-            Specifies whether to send welcome email and login instructions
-        """
-        return self._get_data(
-            "users",
-            "create",
-            data=data,
-            params={"send_instructions": send_instructions},
-            required_fields=["email", "first_name", "last_name"],
-        )
-
-    def get_user(self, user_id: int):
-        """Get User
-
-        Parameters
-        ----------
-        user_id: int, required
-            ID of User
-        """
-        return self._get_data("users", "retrieve", uri_params={"user_id": user_id})
-
-    def update_user(self, user_id: int, data: dict):
-        """Update User
-
-        Parameters
-        ----------
-        user_id: int, required
-            ID of User
-        data: dict, required
-            Data used to create the user.  Fields available are:
-                email: str, required
-                first_name: str, required
-                last_name: str, required
-                company: str, optional
-                role: str, optional
-                team: str, optional
-                external_id: str, optional
-                    External identifier passed during user creation, this value is
-                    available through users API only, users can be filtered by this
-                    field to see whether such user already exists
-                birthday: int, optional
-                    13-digit unix timestamp
-                anniversary_date: str
-                phone: str
-        """
-        return self._get_data(
-            "users",
-            "update",
-            uri_params={"user_id": user_id},
-            data=data,
-            required_fields=["email", "first_name", "last_name"],
-        )
-
-    def list_user_commission_plans(self, user_id: int):
-        """List commision plans assigned to user
-
-        Parameters
-        ----------
-        user_id: int, required
-            ID of User
-        """
-        return self._get_data(
-            "user_commission_plans", "list", uri_params={"user_id": user_id}
-        )
-
-    def assign_user_commission_plan(self, user_id: int, plan_id: int):
-        """Assign commision plan to user
-
-        Parameters
-        ----------
-        user_id: int, required
-            ID of User
-        plan_id: int, required
-            ID of commission plan
-        """
-        return self._get_data(
-            "user_commission_plans",
-            "create",
-            uri_params={"user_id": user_id, "plan_id": plan_id},
-        )
-
-    def unassign_user_commission_plan(self, user_id: int, plan_id: int):
-        """Unassign commision plan from user
-
-        Parameters
-        ----------
-        user_id: int, required
-            ID of User
-        plan_id: int, required
-            ID of commission plan
-        """
-        return self._get_data(
-            "user_commission_plans",
-            "destroy",
-            uri_params={"user_id": user_id, "plan_id": plan_id},
-        )
-
-    def list_contacts(
-        self,
-        *,
-        count: int = None,
-        starting_from_id: int = None,
-        active: int = None,
-        created_since: Union[str, int] = None,
-        updated_since: Union[str, int] = None,
-        external_ids: str = None,
-        emails: str = None,
-        full_info: int = None,
+        method: str,
+        *args,
+        deadline: float = None,
+        before_id: int = None,
+        partial: bool = True,
+        **kwargs,
     ):
-        """List of available contacts in account
-
-        Parameters
-        ----------
-        count: int, default 1000, optional
-            Specifies the number of items to retrieve
-        starting_from_id: int, optional
-            Specifies the ID of entity to retrieve records starting from
-        created_since: str or int, optional
-            Filter contacts created since specified date.  Date format:  YYYY-MM-DD or
-            13-digit unix timestamp
-        updated_since: str or int, optional
-            Filter contacts updated since specified date.  Date format:  YYYY-MM-DD or
-            13-digit unix timestamp
-        external_ids: str, optional
-            Filter contacts by the comma separated list of external IDs
-        emails: str, optional
-            Filter contacts by the comma separated list of emails
-        full_info: int, default 0, optional
-            Specifies whether to retrieve short or full contact information.
-        """
-        params = {
-            "count": count,
-            "starting_from_id": starting_from_id,
-            "active": active,
-            "created_since": created_since,
-            "updated_since": updated_since,
-            "external_ids": external_ids,
-            "emails": emails,
-            "full_info": full_info,
-        }
-        return self._get_data("contacts", "list", params=params)
+        """Iterate through every page of a paginated list method
 
-    def create_contact(self, data: dict):
-        """Create Contact
+        Pages are requested with the starting_from_id cursor until a page smaller
+        than count is returned, a record with an ID of before_id or more is
+        reached, or the deadline (or the enclosing Client.deadline) passes.  With
+        adaptive_paging enabled on the client and no count given, each page's
+        count is tuned from the size and latency of previous pages, and pages that
+        time out are retried at half the count.
 
         Parameters
         ----------
-        data: dict, required
-            Data used to create the contact.  Fields available are:
-                email: str, required
-                first_name: str, optional
-                last_name: str, optional
-                contact_type: str
-                    Contact's role, like Escrow Officer, Selling Agent, etc.
-                external_id: str, optional
-                    External identifier passed during contact creation, this value is
-                    available through contacts API only, contacts can be filtered by this
-                    field to see whether such contact already exists
-                company: str, optional
-                address: str, optional
-                city: str, optional
-                state: str, optional
-                zip: str, optional
-                phone: str, optional
-                mobile_phone: str, optional
-                fax: str, optional
-                private: bool, optional
-                lead_source: str, optional
-                custom_attributes: List[dict], optional
-                    name: str
-                    label: str
-                    type: str, [text, date, dropdown, money]
-                    options: str
-                    value: str
-        """
-        return self._get_data(
-            "contacts", "create", data=data, required_fields=["email"]
-        )
-
-    def get_contact(self, contact_id: int):
-        """Get Contact
-
-        Parameters
-        ----------
-        contact_id: int, required
-            ID of contact
-        """
-        return self._get_data(
-            "contacts", "retrieve", uri_params={"contact_id": contact_id}
-        )
-
-    def update_contact(self, contact_id: int, data: dict):
-        """Update Contact
-
-        Parameters
-        ----------
-        contact_id: int, required
-            ID of contact
-        data: dict, required
-            Data used to update the contact.  Fields available are:
-                email: str, required
-                first_name: str, optional
-                last_name: str, optional
-                contact_type: str
-                    Contact's role, like Escrow Officer, Selling Agent, etc.
-                external_id: str, optional
-                    External identifier passed during contact creation, this value is
-                    available through contacts API only, contacts can be filtered by this
-                    field to see whether such contact already exists
-                company: str, optional
-                address: str, optional
-                city: str, optional
-                state: str, optional
-                zip: str, optional
-                phone: str, optional
-                mobile_phone: str, optional
-                fax: str, optional
-                private: bool, optional
-                lead_source: str, optional
-                custom_attributes: List[dict], optional
-                    name: str
-                    label: str
-                    type: str, [text, date, dropdown, money]
-                    options: str
-                    value: str
-        """
-        return self._get_data(
-            "contacts",
-            "update",
-            uri_params={"contact_id": contact_id},
-            data=data,
-            required_fields=["email"],
-        )
-
-    def delete_contact(self, contact_id: int):
-        """Delete Contact
-
-        Parameters
-        ----------
-        contact_id: int, required
-            ID of contact
-        """
-        return self._get_data(
-            "contacts", "destroy", uri_params={"contact_id": contact_id}
-        )
-
-    def list_commission_plans(self):
-        """List of available Commission Plans"""
-        return self._get_data("commission_plans", "list")
-
-    def list_transactions(
+        method: str, required
+            Name of a paginated list method, i.e. list_transactions, list_contacts,
+            list_users or list_transaction_backups
+        *args
+            Positional arguments passed to the list method
+        deadline: float, optional
+            Budget, in seconds, for all pages
+        before_id: int, optional
+            Stop before the first record with an ID greater than or equal to this
+        partial: bool, default True, optional
+            Stop silently when the deadline passes.  With False, DeadlineExceeded
+            is raised instead, for callers that need a complete listing
+        **kwargs
+            Keyword arguments passed to the list method
+        """
+        if method not in self.PAGINATED_METHODS:
+            raise ValueError(
+                f"{method} is not paginated.  Choose one of:  {', '.join(self.PAGINATED_METHODS)}"
+            )
+        func = getattr(self, method)
+        tuner = None
+        if kwargs.get("count") is None and self._paging_options is not None:
+            tuner = self._page_tuner(method, kwargs.get("full_info"))
+        count = kwargs.get("count") or self.DEFAULT_COUNT
+        kwargs["count"] = count
+        scoped = _deadline.resolve(deadline)
+        while True:
+            if tuner is not None:
+                count = kwargs["count"] = tuner.count
+            started = time.monotonic()
+            try:
+                with _deadline.scope(scoped):
+                    page = func(*args, **kwargs)
+            except DeadlineExceeded:
+                if partial:
+                    return
+                raise
+            except self.transport.timeout_errors:
+                if tuner is None or count <= tuner.min_count:
+                    raise
+                tuner.timed_out(count)
+                continue
+            if not isinstance(page, list) or not page:
+                return
+            if tuner is not None:
+                tuner.record(
+                    len(page),
+                    time.monotonic() - started,
+                    getattr(self._local, "response_size", None),
+                )
+            last_id = max(r["id"] for r in page)
+            if before_id is not None and last_id >= before_id:
+                page = [r for r in page if r["id"] < before_id]
+                if page:
+                    yield page
+                return
+            yield page
+            if len(page) < count:
+                return
+            kwargs["starting_from_id"] = last_id + 1
+
+    def scan(
         self,
+        method: str,
         *,
-        count: int = None,
-        starting_from_id: int = None,
-        statuses: Union[str, List[str]] = None,
-        created_since: Union[str, int] = None,
-        updated_since: Union[str, int] = None,
-        closed_since: Union[str, int] = None,
-        owned_by: str = None,
-        external_ids: str = None,
-    ):
-        """List of available transactions
-
-        Parameters
-        ----------
-        count: int, default 1000, optional
-            Specifies the number of items to retrieve
-        starting_from_id: int, optional
-            Specifies the ID of entity to retrieve records starting from
-        statuses: str, optional
-            Filter transactions by specified statuses.  Allowed values: listing, pending,
-            closed, and cancelled.  Multiple statuses can be used as a comma-separated
-            string
-        created_since: str or int, optional
-            Filter transactions created since specified date.  Date format:  YYYY-MM-DD or
-            13-digit unix timestamp
-        updated_since: str or int, optional
-            Filter transactions updated since specified date.  Date format:  YYYY-MM-DD or
-            13-digit unix timestamp
-        closed_since: str or int, optional
-            Filter transactions closed since specified date.  Date format:  YYYY-MM-DD or
-            13-digit unix timestamp
-        owned_by: str, optional
-            Filter transactions by owner - owner format TYPE-ID, i.g. "User-230" or
-            "Contact-1245"
-        external_ids: str, optional
-            Filter transactions by the comma separated list of external IDs
-        """
-        params = {
-            "count": count,
-            "starting_from_id": starting_from_id,
-            "statuses": statuses,
-            "created_since": created_since,
-            "updated_since": updated_since,
-            "closed_since": closed_since,
-            "owned_by": owned_by,
-            "external_ids": external_ids,
-        }
-        return self._get_data("transactions", "list", params=params)
-
-    def create_transactions(self, data: dict):
-        """Create Transaction
-
-        Parameters
-        ----------
-        data: dict, required
-            Data used to create the transaction.  Fields available are:
-                external_id: str, optional
-                address: str, required
-                city: str, required
-                state: str, required
-                zip: str, required
-                status: str, required
-                    One of listing, pending, closed, or cancelled
-                transaction_type: str, optional
-                price: number, required
-                acceptance_date: int, optional
-                    13-digit unix timestamp
-                expiration_date: int, optional
-                    13-digit unix timestamp
-                closing_date: int, optional
-                    13-digit unix timestamp
-                listing_date: int, optional
-                    13-digit unix timestamp
-                timezone: int, optional
-                    Transaction timezone in hours from UTC
-                listing_side_representer: object, required
-                    id: int
-                    type: str (Account, Contact)
-                buying_side_representer: object, required
-                    id: int
-                    type: str (Account, Contact)
-                custom_attributes: List[dict], optional
-                    name: str
-                    label: str
-                    type: str, [text, date, dropdown, money]
-                    value: str
-                    required: bool
-                    requried_if_status: str, [listing, pending, closed, cancelled]
-                    options: str
-        """
-        return self._get_data(
-            "transactions",
-            "create",
-            data=data,
-            required_fields=[
-                "address",
-                "city",
-                "state",
-                "zip",
-                "status",
-                "price",
-                "listing_side_representer",
-                "buying_side_representer",
-            ],
-        )
-
-    def get_transaction(self, transaction_id: int):
-        """Get Transaction
-
-        Parameters
-        ----------
-        transaction_id: int, required
-            ID of transaction
-        """
-        return self._get_data(
-            "transactions", "retrieve", uri_params={"transaction_id": transaction_id}
-        )
-
-    def update_transaction(self, transaction_id: int, data: dict):
-        """Update Transaction
-
-        Parameters
-        ----------
-        transaction_id: int, required
-            ID of transaction
-        """
-        return self._get_data(
-            "transactions",
-            "update",
-            uri_params={"transaction_id": transaction_id},
-            data=data,
-        )
-
-    def delete_transaction(self, transaction_id: int):
-        """Delete Transaction
-
-        Parameters
-        ----------
-        transaction_id: int, required
-            ID of transaction
-        """
-        return self._get_data(
-            "transactions", "destroy", uri_params={"transaction_id": transaction_id}
-        )
-
-    def list_transaction_participants(
-        self, transaction_id: int, *, full_info: int = None
-    ):
-        """List of transaction participants
-
-        Parameters
-        ----------
-        transaction_id: int, required
-            ID of transaction
-        full_info: int, default 0, optional
-            Specifies whether to retrieve short or full user / contact information.
-        """
-        return self._get_data(
-            "transaction_participants",
-            "list",
-            within="all",
-            uri_params={"transaction_id": transaction_id},
-            params={"full_info": full_info},
-        )
-
-    def list_user_transaction_participants(
-        self, transaction_id: int, *, full_info: int = None
+        shards: int = 8,
+        ordered: bool = False,
+        deadline: float = None,
+        **kwargs,
     ):
-        """List of user transaction participants
-
-        Parameters
-        ----------
-        transaction_id: int, required
-            ID of transaction
-        full_info: int, default 0, optional
-            Specifies whether to retrieve short or full user information.
-        """
-        return self._get_data(
-            "transaction_participants",
-            "list",
-            within="users",
-            uri_params={"transaction_id": transaction_id},
-            params={"full_info": full_info},
-        )
+        """Iterate through every page of a paginated list method using parallel
+        ID-range shards
 
-    def create_user_transaction_participants(self, transaction_id: int, data: dict):
-        """Add or update user participation
+        The ID space is estimated from the first record and a few probe requests,
+        split into shards ranges, and each range is read as its own
+        starting_from_id cursor chain concurrently.  Pages are yielded as they
+        arrive, or in ID order when ordered is True.
 
         Parameters
         ----------
-        transaction_id: int, required
-            ID of transaction
-        data: dict, required
-            Data used to create a user participant.  Fields available are:
-                id: int, required
-                    User ID
-                preserve_existing_role: bool, optional
-                    Flag to not modify existing role
-                role: str, required
-                    Person role in transaction
-                owner: bool
-                    Indicates whether the person owns this transaction.  There can
-                    be only one owner, so setting this flag will reset it for current
-                    owner
+        method: str, required
+            Name of a paginated list method, i.e. list_transactions, list_contacts
+            or list_users
+        shards: int, default 8, optional
+            Number of ID ranges read concurrently
+        ordered: bool, default False, optional
+            Yield pages in ID order instead of as soon as they arrive
+        deadline: float, optional
+            Budget, in seconds, for the whole scan
+        **kwargs
+            Keyword arguments passed to the list method
         """
-        return self._get_data(
-            "transaction_participants",
-            "create",
-            within="users",
-            uri_params={"transaction_id": transaction_id},
-            data=data,
-            required_fields=["role", "id"],
-        )
-
-    def get_user_transaction_participant(
-        self, transaction_id: int, user_id: int, *, full_info: int = None
-    ):
-        """Get user transaction participant
+        from .scan import scan
 
-        Parameters
-        ----------
-        transaction_id: int, required
-            ID of transaction
-        user_id: int, required
-            ID of user
-        full_info: int, default 0, optional
-            Specifies whether to retrieve short or full user information.
-        """
-        return self._get_data(
-            "transaction_participants",
-            "retrieve",
-            within="users",
-            uri_params={"transaction_id": transaction_id, "user_id": user_id},
-            params={"full_info": full_info},
+        return scan(
+            self, method, shards=shards, ordered=ordered, deadline=deadline, **kwargs
         )
 
-    def update_user_transaction_participant(
-        self, transaction_id: int, user_id: int, data: dict
-    ):
-        """Update user transaction participant
+    def _iter_batches(self, method: str, *args, **kwargs):
+        if method in self.PAGINATED_METHODS:
+            yield from self.paginate(method, *args, **kwargs)
+        else:
+            yield as_records(getattr(self, method)(*args, **kwargs))
 
-        Parameters
-        ----------
-        transaction_id: int, required
-            ID of transaction
-        user_id: int, required
-            ID of user
-        data: dict, required
-            Data used to update a user participant.  Fields available are:
-                id: int, required
-                    User ID
-                preserve_existing_role: bool, optional
-                    Flag to not modify existing role
-                role: str, optional
-                    Person role in transaction
-                owner: bool
-                    Indicates whether the person owns this transaction.  There can
-                    be only one owner, so setting this flag will reset it for current
-                    owner
-        """
-        return self._get_data(
-            "transaction_participants",
-            "update",
-            within="users",
-            uri_params={"transaction_id": transaction_id, "user_id": user_id},
-            data=data,
-            required_fields=["id"],
-        )
+    def to_frame(self, method: str, *args, sep: str = ".", **kwargs):
+        """Return the results of a list or report method as a pandas DataFrame
 
-    def delete_user_transaction_participant(self, transaction_id: int, user_id: int):
-        """Remove user transaction participant
+        Paginated methods are read page by page and accumulated directly into
+        columns.  Nested objects are flattened into columns joined by sep and
+        13-digit unix timestamps are converted to datetimes.
 
         Parameters
         ----------
-        transaction_id: int, required
-            ID of transaction
-        user_id: int, required
-            ID of user
+        method: str, required
+            Name of the method to call, e.g. list_transactions,
+            list_transaction_commissions or get_report_data
+        *args
+            Positional arguments passed to the method
+        sep: str, default '.', optional
+            Separator used to join nested keys
+        **kwargs
+            Keyword arguments passed to the method
         """
-        return self._get_data(
-            "transaction_participants",
-            "destroy",
-            within="users",
-            uri_params={"transaction_id": transaction_id, "user_id": user_id},
-        )
-
-    def list_contact_transaction_participants(
-        self, transaction_id: int, *, full_info: int = None
-    ):
-        """List of contact transaction participants
+        from .frames import to_frame
 
-        Parameters
-        ----------
-        transaction_id: int, required
-            ID of transaction
-        full_info: int, default 0, optional
-            Specifies whether to retrieve short or full contact information.
-        """
-        return self._get_data(
-            "transaction_participants",
-            "list",
-            within="contacts",
-            uri_params={"transaction_id": transaction_id},
-            params={"full_info": full_info},
-        )
+        return to_frame(self._iter_batches(method, *args, **kwargs), sep=sep)
 
-    def create_contact_transaction_participants(self, transaction_id: int, data: dict):
-        """Add or update contact participation
+    def as_arrow(self, method: str, *args, sep: str = ".", **kwargs):
+        """Return the results of a list or report method as a pyarrow Table
 
         Parameters
         ----------
-        transaction_id: int, required
-            ID of transaction
-        data: dict, required
-            Data used to create a contact participant.  Fields available are:
-                id: int, required
-                    Contact ID
-                preserve_existing_role: bool, optional
-                    Flag to not modify existing role
-                role: str, required
-                    Person role in transaction
-                owner: bool
-                    Indicates whether the person owns this transaction.  There can
-                    be only one owner, so setting this flag will reset it for current
-                    owner
+        method: str, required
+            Name of the method to call, e.g. list_transactions,
+            list_transaction_commissions or get_report_data
+        *args
+            Positional arguments passed to the method
+        sep: str, default '.', optional
+            Separator used to join nested keys
+        **kwargs
+            Keyword arguments passed to the method
         """
-        return self._get_data(
-            "transaction_participants",
-            "create",
-            within="contactts",
-            uri_params={"transaction_id": transaction_id},
-            data=data,
-            required_fields=["id", "role"],
-        )
+        from .frames import to_arrow
 
-    def get_contact_transaction_participant(
-        self, transaction_id: int, contact_id: int, *, full_info: int = None
-    ):
-        """Get contact transaction participant
+        return to_arrow(self._iter_batches(method, *args, **kwargs), sep=sep)
 
-        Parameters
-        ----------
-        transaction_id: int, required
-            ID of transaction
-        contact_id: int, required
-            ID of contact
-        full_info: int, default 0, optional
-            Specifies whether to retrieve short or full contact information.
-        """
-        return self._get_data(
-            "transaction_participants",
-            "retrieve",
-            within="contacts",
-            uri_params={"transaction_id": transaction_id, "contact_id": contact_id},
-            params={"full_info": full_info},
-        )
-
-    def update_contact_transaction_participant(
-        self, transaction_id: int, contact_id: int, data: dict
+    def dump_account(
+        self,
+        out_dir: str,
+        *,
+        workers: int = None,
+        threads: int = 4,
+        format: str = "ndjson",
+        **kwargs,
     ):
-        """Update contact transaction participant
+        """Export transactions and their participants, checklists, tasks and
+        commissions across a process pool
 
-        Parameters
-        ----------
-        transaction_id: int, required
-            ID of transaction
-        contact_id: int, required
-            ID of contact
-        data: dict, required
-            Data used to update a contact participant.  Fields available are:
-                id: int, required
-                    Contact ID
-                preserve_existing_role: bool, required
-                    Flag to not modify existing role
-                role: str
-                    Person role in transaction
-                owner: bool
-                    Indicates whether the person owns this transaction.  There can
-                    be only one owner, so setting this flag will reset it for current
-                    owner
-        """
-        return self._get_data(
-            "transaction_participants",
-            "update",
-            within="contacts",
-            uri_params={"transaction_id": transaction_id, "contact_id": contact_id},
-            data=data,
-            required_fields=["id"],
-        )
-
-    def delete_contact_transaction_participant(
-        self, transaction_id: int, contact_id: int
-    ):
-        """Remove contact transaction participant
+        Worker processes use clients built with the options of this client
+        (transport, timeout, circuit breaker, ...) that can be pickled.
 
         Parameters
         ----------
-        transaction_id: int, required
-            ID of transaction
-        contact_id: int, required
-            ID of contact
+        out_dir: str, required
+            Directory the export is written to
+        workers: int, optional
+            Number of worker processes.  Defaults to the number of CPUs
+        threads: int, default 4, optional
+            Number of concurrent requests within each worker
+        format: str, default 'ndjson', optional
+            Either ndjson or parquet (requires pyarrow)
+        **kwargs
+            Keyword arguments passed to list_transactions, e.g. statuses="closed"
         """
-        return self._get_data(
-            "transaction_participants",
-            "destroy",
-            within="contacts",
-            uri_params={"transaction_id": transaction_id, "contact_id": contact_id},
-        )
+        from .export import dump_account
 
-    def list_transaction_commissions(self, transaction_id: int):
-        """List of transaction commission items
-
-        Parameters
-        ----------
-        transaction_id: int, required
-            ID of transaction
-        """
-        return self._get_data(
-            "transaction_commissions",
-            "list",
-            uri_params={"transaction_id": transaction_id},
+        return dump_account(
+            out_dir,
+            api_key=self.api_key,
+            client_options=self._worker_options(),
+            workers=workers,
+            threads=threads,
+            format=format,
+            **kwargs,
         )
 
-    def list_transaction_checklists(self, transaction_id: int):
-        """List of available transaction's checklists
+    def snapshot(self, method: str, path: str, *args, **kwargs):
+        """Write every record of a paginated list method to an NDJSON snapshot
+        with an id -> offset index, returning the memory-mapped Snapshot
 
         Parameters
         ----------
-        transaction_id: int, required
-            ID of transaction
-        """
-        return self._get_data(
-            "transaction_checklists",
-            "list",
-            uri_params={"transaction_id": transaction_id},
-        )
-
-    def get_transaction_checklists(self, transaction_id: int, checklist_id: int):
-        """Get transaction checklists by ID
-
-        Parameters
-        ----------
-        transaction_id: int, required
-            ID of transaction
-        checklist_id: int, required
-            ID of checklist
-        """
-        return self._get_data(
-            "transaction_checklists",
-            "retrieve",
-            uri_params={"transaction_id": transaction_id, "checklist_id": checklist_id},
-        )
-
-    def list_transaction_tasks(self, transaction_id: int, checklist_id: int):
-        """List of tasks in specified transaction checklists
-
-        Parameters
-        ----------
-        transaction_id: int, required
-            ID of transaction
-        checklist_id: int, required
-            ID of checklist
-        """
-        return self._get_data(
-            "transaction_tasks",
-            "list",
-            within="tasks",
-            uri_params={"transaction_id": transaction_id, "checklist_id": checklist_id},
-        )
-
-    def create_transaction_task(
-        self, transaction_id: int, checklist_id: int, data: dict
-    ):
-        """Create a new task in specified transaction checklists
-
-        Parameters
-        ----------
-        transaction_id: int, required
-            ID of transaction
-        checklist_id: int, required
-            ID of checklist
-        data: dict, required
-            Data used to create a task.  Fields available are:
-                name: str, required
-                description: str, optional
-                document_required: bool, optional
-                done: bool, optional
-                deadline: int, optional
-                    13-digit unix timestamp
-        """
-        return self._get_data(
-            "transaction_tasks",
-            "create",
-            within="tasks",
-            uri_params={"transaction_id": transaction_id, "checklist_id": checklist_id},
-            data=data,
-            required_fields=["name"],
-        )
-
-    def get_transaction_task(
-        self, transaction_id: int, checklist_id: int, task_id: int
-    ):
-        """Get transaction task by ID
-
-        Parameters
-        ----------
-        transaction_id: int, required
-            ID of transaction
-        checklist_id: int, required
-            ID of checklist
-        task_id: int, required
-            ID of task
+        method: str, required
+            Name of a paginated list method, i.e. list_transactions, list_contacts
+            or list_users
+        path: str, required
+            Location of the NDJSON file.  The index is written to path + '.idx'
+        *args
+            Positional arguments passed to the list method
+        **kwargs
+            Keyword arguments passed to paginate, e.g. fields or deadline
         """
-        return self._get_data(
-            "transaction_tasks",
-            "retrieve",
-            within="tasks",
-            uri_params={
-                "transaction_id": transaction_id,
-                "checklist_id": checklist_id,
-                "task_id": task_id,
-            },
-        )
-
-    def update_transaction_task(
-        self, transaction_id: int, checklist_id: int, task_id: int, data: dict
-    ):
-        """Get transaction task by ID
+        from .snapshot import write_snapshot
 
-        Parameters
-        ----------
-        transaction_id: int, required
-            ID of transaction
-        checklist_id: int, required
-            ID of checklist
-        task_id: int, required
-            ID of task
-        data: dict, required
-            Data used to create a task.  Fields available are:
-                name: str, required
-                description: str, optional
-                document_required: bool, optional
-                done: bool, optional
-                deadline: int, optional
-                    13-digit unix timestamp
-        """
-        return self._get_data(
-            "transaction_tasks",
-            "update",
-            within="tasks",
-            uri_params={
-                "transaction_id": transaction_id,
-                "checklist_id": checklist_id,
-                "task_id": task_id,
-            },
-            data=data,
-            required_fields=["name"],
-        )
+        return write_snapshot(self, method, path, *args, **kwargs)
 
-    def submit_transaction_task_document(
-        self, transaction_id: int, checklist_id: int, task_id: int, files: dict
+    def upsert_users(
+        self,
+        records: Iterable[dict],
+        *,
+        key: str = "external_id",
+        batch_size: int = 100,
+        max_workers: int = 8,
+        deadline: float = None,
+        raise_errors: bool = True,
     ):
-        """Submit task's document for review
-
-        Parameters
-        ----------
-        transaction_id: int, required
-            ID of transaction
-        checklist_id: int, required
-            ID of checklist
-        task_id: int, required
-            ID of task
-        files: dict, required
-            File to submit
-        """
-        return self._get_data(
-            "transaction_tasks",
-            "create",
-            within="document",
-            uri_params={
-                "transaction_id": transaction_id,
-                "checklist_id": checklist_id,
-                "task_id": task_id,
-            },
-            files=files,
+        """Create users that do not exist yet and update those that changed
+
+        Existing users are found with batched list requests filtered by key,
+        creates and updates are sent concurrently and updates matching the
+        server's data are skipped.  See brokermint.upsert.upsert.
+
+        Parameters
+        ----------
+        records: iterable, required
+            Data of each user, including its key
+        key: str, default 'external_id', optional
+            Field identifying users, external_id or email
+        batch_size: int, default 100, optional
+            Number of keys looked up per list request
+        max_workers: int, default 8, optional
+            Maximum number of concurrent requests
+        deadline: float, optional
+            Budget, in seconds, for the whole upsert
+        raise_errors: bool, default True, optional
+            Stop at the first failed create or update.  When False, failures are
+            yielded with the failed action
+
+        Yields
+        ------
+        UpsertResult
+            (key, action, result) for every distinct key, where action is one of
+            created, updated, unchanged or failed
+        """
+        from .upsert import upsert
+
+        return upsert(
+            self,
+            "users",
+            records,
+            key=key,
+            batch_size=batch_size,
+            max_workers=max_workers,
+            deadline=deadline,
+            raise_errors=raise_errors,
         )
 
-    def create_transaction_task_comment(
-        self, transaction_id: int, checklist_id: int, task_id: int, data: dict
+    def upsert_contacts(
+        self,
+        records: Iterable[dict],
+        *,
+        key: str = "external_id",
+        batch_size: int = 100,
+        max_workers: int = 8,
+        deadline: float = None,
+        raise_errors: bool = True,
     ):
-        """Create task comment
-
-        Parameters
-        ----------
-        transaction_id: int, required
-            ID of transaction
-        checklist_id: int, required
-            ID of checklist
-        task_id: int, required
-            ID of task
-        data: dict, required
-            Data used to create a comment.  Fields available are:
-                text: str, required
-        """
-        return self._get_data(
-            "transaction_tasks",
-            "create",
-            within="comment",
-            uri_params={
-                "transaction_id": transaction_id,
-                "checklist_id": checklist_id,
-                "task_id": task_id,
-            },
-            data=data,
-        )
-
-    def create_transaction_document(self, transaction_id: int, data: dict):
-        """Create transaction document
-
-        Parameters
-        ----------
-        transaction_id: int, required
-            ID of transaction
-        data: dict, required
-            Data used to create a comment.  Fields available are:
-                task_id: int, optional
-                    ID of task to add document to
-                name: str
-                    Document's file name
-                content_type: str
-                    Default "text/plain"
-                path: str <URL>
-                    Public URL to document file
-        """
-        return self._get_data(
-            "transaction_documents",
-            "create",
-            uri_params={
-                "transaction_id": transaction_id,
-            },
-            data=data,
-        )
-
-    def get_transaction_document(self, transaction_id: int, document_id: int):
-        """Get transaction's document
-
-        Parameters
-        ----------
-        transaction_id: int, required
-            ID of transaction
-        document_id: int, required
-            ID of document
-        """
-        return self._get_data(
-            "transaction_documents",
-            "retrieve",
-            uri_params={
-                "transaction_id": transaction_id,
-                "document_id": document_id,
-            },
-        )
-
-    def create_transaction_note(self, transaction_id: int, data: dict):
-        """Add comment to transaction
-
-        Parameters
-        ----------
-        transaction_id: int, required
-            ID of transaction
-        data: dict, required
-            Data used to create a comment.  Fields available are:
-                text: str
-        """
-        return self._get_data(
-            "transaction_notes",
-            "create",
-            uri_params={
-                "transaction_id": transaction_id,
-            },
-            data=data,
-            required_fields=["text"],
+        """Create contacts that do not exist yet and update those that changed
+
+        Existing contacts are found with batched list requests filtered by key,
+        creates and updates are sent concurrently and updates matching the
+        server's data are skipped.  See brokermint.upsert.upsert.
+
+        Parameters
+        ----------
+        records: iterable, required
+            Data of each contact, including its key
+        key: str, default 'external_id', optional
+            Field identifying contacts, external_id or email
+        batch_size: int, default 100, optional
+            Number of keys looked up per list request
+        max_workers: int, default 8, optional
+            Maximum number of concurrent requests
+        deadline: float, optional
+            Budget, in seconds, for the whole upsert
+        raise_errors: bool, default True, optional
+            Stop at the first failed create or update.  When False, failures are
+            yielded with the failed action
+
+        Yields
+        ------
+        UpsertResult
+            (key, action, result) for every distinct key, where action is one of
+            created, updated, unchanged or failed
+        """
+        from .upsert import upsert
+
+        return upsert(
+            self,
+            "contacts",
+            records,
+            key=key,
+            batch_size=batch_size,
+            max_workers=max_workers,
+            deadline=deadline,
+            raise_errors=raise_errors,
         )
 
-    def list_transaction_backups(
+    def upsert_transactions(
         self,
-        transaction_id: int,
+        records: Iterable[dict],
         *,
-        count: int = None,
-        starting_from_id: int = None,
-        completed_since: Union[str, int] = None,
-        exclude_backup_ids: str = None,
+        key: str = "external_id",
+        batch_size: int = 100,
+        max_workers: int = 8,
+        deadline: float = None,
+        raise_errors: bool = True,
     ):
-        """List of transaction's backups
-
-        Parameters
-        ----------
-        transaction_id: int, required
-            ID of transaction
-        count: int, default 1000, optional
-            Specifies the number of items to retrieve
-        starting_from_id: int, optional
-            Specifies the ID of entity to retrieve records starting from
-        completed_since: str or int, optional
-            Filter backups completed since specified date.  Date format YYYY-MM-DD or
-            13-digit unix timestamp
-        exclude_backup_ids: str, optional
-            Array of strings - filter out backups with IDs in specified comma separated list
-        """
-        return self._get_data(
-            "transaction_backups",
-            "list",
-            within="all",
-            uri_params={"transaction_id": transaction_id},
-            params={
-                "count": count,
-                "starting_from_id": starting_from_id,
-                "completed_since": completed_since,
-                "exclude_backup_ids": exclude_backup_ids,
-            },
-        )
-
-    def get_latest_transaction_backup(self, transaction_id: int):
-        """Get latest transaction backup
-
-        Parameters
-        ----------
-        transaction_id: int, required
-            ID of transaction
-        """
-        return self._get_data(
-            "transaction_backups",
-            "retrieve",
-            within="latest",
-            uri_params={"transaction_id": transaction_id},
-        )
-
-    def list_transaction_offers(self, transaction_id: int):
-        """List available offers in transaction
-
-        Parameters
-        ----------
-        transaction_id: int, required
-            ID of transaction
-        """
-        return self._get_data(
-            "transaction_offers",
-            "list",
-            within="all",
-            uri_params={"transaction_id": transaction_id},
-        )
-
-    def get_transaction_offer(self, transaction_id: int, offer_id: int):
-        """Get offer by ID
-
-        Parameters
-        ----------
-        transaction_id: int, required
-            ID of transaction
-        offer_id: int, required
-            ID of the offer
-        """
-        return self._get_data(
-            "transaction_offers",
-            "retrieve",
-            within="all",
-            uri_params={"transaction_id": transaction_id, "offer_id": offer_id},
+        """Create transactions that do not exist yet and update those that changed
+
+        Existing transactions are found with batched list requests filtered by key,
+        creates and updates are sent concurrently and updates matching the
+        server's data are skipped.  See brokermint.upsert.upsert.
+
+        Parameters
+        ----------
+        records: iterable, required
+            Data of each transaction, including its key
+        key: str, default 'external_id', optional
+            Field identifying transactions, only external_id is supported
+        batch_size: int, default 100, optional
+            Number of keys looked up per list request
+        max_workers: int, default 8, optional
+            Maximum number of concurrent requests
+        deadline: float, optional
+            Budget, in seconds, for the whole upsert
+        raise_errors: bool, default True, optional
+            Stop at the first failed create or update.  When False, failures are
+            yielded with the failed action
+
+        Yields
+        ------
+        UpsertResult
+            (key, action, result) for every distinct key, where action is one of
+            created, updated, unchanged or failed
+        """
+        from .upsert import upsert
+
+        return upsert(
+            self,
+            "transactions",
+            records,
+            key=key,
+            batch_size=batch_size,
+            max_workers=max_workers,
+            deadline=deadline,
+            raise_errors=raise_errors,
         )
 
-    def get_transaction_offer_attachment(
-        self, transaction_id: int, offer_id: int, attachment_id: int
+    def walk_tasks(
+        self,
+        transaction_ids: Iterable[int],
+        *,
+        filter: Callable[[dict], bool] = None,
+        max_workers: int = 8,
+        deadline: float = None,
     ):
-        """Get offer attachment by ID
-
-        Parameters
-        ----------
-        transaction_id: int, required
-            ID of transaction
-        offer_id: int, required
-            ID of the offer
-        attachment_id: int, required
-            ID of the attachment
-        """
-        return self._get_data(
-            "transaction_offers",
-            "retrieve",
-            within="attachment",
-            uri_params={
-                "transaction_id": transaction_id,
-                "offer_id": offer_id,
-                "attachment_id": attachment_id,
-            },
-        )
-
-    def create_incoming_transaction(self, data: dict):
-        """Create or update incoming transactions
-
-        Note
-        ----
-        If existing transaction was already accepted or declined, its updates will be ignored
-
-        Parameters
-        ----------
-        data: dict, required
-            Data used to create an incoming transaction.  Fields available are:
-                source_id: str
-                    Incoming transaction source - this can be the name of CRM or other
-                    system that sourced these transactions.  This allows you to distinguish
-                    incoming transactions with the same external IDs from different
-                    sources
-                transactions: List[dict]
-                    See create_transaction
-        """
-        return self._get_data(
-            "incoming_transactions",
-            "create",
-            data=data,
-            required_fields=["source_id", "transactions"],
-        )
-
-    def list_reports(self):
-        """List available reports in account"""
-        return self._get_data(
-            "reports",
-            "list",
-            within="all",
-        )
-
-    def list_report_filters(self, report_id: int):
-        """List of filters and available filter options for specified report
-
-        Parameters
-        ----------
-        report_id: int, required
-            ID of report
-        """
-        return self._get_data(
-            "reports", "list", within="filters", uri_params={"report_id": report_id}
-        )
-
-    def get_report_data(self, report_id: int):
-        """Retrieve report data
-
-        Note
-        ----
-        All query parameters except timezone are filters - field=filter_value
-
-        Parameters
-        ----------
-        report_id: int, required
-            ID of report
-        """
-        return self._get_data(
-            "reports",
-            "retrieve",
-            within="data",
-            uri_params={
-                "report_id": report_id,
-            },
-        )
-
-    def get_sso_token(self, user_id: int):
-        """Get SSO token for user
-
-        Note
-        ----
-        SSO API allows a user to remotely login to Brokermint.  To login a user into
-        Brokermint using the sso token, redirect the user to the URL:
-        https://my.brokermint.com/users/sign_in_by_token?token=<token>
-
-        Parameters
-        ----------
-        report_id: int, required
-            ID of report
-        """
-        return self._get_data("sso", "retrieve", uri_params={"user_id": user_id})
+        """Iterate through the tasks of every checklist of many transactions
+
+        Checklists and tasks are fetched concurrently, with at most max_workers
+        requests in flight per level, and tasks are yielded as soon as their
+        checklist has been fetched rather than after the whole tree resolves.
+        Each task is tagged with its transaction_id and checklist_id.
+
+        Parameters
+        ----------
+        transaction_ids: iterable, required
+            IDs of transactions
+        filter: callable, optional
+            Predicate applied to each task; only tasks it returns True for are
+            yielded, e.g. lambda task: not task["done"]
+        max_workers: int, default 8, optional
+            Maximum number of concurrent requests per level
+        deadline: float, optional
+            Budget, in seconds, for the whole walk.  Tasks fetched before it
+            passes are still yielded
+        """
+        deadline = _deadline.resolve(deadline)
+
+        list_checklists = missing_as(self.list_transaction_checklists)
+        list_tasks = missing_as(self.list_transaction_tasks)
+
+        def _checklists(transaction_id):
+            return as_records(list_checklists(transaction_id))
+
+        def _tasks(pair):
+            return as_records(list_tasks(*pair))
+
+        checklists = (
+            (transaction_id, checklist["id"])
+            for transaction_id, found in concurrent_map(
+                _checklists, transaction_ids, max_workers=max_workers, deadline=deadline
+            )
+            for checklist in found
+        )
+        for (transaction_id, checklist_id), tasks in concurrent_map(
+            _tasks, checklists, max_workers=max_workers, deadline=deadline
+        ):
+            for task in tasks:
+                task["transaction_id"] = transaction_id
+                task["checklist_id"] = checklist_id
+                if filter is None or filter(task):
+                    yield task
@@ -0,0 +1,140 @@
+"""Circuit breakers for endpoint groups"""
+
+from collections import deque
+import threading
+import time
+
+from .exceptions import CircuitOpenError, LoadShedError
+
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+NORMAL = "normal"
+PROBE = "probe"
+
+
+class CircuitBreaker:
+    """Fail fast when an endpoint group keeps failing
+
+    The breaker tracks the outcome of the last window requests.  Once at least
+    min_requests have been made and the failure rate reaches failure_threshold,
+    the circuit opens and requests fail immediately with CircuitOpenError.
+    After reset_timeout seconds the circuit is half-open:  up to half_open_max
+    probe requests are let through and the circuit closes again if they succeed,
+    or reopens if any fails.
+
+    Parameters
+    ----------
+    group: str, required
+        Endpoint group, i.e. a key in Client.ENDPOINTS
+    failure_threshold: float, default 0.5, optional
+        Failure rate (0 - 1) that opens the circuit
+    window: int, default 20, optional
+        Number of recent requests the failure rate is computed over
+    min_requests: int, default 10, optional
+        Minimum number of requests in the window before the circuit can open
+    reset_timeout: float, default 30, optional
+        Seconds the circuit stays open before allowing probe requests
+    half_open_max: int, default 1, optional
+        Number of concurrent probe requests allowed while half-open
+    max_in_flight: int, optional
+        Shed load by failing fast with LoadShedError when this many requests
+        are already in flight for the group
+    """
+
+    def __init__(
+        self,
+        group: str,
+        *,
+        failure_threshold: float = 0.5,
+        window: int = 20,
+        min_requests: int = 10,
+        reset_timeout: float = 30,
+        half_open_max: int = 1,
+        max_in_flight: int = None,
+    ):
+        self.group = group
+        self.failure_threshold = failure_threshold
+        self.min_requests = min_requests
+        self.reset_timeout = reset_timeout
+        self.half_open_max = half_open_max
+        self.max_in_flight = max_in_flight
+        self.state = CLOSED
+        self._outcomes = deque(maxlen=window)
+        self._opened_at = 0.0
+        self._probes = 0
+        self._in_flight = 0
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Reserve a slot for a request, raising if the request must not be made
+
+        Returns a token to pass to release, telling probe requests made while
+        the circuit is half-open from other requests.
+        """
+        with self._lock:
+            if self.max_in_flight is not None and self._in_flight >= self.max_in_flight:
+                raise LoadShedError(self.group)
+            if self.state == OPEN:
+                remaining = self._opened_at + self.reset_timeout - time.monotonic()
+                if remaining > 0:
+                    raise CircuitOpenError(self.group, remaining)
+                self._set_state(HALF_OPEN)
+                self._probes = 0
+            kind = NORMAL
+            if self.state == HALF_OPEN:
+                if self._probes >= self.half_open_max:
+                    raise CircuitOpenError(self.group)
+                self._probes += 1
+                kind = PROBE
+            self._in_flight += 1
+            return kind, self._generation
+
+    def release(self, token: tuple, success: bool):
+        """Record the outcome of a request made after acquire
+
+        Outcomes of requests acquired before the circuit last changed state are
+        stale and ignored:  only probes close or reopen a half-open circuit.
+
+        Parameters
+        ----------
+        token: tuple, required
+            Token returned by acquire
+        success: bool, required
+            Whether the request succeeded, or None to only free the slot, e.g.
+            when the request was cut short by the caller's own deadline
+        """
+        kind, generation = token
+        with self._lock:
+            self._in_flight -= 1
+            if generation != self._generation:
+                return
+            if kind == PROBE:
+                self._probes -= 1
+                if success is None:
+                    return
+                if success:
+                    self._set_state(CLOSED)
+                    self._outcomes.clear()
+                else:
+                    self._open()
+                return
+            if success is None:
+                return
+            self._outcomes.append(success)
+            if len(self._outcomes) >= self.min_requests:
+                failures = self._outcomes.count(False)
+                if failures / len(self._outcomes) >= self.failure_threshold:
+                    self._open()
+
+    def _set_state(self, state: str):
+        self.state = state
+        self._generation += 1
+
+    def _open(self):
+        self._set_state(OPEN)
+        self._opened_at = time.monotonic()
+        self._outcomes.clear()
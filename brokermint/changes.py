@@ -0,0 +1,198 @@
+"""Change detection between successive pulls using content hashes"""
+
+from hashlib import blake2b
+from typing import Iterable, List, NamedTuple
+import json
+
+from .frames import flatten_record
+
+
+class Update(NamedTuple):
+    record: dict
+    changed: List[str]
+
+
+class ChangeSet(NamedTuple):
+    inserts: List[dict]
+    updates: List[Update]
+    deletes: list
+
+    def __bool__(self):
+        return bool(self.inserts or self.updates or self.deletes)
+
+
+# Keyword arguments of list methods that don't filter out records
+UNFILTERED = {"count", "starting_from_id", "full_info", "deadline"}
+
+
+def _digest(value) -> int:
+    encoded = json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+    return int.from_bytes(
+        blake2b(encoded.encode(), digest_size=8).digest(), "little"
+    )
+
+
+class ChangeDetector:
+    """Detect inserted, updated and deleted records between successive pulls
+
+    Only a compact fingerprint of each record is kept between pulls:  a 64-bit
+    hash of the record and, when track_fields is True, a 64-bit hash per field so
+    that updates can report which field paths changed.
+
+    Parameters
+    ----------
+    key: str, default 'id', optional
+        Field uniquely identifying a record
+    ignore: list, optional
+        Field paths excluded from hashing, e.g. ['updated_at']
+    track_fields: bool, default True, optional
+        Keep per-field hashes to report changed field paths on updates
+    """
+
+    def __init__(
+        self,
+        *,
+        key: str = "id",
+        ignore: Iterable[str] = None,
+        track_fields: bool = True,
+    ):
+        self.key = key
+        self.ignore = frozenset(ignore or ())
+        self.track_fields = track_fields
+        self.state = {}
+
+    def __len__(self):
+        return len(self.state)
+
+    def fingerprint(self, record: dict):
+        """Return the record hash and, optionally, per-field hashes
+
+        Parameters
+        ----------
+        record: dict, required
+            Record returned from the API
+        """
+        fields = {
+            path: _digest(value)
+            for path, value in flatten_record(record).items()
+            if path not in self.ignore
+        }
+        record_hash = _digest(sorted(fields.items()))
+        return record_hash, (fields if self.track_fields else None)
+
+    def diff(self, records: Iterable[dict], *, complete: bool = True) -> ChangeSet:
+        """Compare records against the previous pull and update the stored state
+
+        Parameters
+        ----------
+        records: iterable, required
+            Records from the current pull
+        complete: bool, default True, optional
+            Whether records is a full pull.  Deletes can only be detected from
+            full pulls; incremental pulls (e.g. using updated_since) should pass
+            False
+
+        The stored state is only updated once records is exhausted, so a pull
+        that fails part way leaves it untouched.
+        """
+        inserts, updates = [], []
+        seen = set()
+        state = self.state
+        changed = {}
+        for record in records:
+            record_id = record[self.key]
+            seen.add(record_id)
+            record_hash, fields = self.fingerprint(record)
+            previous = changed.get(record_id) or state.get(record_id)
+            if previous is None:
+                inserts.append(record)
+            elif previous[0] != record_hash:
+                updates.append(Update(record, _changed_paths(previous[1], fields)))
+            else:
+                continue
+            changed[record_id] = (record_hash, fields)
+        state.update(changed)
+        deletes = []
+        if complete:
+            deletes = [k for k in state if k not in seen]
+            for k in deletes:
+                del state[k]
+        return ChangeSet(inserts, updates, deletes)
+
+    def pull(self, client, method: str, *args, complete: bool = None, **kwargs):
+        """Paginate a list method and diff the results against the previous pull
+
+        Parameters
+        ----------
+        client: Client, required
+            Client used to make requests
+        method: str, required
+            Name of a paginated list method, e.g. list_transactions,
+            list_contacts or list_users
+        complete: bool, optional
+            Whether the pull is a full pull.  Defaults to True unless a filter
+            (e.g. updated_since, statuses or owned_by) is passed.  A full pull
+            cut short by a deadline raises DeadlineExceeded and leaves the stored
+            state untouched
+        **kwargs
+            Keyword arguments passed to Client.paginate.  fields is not
+            supported:  projected records cannot be compared with full ones
+        """
+        if "fields" in kwargs:
+            raise ValueError("fields is not supported by ChangeDetector.pull")
+        if complete is None:
+            complete = not any(
+                v is not None for k, v in kwargs.items() if k not in UNFILTERED
+            )
+        pages = client.paginate(method, *args, partial=not complete, **kwargs)
+        return self.diff((r for page in pages for r in page), complete=complete)
+
+    def save(self, path: str):
+        """Persist the stored fingerprints to a file
+
+        Parameters
+        ----------
+        path: str, required
+            Location of the file
+        """
+        with open(path, "w") as f:
+            json.dump(
+                {
+                    "key": self.key,
+                    "ignore": sorted(self.ignore),
+                    "track_fields": self.track_fields,
+                    "state": [[k, h, fields] for k, (h, fields) in self.state.items()],
+                },
+                f,
+                separators=(",", ":"),
+            )
+
+    @classmethod
+    def load(cls, path: str, *, ignore: Iterable[str] = None):
+        """Load fingerprints previously persisted with save
+
+        Parameters
+        ----------
+        path: str, required
+            Location of the file
+        ignore: list, optional
+            Field paths excluded from hashing.  Defaults to those of the saved
+            detector
+        """
+        with open(path) as f:
+            saved = json.load(f)
+        if ignore is None:
+            ignore = saved.get("ignore")
+        detector = cls(
+            key=saved["key"], ignore=ignore, track_fields=saved["track_fields"]
+        )
+        detector.state = {k: (h, fields) for k, h, fields in saved["state"]}
+        return detector
+
+
+def _changed_paths(previous: dict, current: dict) -> List[str]:
+    if previous is None or current is None:
+        return []
+    paths = [p for p, h in current.items() if previous.get(p) != h]
+    paths.extend(p for p in previous if p not in current)
+    return paths
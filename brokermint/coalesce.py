@@ -0,0 +1,203 @@
+"""Batch many email / external_id lookups into few list requests"""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Iterable
+import threading
+import time
+
+
+# (resource, filter) -> (list method, record field matched against the filter)
+LOOKUPS = {
+    ("users", "emails"): ("list_users", "email"),
+    ("users", "external_ids"): ("list_users", "external_id"),
+    ("contacts", "emails"): ("list_contacts", "email"),
+    ("contacts", "external_ids"): ("list_contacts", "external_id"),
+    ("transactions", "external_ids"): ("list_transactions", "external_id"),
+}
+
+
+def _normalize(by: str, value) -> str:
+    value = str(value).strip()
+    return value.lower() if by == "emails" else value
+
+
+class LookupCoalescer:
+    """Resolve emails and external IDs to records with batched list requests
+
+    Lookups of the same kind made within window seconds of each other, from any
+    number of threads, are combined into one list request whose filter is the
+    comma separated list of values, e.g. list_users(emails='a@x.com,b@x.com').
+    A batch is sent as soon as it holds max_batch values or its window ends, and
+    the matching record is handed back to each caller.
+
+    Parameters
+    ----------
+    client: Client, required
+        Client used to make requests
+    window: float, default 0.01, optional
+        Seconds to wait for more lookups before sending a batch
+    max_batch: int, default 100, optional
+        Maximum number of values sent in one request
+    max_workers: int, default 4, optional
+        Maximum number of batches requested concurrently
+    """
+
+    def __init__(
+        self,
+        client,
+        *,
+        window: float = 0.01,
+        max_batch: int = 100,
+        max_workers: int = 4,
+    ):
+        self.client = client
+        self.window = window
+        self.max_batch = max_batch
+        self.max_workers = max_workers
+        self.requests = 0
+        self._pending = {}
+        self._opened = {}
+        self._cond = threading.Condition()
+        self._closed = False
+        self._thread = None
+        self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def lookup(self, resource: str, by: str, value) -> Future:
+        """Queue a lookup, returning a future resolved with the matching record,
+        or None when there is no match
+
+        Parameters
+        ----------
+        resource: str, required
+            One of users, contacts or transactions
+        by: str, required
+            Filter to look the value up with, either emails or external_ids
+        value: str, required
+            Email or external ID
+        """
+        if (resource, by) not in LOOKUPS:
+            raise ValueError(
+                f"Cannot look up {resource} by {by}.  Choose one of:  "
+                f"{', '.join(f'{r} by {b}' for r, b in LOOKUPS)}"
+            )
+        value = _normalize(by, value)
+        if "," in value:
+            raise ValueError(f"Values cannot contain commas:  {value!r}")
+        future = Future()
+        kind = (resource, by)
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("The coalescer is closed")
+            self._start()
+            pending = self._pending.setdefault(kind, {})
+            if not pending:
+                self._opened[kind] = time.monotonic()
+            pending.setdefault(value, []).append(future)
+            self._cond.notify()
+        return future
+
+    def get(self, resource: str, by: str, value, timeout: float = None):
+        """Look up a record, blocking until its batch is answered
+
+        Parameters
+        ----------
+        resource: str, required
+            One of users, contacts or transactions
+        by: str, required
+            Filter to look the value up with, either emails or external_ids
+        value: str, required
+            Email or external ID
+        timeout: float, optional
+            Seconds to wait for the answer
+        """
+        return self.lookup(resource, by, value).result(timeout)
+
+    def resolve(self, resource: str, by: str, values: Iterable) -> dict:
+        """Look up many values, returning a dictionary of value to record, or
+        None when there is no match
+
+        Parameters
+        ----------
+        resource: str, required
+            One of users, contacts or transactions
+        by: str, required
+            Filter to look the values up with, either emails or external_ids
+        values: iterable, required
+            Emails or external IDs
+        """
+        futures = {value: self.lookup(resource, by, value) for value in values}
+        return {value: future.result() for value, future in futures.items()}
+
+    def _start(self):
+        if self._thread is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+            self._thread = threading.Thread(
+                target=self._run, name="brokermint-lookup-coalescer", daemon=True
+            )
+            self._thread.start()
+
+    def _take_due(self, flush: bool):
+        """Remove and return batches that are full or whose window has ended"""
+        now = time.monotonic()
+        due, wait = [], None
+        for kind, pending in list(self._pending.items()):
+            if not pending:
+                continue
+            remaining = self._opened[kind] + self.window - now
+            if flush or remaining <= 0 or len(pending) >= self.max_batch:
+                values = list(pending)
+                while values:
+                    batch, values = values[: self.max_batch], values[self.max_batch:]
+                    due.append((kind, {v: pending.pop(v) for v in batch}))
+                self._opened[kind] = now
+            else:
+                wait = remaining if wait is None else min(wait, remaining)
+        return due, wait
+
+    def _run(self):
+        while True:
+            with self._cond:
+                due, wait = self._take_due(self._closed)
+                if not due:
+                    if self._closed:
+                        return
+                    self._cond.wait(wait)
+                    continue
+            for kind, batch in due:
+                self._executor.submit(self._send, kind, batch)
+
+    def _send(self, kind: tuple, batch: dict):
+        _, by = kind
+        method, field = LOOKUPS[kind]
+        found = {}
+        try:
+            with self._cond:
+                self.requests += 1
+            for page in self.client.paginate(method, **{by: ",".join(batch)}):
+                for record in page:
+                    value = record.get(field)
+                    if value is not None:
+                        found.setdefault(_normalize(by, value), record)
+        except BaseException as e:
+            for futures in batch.values():
+                for future in futures:
+                    future.set_exception(e)
+            return
+        for value, futures in batch.items():
+            for future in futures:
+                future.set_result(found.get(value))
+
+    def close(self):
+        """Send queued lookups and stop the background thread"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._executor.shutdown(wait=True)
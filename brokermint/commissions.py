@@ -0,0 +1,287 @@
+"""Commission analytics across many transactions"""
+
+from typing import Iterable
+
+from .deadline import resolve
+from .frames import flatten_record
+from .utils import concurrent_map, import_optional, missing_as
+
+
+# Integer representation of numpy's NaT (not a time)
+NAT = -(2 ** 63)
+
+PERIODS = {"day": "D", "week": "W", "month": "M", "quarter": "M", "year": "Y"}
+
+
+def fetch_commissions(
+    client,
+    transactions: Iterable = None,
+    *,
+    max_workers: int = 8,
+    deadline: float = None,
+    **kwargs,
+):
+    """Pull commission items for many transactions concurrently
+
+    Each commission item is flattened and tagged with the transaction_id and
+    closing_date of the transaction it belongs to.
+
+    Parameters
+    ----------
+    client: Client, required
+        Client used to make requests
+    transactions: iterable, optional
+        Transactions (dicts) or transaction IDs.  When omitted, transactions are
+        paginated from list_transactions using kwargs, e.g. statuses="closed"
+    max_workers: int, default 8, optional
+        Maximum number of concurrent requests
+    deadline: float, optional
+        Budget, in seconds, for all requests.  Commissions fetched before it
+        passes are still returned
+    **kwargs
+        Keyword arguments passed to list_transactions
+    """
+    deadline = resolve(deadline)
+    if transactions is None:
+        transactions = (
+            t
+            for page in client.paginate("list_transactions", deadline=deadline, **kwargs)
+            for t in page
+        )
+
+    list_commissions = missing_as(client.list_transaction_commissions)
+
+    def _fetch(transaction):
+        transaction_id = (
+            transaction["id"] if isinstance(transaction, dict) else transaction
+        )
+        return list_commissions(transaction_id)
+
+    for transaction, payload in concurrent_map(
+        _fetch, transactions, max_workers=max_workers, deadline=deadline
+    ):
+        if isinstance(transaction, dict):
+            transaction_id = transaction["id"]
+            closing_date = transaction.get("closing_date")
+        else:
+            transaction_id, closing_date = transaction, None
+        if not isinstance(payload, list):
+            continue
+        for item in payload:
+            row = flatten_record(item)
+            row["transaction_id"] = transaction_id
+            row.setdefault("closing_date", closing_date)
+            yield row
+
+
+class CommissionRollup:
+    """Columnar store of commission items with vectorized group-by aggregations
+
+    Parameters
+    ----------
+    records: iterable, required
+        Flattened commission items, i.e. the output of fetch_commissions
+    agent: str, default 'user_id', optional
+        Field identifying the agent a commission is paid to.  Nested fields are
+        referenced with dots, e.g. 'payee.id'
+    plan: str, default 'commission_plan_id', optional
+        Field identifying the commission plan
+    amount: str, default 'amount', optional
+        Field holding the commission amount
+    date: str, default 'closing_date', optional
+        Field holding the 13-digit unix timestamp used for periods
+    """
+
+    def __init__(
+        self,
+        records: Iterable[dict],
+        *,
+        agent: str = "user_id",
+        plan: str = "commission_plan_id",
+        amount: str = "amount",
+        date: str = "closing_date",
+    ):
+        np = import_optional("numpy", "analytics")
+        fields = {"agent": agent, "plan": plan, "amount": amount, "date": date}
+        raw = {k: [] for k in ("transaction_id", *fields)}
+        for record in records:
+            raw["transaction_id"].append(record.get("transaction_id"))
+            for k, field in fields.items():
+                raw[k].append(record.get(field))
+        self.columns = {
+            "transaction_id": np.array(raw["transaction_id"], dtype=object),
+            "agent": np.array(raw["agent"], dtype=object),
+            "plan": np.array(raw["plan"], dtype=object),
+            "amount": np.array(
+                [_to_float(v) for v in raw["amount"]], dtype=np.float64
+            ),
+            "date": np.array(
+                [v if isinstance(v, int) else NAT for v in raw["date"]],
+                dtype=np.int64,
+            ).view("datetime64[ms]"),
+        }
+
+    @classmethod
+    def from_client(
+        cls,
+        client,
+        transactions: Iterable = None,
+        *,
+        max_workers: int = 8,
+        agent: str = "user_id",
+        plan: str = "commission_plan_id",
+        amount: str = "amount",
+        date: str = "closing_date",
+        **kwargs,
+    ):
+        """Pull commissions concurrently and load them into a rollup
+
+        Parameters
+        ----------
+        client: Client, required
+            Client used to make requests
+        transactions: iterable, optional
+            Transactions (dicts) or transaction IDs.  When omitted, transactions
+            are paginated from list_transactions using kwargs
+        max_workers: int, default 8, optional
+            Maximum number of concurrent requests
+        **kwargs
+            Keyword arguments passed to list_transactions, e.g. statuses="closed"
+            and closed_since
+        """
+        records = fetch_commissions(
+            client, transactions, max_workers=max_workers, **kwargs
+        )
+        return cls(records, agent=agent, plan=plan, amount=amount, date=date)
+
+    def __len__(self):
+        return len(self.columns["amount"])
+
+    def _period(self, period: str):
+        np = import_optional("numpy", "analytics")
+        try:
+            unit = PERIODS[period]
+        except KeyError:
+            raise ValueError(
+                f"period must be one of:  {', '.join(PERIODS)}"
+            ) from None
+        if period == "week":
+
+            # numpy weeks start on Thursday, the weekday of 1970-01-01, so dates
+            # are shifted by three days for weeks to start on Monday
+            shift = np.timedelta64(3, "D")
+            days = self.columns["date"].astype("datetime64[D]") + shift
+            return days.astype("datetime64[W]").astype("datetime64[D]") - shift
+        dates = self.columns["date"].astype(f"datetime64[{unit}]")
+        if period == "quarter":
+            months = dates.astype(np.int64)
+            dates = (months - months % 3).astype("datetime64[M]")
+            dates[np.isnat(self.columns["date"])] = np.datetime64("NaT")
+        return dates
+
+    def group_by(self, *keys: str, period: str = "month"):
+        """Sum and count commission amounts grouped by one or more keys
+
+        Parameters
+        ----------
+        *keys: str, required
+            Any of agent, plan, transaction_id or period
+        period: str, default 'month', optional
+            Granularity used for the period key.  One of day, week, month,
+            quarter or year
+
+        Returns
+        -------
+        dict
+            One array per key holding the unique groups, plus amount (sum) and
+            count arrays aligned with them.  Keys with missing values, e.g.
+            commissions without an agent, are numpy masked arrays where the
+            group of missing values is masked
+        """
+        np = import_optional("numpy", "analytics")
+        if not keys:
+            raise ValueError("At least one key is required")
+        codes = []
+        uniques = []
+        for key in keys:
+            if key == "period":
+                values = self._period(period)
+            elif key in ("agent", "plan", "transaction_id"):
+                values = self.columns[key]
+            else:
+                raise ValueError(f"Unknown key:  {key}")
+            missing = None
+            if values.dtype == object:
+                missing = np.array([v is None for v in values], dtype=bool)
+                values = np.array(values[~missing].tolist())
+                if values.dtype == object:
+                    values = np.array([str(v) for v in values])
+            unique, inverse = np.unique(values, return_inverse=True)
+            inverse = inverse.reshape(-1)
+            if missing is not None and missing.any():
+
+                # Missing values get their own group, masked in the result
+                filled = np.full(len(missing), len(unique), dtype=np.int64)
+                filled[~missing] = inverse
+                inverse = filled
+                mask = np.zeros(len(unique) + 1, dtype=bool)
+                mask[-1] = True
+                unique = np.ma.masked_array(
+                    np.append(unique, np.zeros(1, dtype=unique.dtype)), mask=mask
+                )
+            uniques.append(unique)
+            codes.append(inverse)
+        if len(self) == 0:
+            result = {key: unique for key, unique in zip(keys, uniques)}
+            result.update(amount=np.zeros(0), count=np.zeros(0, dtype=np.int64))
+            return result
+        sizes = [len(u) for u in uniques]
+        flat = np.ravel_multi_index(codes, sizes)
+        groups, group_codes = np.unique(flat, return_inverse=True)
+        amounts = np.bincount(
+            group_codes, weights=np.nan_to_num(self.columns["amount"])
+        )
+        counts = np.bincount(group_codes)
+        result = {
+            key: unique[index]
+            for key, unique, index in zip(
+                keys, uniques, np.unravel_index(groups, sizes)
+            )
+        }
+        result["amount"] = amounts
+        result["count"] = counts
+        return result
+
+    def by_agent(self):
+        """Commission totals per agent"""
+        return self.group_by("agent")
+
+    def by_plan(self):
+        """Commission totals per commission plan"""
+        return self.group_by("plan")
+
+    def by_period(self, period: str = "month"):
+        """Commission totals per period
+
+        Parameters
+        ----------
+        period: str, default 'month', optional
+            One of day, week, month, quarter or year
+        """
+        return self.group_by("period", period=period)
+
+    def to_arrow(self):
+        """Return the underlying columns as a pyarrow Table"""
+        pa = import_optional("pyarrow", "frames")
+        columns = dict(self.columns)
+        columns["transaction_id"] = columns["transaction_id"].tolist()
+        columns["agent"] = [None if v is None else str(v) for v in columns["agent"]]
+        columns["plan"] = [None if v is None else str(v) for v in columns["plan"]]
+        return pa.table(columns)
+
+
+def _to_float(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float("nan")
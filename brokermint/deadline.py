@@ -0,0 +1,80 @@
+"""Time budgets shared by every request made within a scope"""
+
+from contextlib import contextmanager
+import threading
+import time
+
+from .exceptions import DeadlineExceeded
+
+
+_local = threading.local()
+
+
+class Deadline:
+    """A point in time after which no more requests should be made
+
+    Parameters
+    ----------
+    seconds: float, required
+        Budget, in seconds, starting now
+    """
+
+    def __init__(self, seconds: float):
+        self.expires = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        """Seconds left in the budget, never less than zero"""
+        return max(self.expires - time.monotonic(), 0.0)
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires
+
+    def check(self):
+        """Raise DeadlineExceeded if the budget is spent"""
+        if self.expired:
+            raise DeadlineExceeded()
+
+
+def current():
+    """Deadline in effect for the current thread, if any"""
+    return getattr(_local, "deadline", None)
+
+
+def resolve(deadline):
+    """Combine a deadline with the current one, keeping whichever expires first
+
+    Parameters
+    ----------
+    deadline: Deadline, float or None, required
+        Deadline, or budget in seconds.  None returns the current deadline
+    """
+    previous = current()
+    if deadline is None:
+        return previous
+    if not isinstance(deadline, Deadline):
+        deadline = Deadline(deadline)
+    if previous is not None and previous.expires < deadline.expires:
+        return previous
+    return deadline
+
+
+@contextmanager
+def scope(deadline):
+    """Make a deadline current for the calling thread
+
+    A nested deadline can only shorten, never extend, the enclosing one.
+
+    Parameters
+    ----------
+    deadline: Deadline, float or None, required
+        Deadline, or budget in seconds, to apply.  None leaves the current
+        deadline untouched
+    """
+    previous = current()
+    deadline = resolve(deadline)
+    _local.deadline = deadline
+    try:
+        yield deadline
+    finally:
+        _local.deadline = previous
@@ -0,0 +1,145 @@
+"""JSON backends used to decode responses"""
+
+import importlib.util
+import json
+
+
+BACKENDS = ("auto", "json", "orjson", "simdjson")
+
+
+def available(backend: str) -> bool:
+    """Whether a JSON backend is installed
+
+    Parameters
+    ----------
+    backend: str, required
+        One of json, orjson or simdjson
+    """
+    return backend == "json" or importlib.util.find_spec(backend) is not None
+
+
+def get_loads(backend: str = "auto"):
+    """Return a function decoding bytes or str into Python objects
+
+    Parameters
+    ----------
+    backend: str, default 'auto', optional
+        One of auto, json, orjson or simdjson.  auto picks orjson when installed
+        and falls back to the standard library
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"backend must be one of:  {', '.join(BACKENDS)}")
+    if backend == "auto":
+        backend = "orjson" if available("orjson") else "json"
+    if backend == "orjson":
+        import orjson
+
+        return orjson.loads
+    if backend == "simdjson":
+        import simdjson
+
+        return simdjson.loads
+    return json.loads
+
+
+def get_dumps(backend: str = "auto"):
+    """Return a function encoding Python objects into a compact JSON str
+
+    Parameters
+    ----------
+    backend: str, default 'auto', optional
+        One of auto, json, orjson or simdjson.  simdjson only decodes, so the
+        standard library is used for it
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"backend must be one of:  {', '.join(BACKENDS)}")
+    if backend == "orjson" or (backend == "auto" and available("orjson")):
+        import orjson
+
+        return lambda obj: orjson.dumps(obj).decode()
+    return lambda obj: json.dumps(obj, separators=(",", ":"))
+
+
+class StringPool:
+    """Share one str object between equal strings of decoded responses
+
+    JSON decoders create a new str for every occurrence of a value, so across
+    many pages each status, role, city or owner name is stored thousands of
+    times.  The pool replaces every short string (and every key) with the first
+    equal string it saw.  Once max_size distinct strings are pooled, new ones
+    are left as they are, so high-cardinality values cannot grow it unbounded.
+
+    Parameters
+    ----------
+    max_length: int, default 64, optional
+        Longest string pooled.  Longer values are rarely repeated
+    max_size: int, default 65536, optional
+        Maximum number of distinct strings pooled
+    fields: list, optional
+        Only pool the values of these keys, e.g. ['status', 'city', 'state'].
+        Defaults to every string value
+    """
+
+    def __init__(
+        self, *, max_length: int = 64, max_size: int = 65536, fields: list = None
+    ):
+        self.max_length = max_length
+        self.max_size = max_size
+        self.fields = frozenset(fields) if fields is not None else None
+        self._strings = {}
+
+    def __len__(self):
+        return len(self._strings)
+
+    def _get(self, value: str) -> str:
+        pooled = self._strings.get(value)
+        if pooled is not None:
+            return pooled
+        if len(value) <= self.max_length and len(self._strings) < self.max_size:
+            return self._strings.setdefault(value, value)
+        return value
+
+    def intern(self, payload):
+        """Return payload with its strings replaced by their pooled copies
+
+        Lists are updated in place; dictionaries are rebuilt with pooled keys.
+
+        Parameters
+        ----------
+        payload: required
+            Decoded JSON value
+        """
+        if type(payload) is str:
+            return self._get(payload) if self.fields is None else payload
+        return self._intern(payload, self.fields is None)
+
+    def _intern(self, payload, pool_values: bool):
+        get, fields = self._get, self.fields
+        if type(payload) is list:
+            for i, value in enumerate(payload):
+                kind = type(value)
+                if kind is dict or kind is list:
+                    payload[i] = self._intern(value, pool_values)
+                elif kind is str and pool_values:
+                    payload[i] = get(value)
+            return payload
+        if type(payload) is not dict:
+            return payload
+        interned = {}
+        for key, value in payload.items():
+            kind = type(value)
+            if kind is str:
+                if pool_values or key in fields:
+                    value = get(value)
+            elif kind is dict or kind is list:
+                value = self._intern(value, pool_values or (fields is not None and key in fields))
+            interned[get(key)] = value
+        return interned
+
+
+def accept_encoding() -> str:
+    """Value of the Accept-Encoding header for the installed decompressors"""
+    encodings = ["gzip", "deflate"]
+    if available("brotli") or available("brotlicffi"):
+        encodings.append("br")
+    return ", ".join(encodings)
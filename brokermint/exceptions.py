@@ -0,0 +1,162 @@
+class BrokermintError(Exception):
+    """Base class for errors raised by brokermint"""
+
+
+class CircuitOpenError(BrokermintError):
+    """Raised without making a request while an endpoint group's circuit is open
+
+    Parameters
+    ----------
+    group: str, required
+        Endpoint group, i.e. a key in Client.ENDPOINTS
+    retry_after: float, optional
+        Seconds until the circuit allows a probe request
+    """
+
+    def __init__(self, group: str, retry_after: float = None):
+        self.group = group
+        self.retry_after = retry_after
+        message = f"Circuit for {group} is open"
+        if retry_after is not None:
+            message += f", retry in {retry_after:.1f}s"
+        super().__init__(message)
+
+
+class LoadShedError(BrokermintError):
+    """Raised without making a request when an endpoint group has too many
+    requests in flight
+
+    Parameters
+    ----------
+    group: str, required
+        Endpoint group, i.e. a key in Client.ENDPOINTS
+    """
+
+    def __init__(self, group: str):
+        self.group = group
+        super().__init__(f"Too many requests in flight for {group}")
+
+
+class DeadlineExceeded(BrokermintError):
+    """Raised when a request would start, or is still running, after the current
+    deadline has passed"""
+
+    def __init__(self, message: str = "Deadline exceeded"):
+        super().__init__(message)
+
+
+class APIError(BrokermintError):
+    """Raised when the API responds with an error status
+
+    Parameters
+    ----------
+    status: int, required
+        HTTP status code
+    message: str, required
+        Error message returned by the API, or the response text
+    headers: dict, optional
+        Response headers
+    body: str, optional
+        Raw response text
+    retry_after: float, optional
+        Seconds the API asked to wait before retrying
+    """
+
+    retryable = False
+
+    def __init__(
+        self,
+        status: int,
+        message: str,
+        *,
+        headers: dict = None,
+        body: str = None,
+        retry_after: float = None,
+    ):
+        self.status = status
+        self.message = message
+        self.headers = headers or {}
+        self.body = body
+        self.retry_after = retry_after
+        super().__init__(f"{status}: {message}")
+
+
+class ValidationError(APIError):
+    """The request was rejected as invalid (400, 422)"""
+
+
+class NotFound(APIError):
+    """The requested resource does not exist (404)"""
+
+
+class RateLimited(APIError):
+    """Too many requests were made (429); wait retry_after seconds"""
+
+    retryable = True
+
+
+class ServerError(APIError):
+    """The API failed to handle the request (5xx)"""
+
+    retryable = True
+
+
+ERRORS = {400: ValidationError, 404: NotFound, 422: ValidationError, 429: RateLimited}
+
+
+def parse_retry_after(value: str):
+    """Seconds to wait from a Retry-After header, given as seconds or a date
+
+    Parameters
+    ----------
+    value: str, required
+        Value of the Retry-After header
+    """
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    from email.utils import parsedate_to_datetime
+    import time
+
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def error_for_response(response, loads=None) -> APIError:
+    """Build the exception matching an error response
+
+    Parameters
+    ----------
+    response: Response, required
+        Response returned by the transport with a status of 400 or above
+    loads: callable, optional
+        Function used to decode a JSON error body
+    """
+    status = response.status_code
+    text = response.text
+    message = text
+    if loads is not None:
+        try:
+            payload = loads(response.content)
+        except ValueError:
+            payload = None
+        if isinstance(payload, dict):
+            message = payload.get("error") or payload.get("message") or text
+            if isinstance(message, (dict, list)):
+                message = str(message)
+    headers = dict(response.headers or {})
+    cls = ERRORS.get(status) or (ServerError if status >= 500 else APIError)
+    return cls(
+        status,
+        message or f"HTTP {status}",
+        headers=headers,
+        body=text,
+        retry_after=parse_retry_after(
+            headers.get("Retry-After") or headers.get("retry-after")
+        ),
+    )
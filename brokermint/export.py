@@ -0,0 +1,248 @@
+"""Parallel full-account exports"""
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import List
+import json
+import os
+import time
+
+from .decoding import get_dumps
+from .utils import as_records, concurrent_map, import_optional, missing_as
+
+
+FORMATS = ("ndjson", "parquet")
+
+RESOURCES = (
+    "transactions",
+    "participants",
+    "checklists",
+    "tasks",
+    "commissions",
+)
+
+
+def _fetch_children(client, transaction: dict) -> dict:
+    transaction_id = transaction["id"]
+    children = {
+        "participants": as_records(
+            missing_as(client.list_transaction_participants)(transaction_id)
+        ),
+        "checklists": as_records(
+            missing_as(client.list_transaction_checklists)(transaction_id)
+        ),
+        "commissions": as_records(
+            missing_as(client.list_transaction_commissions)(transaction_id)
+        ),
+        "tasks": [],
+    }
+    for checklist in children["checklists"]:
+        for task in as_records(
+            missing_as(client.list_transaction_tasks)(transaction_id, checklist["id"])
+        ):
+            task["checklist_id"] = checklist["id"]
+            children["tasks"].append(task)
+    for resource in ("participants", "checklists", "commissions", "tasks"):
+        for record in children[resource]:
+            record["transaction_id"] = transaction_id
+    return children
+
+
+class _ShardWriter:
+    def __init__(self, out_dir: str, shard: int, fmt: str):
+        self.fmt = fmt
+        self.paths = {
+            resource: os.path.join(out_dir, f"{resource}-{shard:05d}.{fmt}")
+            for resource in RESOURCES
+        }
+        self.counts = dict.fromkeys(RESOURCES, 0)
+        if fmt == "ndjson":
+            self.dumps = get_dumps()
+            self.files = {r: open(p, "w") for r, p in self.paths.items()}
+        else:
+            from .frames import ColumnBuilder
+
+            self.builders = {r: ColumnBuilder() for r in RESOURCES}
+
+    def write(self, resource: str, records: List[dict]):
+        self.counts[resource] += len(records)
+        if self.fmt == "ndjson":
+            f = self.files[resource]
+            for record in records:
+                f.write(self.dumps(record))
+                f.write("\n")
+        else:
+            self.builders[resource].add_batch(records)
+
+    def close(self) -> dict:
+        if self.fmt == "ndjson":
+            for f in self.files.values():
+                f.close()
+        else:
+            pq = import_optional("pyarrow.parquet", "frames")
+            for resource, builder in self.builders.items():
+                pq.write_table(builder.to_arrow(), self.paths[resource])
+        return {
+            resource: {
+                "path": os.path.basename(self.paths[resource]),
+                "records": self.counts[resource],
+            }
+            for resource in RESOURCES
+        }
+
+
+def _unified_type(pa, types: set):
+    types = {t for t in types if not pa.types.is_null(t)}
+    if not types:
+        return pa.null()
+    if len(types) == 1:
+        return types.pop()
+    if all(pa.types.is_integer(t) or pa.types.is_floating(t) for t in types):
+        return pa.float64()
+    return pa.string()
+
+
+def _as_strings(pa, column):
+    if pa.types.is_string(column.type):
+        return column
+    return pa.array(
+        [
+            v if v is None or isinstance(v, str) else json.dumps(v, default=str)
+            for v in column.to_pylist()
+        ],
+        type=pa.string(),
+    )
+
+
+def _unify_schemas(out_dir: str, shards: List[dict]):
+    """Rewrite parquet shards so every shard of a resource has the same schema"""
+    pa = import_optional("pyarrow", "frames")
+    pq = import_optional("pyarrow.parquet", "frames")
+    for resource in RESOURCES:
+        paths = [
+            os.path.join(out_dir, shard["files"][resource]["path"]) for shard in shards
+        ]
+        schemas = [pq.read_schema(path) for path in paths]
+        types = {}
+        for schema in schemas:
+            for field in schema:
+                types.setdefault(field.name, set()).add(field.type)
+        unified = pa.schema(
+            [(name, _unified_type(pa, types[name])) for name in types]
+        )
+        for path, schema in zip(paths, schemas):
+            if schema.equals(unified):
+                continue
+            table = pq.read_table(path)
+            columns = []
+            for field in unified:
+                if field.name not in table.column_names:
+                    columns.append(pa.nulls(table.num_rows, type=field.type))
+                    continue
+                column = table.column(field.name).combine_chunks()
+                if pa.types.is_string(field.type):
+                    columns.append(_as_strings(pa, column))
+                else:
+                    columns.append(column.cast(field.type))
+            pq.write_table(pa.Table.from_arrays(columns, schema=unified), path)
+
+
+def _dump_shard(args) -> dict:
+    from .base import Client
+
+    api_key, client_options, out_dir, shard, transactions, fmt, threads = args
+    client = Client(api_key, **client_options)
+    writer = _ShardWriter(out_dir, shard, fmt)
+    try:
+        writer.write("transactions", transactions)
+        for _, children in concurrent_map(
+            lambda t: _fetch_children(client, t), transactions, max_workers=threads
+        ):
+            for resource, records in children.items():
+                writer.write(resource, records)
+    finally:
+        files = writer.close()
+    return {"shard": shard, "files": files}
+
+
+def dump_account(
+    out_dir: str,
+    *,
+    api_key: str = None,
+    client_options: dict = None,
+    workers: int = None,
+    threads: int = 4,
+    format: str = "ndjson",
+    **kwargs,
+) -> dict:
+    """Export transactions and their participants, checklists, tasks and commissions
+
+    Transaction IDs are partitioned across a process pool.  Each worker process
+    uses its own Client (and connection pool) with a few threads for network
+    concurrency, and writes one file per resource per shard.  A manifest.json
+    describing every shard is written once all workers finish.  Parquet shards
+    of a resource are then rewritten where needed to share one schema, so they
+    read as a single dataset:  a column whose type differs between shards is
+    widened to float for mixed integers and floats, or stored as strings.
+
+    Parameters
+    ----------
+    out_dir: str, required
+        Directory the export is written to.  Created if it does not exist.
+    api_key: str, optional
+        API key used by every worker.  Defaults to the BM_API_KEY environment
+        variable
+    client_options: dict, optional
+        Picklable keyword arguments for the Client of every worker, e.g.
+        timeout and circuit_breaker
+    workers: int, optional
+        Number of worker processes.  Defaults to the number of CPUs
+    threads: int, default 4, optional
+        Number of concurrent requests within each worker
+    format: str, default 'ndjson', optional
+        Either ndjson or parquet (requires pyarrow)
+    **kwargs
+        Keyword arguments passed to list_transactions, e.g. statuses="closed"
+
+    Returns
+    -------
+    dict
+        The manifest
+    """
+    from .base import Client
+
+    if format not in FORMATS:
+        raise ValueError(f"format must be one of:  {', '.join(FORMATS)}")
+    api_key = api_key or os.getenv("BM_API_KEY")
+    client_options = client_options or {}
+    workers = workers or os.cpu_count() or 1
+    os.makedirs(out_dir, exist_ok=True)
+    started = time.time()
+    client = Client(api_key, **client_options)
+    transactions = [
+        t for page in client.paginate("list_transactions", **kwargs) for t in page
+    ]
+    partitions = [transactions[i::workers] for i in range(workers)]
+    jobs = [
+        (api_key, client_options, out_dir, shard, partition, format, threads)
+        for shard, partition in enumerate(partitions)
+        if partition
+    ]
+    with ProcessPoolExecutor(max_workers=max(len(jobs), 1)) as executor:
+        shards = sorted(executor.map(_dump_shard, jobs), key=lambda s: s["shard"])
+    if format == "parquet":
+        _unify_schemas(out_dir, shards)
+    totals = dict.fromkeys(RESOURCES, 0)
+    for shard in shards:
+        for resource, info in shard["files"].items():
+            totals[resource] += info["records"]
+    manifest = {
+        "format": format,
+        "started_at": int(started * 1000),
+        "finished_at": int(time.time() * 1000),
+        "filters": kwargs,
+        "totals": totals,
+        "shards": shards,
+    }
+    with open(os.path.join(out_dir, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
@@ -0,0 +1,274 @@
+"""In-process change feed that polls each resource once for many subscribers"""
+
+from typing import Union
+import asyncio
+import logging
+import threading
+import time
+
+from .changes import ChangeDetector
+
+
+logger = logging.getLogger(__name__)
+
+RESOURCES = {
+    "transactions": "list_transactions",
+    "contacts": "list_contacts",
+    "users": "list_users",
+}
+
+
+def _now() -> int:
+    """Current time as a 13-digit unix timestamp"""
+    return int(time.time() * 1000)
+
+
+class _Subscription:
+    def __init__(self, resource: str, since: int, interval: float):
+        self.resource = resource
+        self.since = since
+        self.interval = interval
+        self.due = time.monotonic()
+        self.subscribers = []
+        self.detector = ChangeDetector(track_fields=False)
+        self.seen = {}
+
+    def remember(self, changes, started: int):
+        """Record when the changed records were seen, then forget records seen
+        before the overlap window:  updated_since can no longer return them"""
+        key = self.detector.key
+        for record in changes.inserts:
+            self.seen[record[key]] = started
+        for update in changes.updates:
+            self.seen[update.record[key]] = started
+        expired = [k for k, seen in self.seen.items() if seen < self.since]
+        for k in expired:
+            del self.seen[k]
+            self.detector.state.pop(k, None)
+
+
+class ChangeFeed:
+    """Poll list endpoints with updated_since and fan changes out to subscribers
+
+    Each resource is polled once per cycle no matter how many subscribers it has.
+    The polling interval adapts to activity:  it resets to min_interval whenever
+    changes are found and grows by backoff (up to max_interval) while idle.
+
+    Subscribers receive a ChangeSet (see brokermint.changes) holding the inserted
+    and updated records.  A subscriber is either a callable or an asyncio.Queue;
+    queues are filled from the polling thread on the loop they were registered
+    with.  A subscriber raising an exception is logged and does not keep the
+    others from being notified.
+
+    Only records seen within the overlap window are remembered, to drop the
+    duplicates it causes, so a record is reported as an insert the first time
+    it changes after that window, and updates don't list changed fields.
+
+    Parameters
+    ----------
+    client: Client, required
+        Client used to make requests
+    min_interval: float, default 5, optional
+        Shortest time, in seconds, between two polls of a resource
+    max_interval: float, default 300, optional
+        Longest time, in seconds, between two polls of a resource
+    backoff: float, default 2, optional
+        Factor the interval grows by after a poll without changes
+    overlap: int, default 1000, optional
+        Milliseconds subtracted from the updated_since cursor to tolerate clock
+        skew.  Records seen twice because of the overlap are deduplicated.
+    """
+
+    def __init__(
+        self,
+        client,
+        *,
+        min_interval: float = 5,
+        max_interval: float = 300,
+        backoff: float = 2,
+        overlap: int = 1000,
+    ):
+        self.client = client
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.overlap = overlap
+        self._subscriptions = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def subscribe(
+        self,
+        resource: str,
+        subscriber,
+        *,
+        since: Union[str, int] = None,
+        loop: asyncio.AbstractEventLoop = None,
+    ):
+        """Register a subscriber for changes to a resource
+
+        Parameters
+        ----------
+        resource: str, required
+            One of transactions, contacts or users
+        subscriber: callable or asyncio.Queue, required
+            Receives a ChangeSet for every poll that found changes
+        since: str or int, optional
+            Starting point for the first poll of the resource, YYYY-MM-DD or
+            13-digit unix timestamp.  Defaults to now.  Ignored when the
+            resource is already being polled.
+        loop: asyncio.AbstractEventLoop, optional
+            Event loop the queue belongs to.  Defaults to the running loop and
+            is required when subscribing a queue from outside of it.
+        """
+        if resource not in RESOURCES:
+            raise ValueError(
+                f"resource must be one of:  {', '.join(RESOURCES)}"
+            )
+        if isinstance(subscriber, asyncio.Queue):
+            loop = loop or _running_loop()
+            queue = subscriber
+
+            def deliver(changes):
+                loop.call_soon_threadsafe(queue.put_nowait, changes)
+
+            deliver.subscriber = queue
+            target = deliver
+        elif callable(subscriber):
+            target = subscriber
+        else:
+            raise TypeError("subscriber must be callable or an asyncio.Queue")
+        with self._lock:
+            subscription = self._subscriptions.get(resource)
+            if subscription is None:
+                subscription = self._subscriptions[resource] = _Subscription(
+                    resource, since or _now(), self.min_interval
+                )
+            subscription.subscribers.append(target)
+        self._wake.set()
+        return subscriber
+
+    def unsubscribe(self, resource: str, subscriber):
+        """Remove a subscriber; the resource stops being polled with none left
+
+        Parameters
+        ----------
+        resource: str, required
+            One of transactions, contacts or users
+        subscriber: callable or asyncio.Queue, required
+            Subscriber previously passed to subscribe
+        """
+        with self._lock:
+            subscription = self._subscriptions.get(resource)
+            if subscription is None:
+                return
+            subscription.subscribers = [
+                s
+                for s in subscription.subscribers
+                if s is not subscriber and getattr(s, "subscriber", None) is not subscriber
+            ]
+            if not subscription.subscribers:
+                del self._subscriptions[resource]
+
+    def poll(self, resource: str):
+        """Poll a resource once and notify its subscribers
+
+        Parameters
+        ----------
+        resource: str, required
+            One of transactions, contacts or users
+        """
+        with self._lock:
+            subscription = self._subscriptions.get(resource)
+        if subscription is None:
+            return None
+        started = _now()
+        changes = subscription.detector.pull(
+            self.client,
+            RESOURCES[resource],
+            updated_since=subscription.since,
+            complete=False,
+        )
+        subscription.since = started - self.overlap
+        subscription.remember(changes, started)
+        if changes:
+            subscription.interval = self.min_interval
+            for subscriber in list(subscription.subscribers):
+                try:
+                    subscriber(changes)
+                except Exception:
+                    logger.exception(
+                        "Subscriber %r to %s failed", subscriber, resource
+                    )
+        else:
+            subscription.interval = min(
+                subscription.interval * self.backoff, self.max_interval
+            )
+        subscription.due = time.monotonic() + subscription.interval
+        return changes
+
+    def run(self):
+        """Poll resources as they come due until stop is called"""
+        while not self._stop.is_set():
+            with self._lock:
+                subscriptions = list(self._subscriptions.values())
+            now = time.monotonic()
+            for subscription in subscriptions:
+                if subscription.due <= now:
+                    try:
+                        self.poll(subscription.resource)
+                    except Exception:
+                        logger.exception(
+                            "Polling %s failed", subscription.resource
+                        )
+                        # A failed poll backs off like an idle one and is retried
+                        subscription.interval = min(
+                            subscription.interval * self.backoff, self.max_interval
+                        )
+                        subscription.due = time.monotonic() + subscription.interval
+            with self._lock:
+                dues = [s.due for s in self._subscriptions.values()]
+            timeout = max(min(dues) - time.monotonic(), 0) if dues else None
+            self._wake.wait(timeout)
+            self._wake.clear()
+
+    def start(self):
+        """Start polling in a background thread"""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self.run, name="brokermint-change-feed", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: float = None):
+        """Stop the background thread
+
+        Parameters
+        ----------
+        timeout: float, optional
+            Seconds to wait for the thread to finish
+        """
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def _running_loop():
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        raise ValueError(
+            "No event loop is running, pass the loop the queue belongs to as loop="
+        ) from None
@@ -0,0 +1,167 @@
+"""Columnar output (pandas / Arrow) for list and report endpoints"""
+
+import json
+from typing import Iterable, List
+
+from .utils import import_optional
+
+
+# 13-digit unix timestamps (milliseconds) fall within this range
+TIMESTAMP_MIN = 10 ** 12
+TIMESTAMP_MAX = 10 ** 13
+
+TIMESTAMP_HINTS = ("date", "_at", "_since", "birthday", "deadline")
+
+
+def flatten_record(record: dict, *, sep: str = ".", prefix: str = "") -> dict:
+    """Flatten nested objects into a single level dictionary, leaving out empty
+    objects
+
+    Parameters
+    ----------
+    record: dict, required
+        Record returned from the API
+    sep: str, default '.', optional
+        Separator used to join nested keys
+    prefix: str, optional
+        Prefix prepended to every key
+    """
+    flat = {}
+    for k, v in record.items():
+        key = f"{prefix}{k}"
+        if isinstance(v, dict):
+
+            # Empty objects are treated as missing rather than given a column
+            flat.update(flatten_record(v, sep=sep, prefix=f"{key}{sep}"))
+        else:
+            flat[key] = v
+    return flat
+
+
+def _is_timestamp(value) -> bool:
+    return (
+        type(value) is int and TIMESTAMP_MIN <= value < TIMESTAMP_MAX
+    ) or value is None
+
+
+class ColumnBuilder:
+    """Accumulate batches of records directly into columns
+
+    Columns are kept in the order they are first seen.  Records missing a column
+    are padded with None so that every column has the same length, giving a stable
+    schema regardless of which batch a field first appears in.
+
+    Parameters
+    ----------
+    sep: str, default '.', optional
+        Separator used to join nested keys
+    """
+
+    def __init__(self, *, sep: str = "."):
+        self.sep = sep
+        self.columns = {}
+        self.num_rows = 0
+        self._timestamps = {}
+
+    def add_batch(self, records: Iterable[dict]):
+        """Append a batch of records
+
+        Parameters
+        ----------
+        records: list, required
+            Records returned from the API
+        """
+        columns = self.columns
+        timestamps = self._timestamps
+        for record in records:
+            flat = flatten_record(record, sep=self.sep)
+            for key, value in flat.items():
+                column = columns.get(key)
+                if column is None:
+                    column = columns[key] = [None] * self.num_rows
+                    timestamps[key] = True
+                column.append(value)
+                if timestamps[key] and not _is_timestamp(value):
+                    timestamps[key] = False
+            self.num_rows += 1
+            if len(flat) < len(columns):
+                for column in columns.values():
+                    if len(column) < self.num_rows:
+                        column.append(None)
+        return self
+
+    def timestamp_columns(self) -> List[str]:
+        """Columns holding 13-digit unix timestamps"""
+        return [
+            k
+            for k, is_ts in self._timestamps.items()
+            if is_ts
+            and any(h in k.rsplit(self.sep, 1)[-1] for h in TIMESTAMP_HINTS)
+            and any(v is not None for v in self.columns[k])
+        ]
+
+    def to_pandas(self):
+        """Build a pandas DataFrame from the accumulated columns"""
+        pd = import_optional("pandas", "frames")
+        df = pd.DataFrame(self.columns, columns=list(self.columns))
+        for k in self.timestamp_columns():
+            df[k] = pd.to_datetime(df[k], unit="ms", utc=True)
+        return df
+
+    def to_arrow(self):
+        """Build a pyarrow Table from the accumulated columns"""
+        pa = import_optional("pyarrow", "frames")
+        timestamps = set(self.timestamp_columns())
+        arrays = []
+        for k, values in self.columns.items():
+            if k in timestamps:
+                arrays.append(pa.array(values, type=pa.timestamp("ms", tz="UTC")))
+                continue
+            try:
+                arrays.append(pa.array(values))
+            except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError):
+
+                # Heterogeneous values (mixed types, lists of objects) are stored
+                # as strings to keep the schema stable, JSON encoding non-strings
+                arrays.append(
+                    pa.array(
+                        [
+                            v if v is None or isinstance(v, str) else json.dumps(v)
+                            for v in values
+                        ],
+                        type=pa.string(),
+                    )
+                )
+        return pa.Table.from_arrays(arrays, names=list(self.columns))
+
+
+def to_frame(batches: Iterable[List[dict]], *, sep: str = "."):
+    """Build a pandas DataFrame from batches of records
+
+    Parameters
+    ----------
+    batches: iterable, required
+        Iterable of lists of records, e.g. pages from Client.paginate
+    sep: str, default '.', optional
+        Separator used to join nested keys
+    """
+    builder = ColumnBuilder(sep=sep)
+    for batch in batches:
+        builder.add_batch(batch)
+    return builder.to_pandas()
+
+
+def to_arrow(batches: Iterable[List[dict]], *, sep: str = "."):
+    """Build a pyarrow Table from batches of records
+
+    Parameters
+    ----------
+    batches: iterable, required
+        Iterable of lists of records, e.g. pages from Client.paginate
+    sep: str, default '.', optional
+        Separator used to join nested keys
+    """
+    builder = ColumnBuilder(sep=sep)
+    for batch in batches:
+        builder.add_batch(batch)
+    return builder.to_arrow()
@@ -0,0 +1,249 @@
+"""Hedged requests for idempotent GETs"""
+
+from collections import deque
+import threading
+import time
+
+from .utils import StripedLock
+
+
+class _GroupState:
+    def __init__(self, window: int):
+        self.latencies = deque(maxlen=window)
+        self.tokens = 0.0
+        self.sent = 0
+        self.hedged = 0
+        self.hedges_won = 0
+
+
+class HedgePolicy:
+    """Send a duplicate GET when the first is slower than usual
+
+    The policy keeps the latency of the last window requests of each endpoint
+    group.  When a request has not completed after the percentile latency of its
+    group, an identical request is sent and whichever response arrives first is
+    returned.  The slower request is cancelled if it has not started yet and
+    otherwise discarded when it completes.
+
+    Requests that can be hedged, i.e. of a group with enough latencies and an
+    unspent hedge token, are sent from a thread of their own so the caller can
+    return the first response; other requests are sent from the calling thread.
+    Only hedges run on the pool of max_workers threads.
+
+    Hedges are paid for from a budget:  every request to a group earns budget
+    tokens and every hedge of that group spends one, so hedges add at most
+    budget (5% by default) to the request rate and stay within the API's rate
+    limit.  No request is hedged until a group has min_samples latencies.  State
+    is kept per group behind striped locks, so threads requesting different
+    groups do not contend.
+
+    Parameters
+    ----------
+    percentile: float, default 95, optional
+        Latency percentile (0 - 100) after which a hedge is sent
+    budget: float, default 0.05, optional
+        Hedges allowed per request sent
+    burst: float, default 10, optional
+        Maximum number of unspent hedge tokens
+    min_delay: float, default 0.005, optional
+        Minimum seconds to wait before hedging
+    window: int, default 100, optional
+        Number of recent latencies the percentile is computed over
+    min_samples: int, default 20, optional
+        Number of latencies required before requests are hedged
+    groups: list, optional
+        Endpoint groups (keys in Client.ENDPOINTS) to hedge.  Defaults to all
+    max_workers: int, default 32, optional
+        Maximum number of hedges in flight
+    """
+
+    def __init__(
+        self,
+        *,
+        percentile: float = 95,
+        budget: float = 0.05,
+        burst: float = 10,
+        min_delay: float = 0.005,
+        window: int = 100,
+        min_samples: int = 20,
+        groups: list = None,
+        max_workers: int = 32,
+    ):
+        if not 0 < percentile < 100:
+            raise ValueError("percentile must be between 0 and 100")
+        self.percentile = percentile
+        self.budget = budget
+        self.burst = burst
+        self.min_delay = min_delay
+        self.window = window
+        self.min_samples = min_samples
+        self.groups = set(groups) if groups is not None else None
+        self.max_workers = max_workers
+        self._groups = {}
+        self._locks = StripedLock()
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _state(self, group: str) -> _GroupState:
+        state = self._groups.get(group)
+        if state is None:
+            state = self._groups.setdefault(group, _GroupState(self.window))
+        return state
+
+    @property
+    def sent(self) -> int:
+        """Number of requests sent through the policy"""
+        return sum(state.sent for state in list(self._groups.values()))
+
+    @property
+    def hedged(self) -> int:
+        """Number of hedges sent"""
+        return sum(state.hedged for state in list(self._groups.values()))
+
+    @property
+    def hedges_won(self) -> int:
+        """Number of hedges that answered before the request they duplicated"""
+        return sum(state.hedges_won for state in list(self._groups.values()))
+
+    def applies_to(self, group: str) -> bool:
+        """Whether requests to an endpoint group are hedged
+
+        Parameters
+        ----------
+        group: str, required
+            Endpoint group
+        """
+        return self.groups is None or group in self.groups
+
+    def record(self, group: str, seconds: float):
+        """Record the latency of a request
+
+        Parameters
+        ----------
+        group: str, required
+            Endpoint group
+        seconds: float, required
+            Latency of the request
+        """
+        state = self._state(group)
+        with self._locks(group):
+            state.latencies.append(seconds)
+
+    def delay(self, group: str):
+        """Seconds to wait before hedging a request, or None when there are too
+        few latencies recorded for the group
+
+        Parameters
+        ----------
+        group: str, required
+            Endpoint group
+        """
+        state = self._state(group)
+        with self._locks(group):
+            latencies = sorted(state.latencies)
+        if len(latencies) < self.min_samples:
+            return None
+        index = min(int(len(latencies) * self.percentile / 100), len(latencies) - 1)
+        return max(latencies[index], self.min_delay)
+
+    def _earn(self, group: str):
+        state = self._state(group)
+        with self._locks(group):
+            state.sent += 1
+            state.tokens = min(state.tokens + self.budget, self.burst)
+
+    def _armed(self, group: str) -> bool:
+        state = self._state(group)
+        with self._locks(group):
+            return state.tokens >= 1
+
+    def _spend(self, group: str) -> bool:
+        state = self._state(group)
+        with self._locks(group):
+            if state.tokens < 1:
+                return False
+            state.tokens -= 1
+            state.hedged += 1
+            return True
+
+    def _pool(self):
+        if self._executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix="brokermint-hedge",
+                    )
+        return self._executor
+
+    def _timed(self, group: str, send):
+        started = time.monotonic()
+        response = send()
+        self.record(group, time.monotonic() - started)
+        return response
+
+    def _start(self, group: str, send):
+        """Call send from a new thread, returning a future of its response"""
+        from concurrent.futures import Future
+
+        future = Future()
+        future.set_running_or_notify_cancel()
+
+        def run():
+            try:
+                future.set_result(self._timed(group, send))
+            except BaseException as e:
+                future.set_exception(e)
+
+        threading.Thread(
+            target=run, name="brokermint-hedge-primary", daemon=True
+        ).start()
+        return future
+
+    def send(self, group: str, send):
+        """Call send, calling it a second time if the first call is slow
+
+        Parameters
+        ----------
+        group: str, required
+            Endpoint group
+        send: callable, required
+            Function without arguments sending the request and returning the
+            response.  It must be safe to call from several threads at once
+        """
+        delay = self.delay(group)
+        self._earn(group)
+        if delay is None or not self._armed(group):
+            return self._timed(group, send)
+
+        from concurrent.futures import FIRST_COMPLETED, TimeoutError, wait
+
+        primary = self._start(group, send)
+        try:
+            return primary.result(timeout=delay)
+        except TimeoutError:
+            if not self._spend(group):
+                return primary.result()
+        hedge = self._pool().submit(send)
+        pending, error = {primary, hedge}, None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    error = error or future.exception()
+                    continue
+                for loser in pending:
+                    loser.cancel()
+                if future is hedge:
+                    with self._locks(group):
+                        self._state(group).hedges_won += 1
+                return future.result()
+        raise error
+
+    def close(self):
+        """Stop the worker threads"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
@@ -0,0 +1,297 @@
+"""Append-only journal of mutations for resumable bulk jobs"""
+
+from contextlib import contextmanager
+from hashlib import blake2b
+from typing import Iterable, Tuple
+import json
+import os
+import threading
+import time
+
+from .exceptions import BrokermintError
+
+
+START = "start"
+DONE = "done"
+ERROR = "error"
+
+_local = threading.local()
+
+
+def operation_key(*parts) -> str:
+    """Stable key identifying an operation across runs
+
+    Parameters
+    ----------
+    *parts
+        JSON serializable values describing the operation
+    """
+    encoded = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return blake2b(encoded.encode(), digest_size=16).hexdigest()
+
+
+@contextmanager
+def operation(key: str):
+    """Record mutations made within the block under an explicit key
+
+    Parameters
+    ----------
+    key: str, required
+        Key identifying the operation
+    """
+    previous = getattr(_local, "key", None)
+    _local.key = key
+    try:
+        yield key
+    finally:
+        _local.key = previous
+
+
+def current_key():
+    """Key of the operation running in the current thread, if any"""
+    return getattr(_local, "key", None)
+
+
+class Journal:
+    """Append-only, fsync-batched log of create / update / delete requests
+
+    Every mutation sent by a Client with a journal is recorded before it is
+    sent (start) and again with its outcome (done or error).  After a crash,
+    resume skips operations that already completed and replay re-sends the
+    ones that were started but never finished.  Entries are flushed on every
+    write and fsynced every fsync_every entries or fsync_interval seconds, so a
+    crash can at worst lose the last batch of outcomes; those operations are
+    then redone (at-least-once).
+
+    Parameters
+    ----------
+    path: str, required
+        Location of the journal file.  Created if it does not exist
+    fsync_every: int, default 64, optional
+        Number of entries written between two fsyncs
+    fsync_interval: float, default 1, optional
+        Maximum number of seconds between two fsyncs
+    """
+
+    def __init__(self, path: str, *, fsync_every: int = 64, fsync_interval: float = 1):
+        self.path = path
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self._lock = threading.Lock()
+        self._unsynced = 0
+        self._synced_at = time.monotonic()
+        self._state = {}
+        if os.path.exists(path):
+            for entry in self.entries():
+                self._apply(entry)
+        self._file = open(path, "a")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def entries(self):
+        """Iterate through the entries written to the journal"""
+        with open(self.path) as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+
+                    # Partially written last line after a crash
+                    continue
+
+    def _apply(self, entry: dict):
+        key = entry["k"]
+        if entry["e"] == START:
+            self._state[key] = entry
+        else:
+            started = self._state.get(key, {})
+            self._state[key] = {**started, **entry}
+
+    def _write(self, entry: dict):
+        line = json.dumps(entry, separators=(",", ":"), default=str)
+        with self._lock:
+            self._apply(entry)
+            self._file.write(line + "\n")
+            self._file.flush()
+            self._unsynced += 1
+            if (
+                self._unsynced >= self.fsync_every
+                or time.monotonic() - self._synced_at >= self.fsync_interval
+            ):
+                self._sync()
+
+    def _sync(self):
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._synced_at = time.monotonic()
+
+    def sync(self):
+        """Force written entries to disk"""
+        with self._lock:
+            if self._unsynced:
+                self._sync()
+
+    def close(self):
+        """Sync and close the journal"""
+        if not self._file.closed:
+            self.sync()
+            self._file.close()
+
+    def start(self, key: str, method: str, url: str, data: dict = None):
+        """Record that a mutation is about to be sent
+
+        Parameters
+        ----------
+        key: str, required
+            Key identifying the operation
+        method: str, required
+            HTTP method
+        url: str, required
+            URL without query parameters
+        data: dict, optional
+            Body of the request
+        """
+        self._write(
+            {"k": key, "e": START, "m": method, "u": url, "d": data, "t": time.time()}
+        )
+
+    def finish(self, key: str, status: int = None, error: str = None):
+        """Record the outcome of a mutation
+
+        Parameters
+        ----------
+        key: str, required
+            Key identifying the operation
+        status: int, optional
+            HTTP status of the response
+        error: str, optional
+            Description of the failure, if the request failed
+        """
+        ok = error is None and status is not None and status < 400
+        entry = {"k": key, "e": DONE if ok else ERROR, "s": status, "t": time.time()}
+        if error is not None:
+            entry["x"] = error
+        self._write(entry)
+
+    def is_complete(self, key: str) -> bool:
+        """Whether an operation finished successfully
+
+        Parameters
+        ----------
+        key: str, required
+            Key identifying the operation
+        """
+        entry = self._state.get(key)
+        return entry is not None and entry["e"] == DONE
+
+    def completed(self) -> set:
+        """Keys of operations that finished successfully"""
+        return {k for k, v in self._state.items() if v["e"] == DONE}
+
+    def failed(self) -> dict:
+        """Latest entry of every operation whose last attempt failed"""
+        return {k: v for k, v in self._state.items() if v["e"] == ERROR}
+
+    def unfinished(self) -> dict:
+        """Start entry of every operation that was sent but never finished"""
+        return {k: v for k, v in self._state.items() if v["e"] == START}
+
+    def resume(
+        self,
+        client,
+        operations: Iterable[Tuple],
+        *,
+        retry_failed: bool = True,
+        raise_errors: bool = True,
+    ):
+        """Run operations, skipping those that already completed
+
+        Parameters
+        ----------
+        client: Client, required
+            Client whose journal is this journal
+        operations: iterable, required
+            (method_name, args, kwargs) tuples, e.g.
+            ('update_contact', (1,), {'data': {...}}).  Each operation is keyed
+            by its contents, so the same input yields the same keys on restart
+        retry_failed: bool, default True, optional
+            Run operations whose last attempt failed again
+        raise_errors: bool, default True, optional
+            Stop at the first failed operation.  When False, the exception is
+            yielded in place of the result and the remaining operations still run
+
+        Yields
+        ------
+        tuple
+            (key, result) for every operation run.  Skipped operations are not
+            yielded
+        """
+        if getattr(client, "journal", None) is not self:
+            raise ValueError("The client must be created with this journal")
+        for method_name, args, kwargs in operations:
+            key = operation_key(method_name, args, kwargs)
+            if self.is_complete(key):
+                continue
+            if not retry_failed and key in self._state and self._state[key]["e"] == ERROR:
+                continue
+            try:
+                with operation(key):
+                    result = getattr(client, method_name)(*args, **kwargs)
+            except BrokermintError as e:
+                if raise_errors:
+                    raise
+                result = e
+            yield key, result
+
+    def replay(self, client):
+        """Re-send mutations that were started but never finished
+
+        Parameters
+        ----------
+        client: Client, required
+            Client whose journal is this journal
+
+        Yields
+        ------
+        tuple
+            (key, decoded response) for every mutation re-sent
+        """
+        if getattr(client, "journal", None) is not self:
+            raise ValueError("The client must be created with this journal")
+        inverse = {v: k for k, v in client.METHOD_MAPPING.items()}
+        for key, entry in self.unfinished().items():
+            with operation(key):
+                response = client._make_request(
+                    entry["u"],
+                    inverse[entry["m"]],
+                    client._construct_params(None),
+                    entry["d"],
+                    None,
+                    None,
+                )
+            yield key, client._decode(response)
+
+    def compact(self):
+        """Rewrite the journal keeping only the latest state of each operation
+
+        Completed operations keep only their outcome; request bodies are kept for
+        unfinished and failed operations so they can still be replayed.
+        """
+        with self._lock:
+            self._file.close()
+            tmp = f"{self.path}.compact"
+            with open(tmp, "w") as f:
+                for key, entry in self._state.items():
+                    if entry["e"] == DONE:
+                        entry = {k: entry[k] for k in ("k", "e", "s", "t") if k in entry}
+                        self._state[key] = entry
+                    f.write(json.dumps(entry, separators=(",", ":"), default=str) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+            self._file = open(self.path, "a")
+            self._unsynced = 0
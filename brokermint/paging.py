@@ -0,0 +1,116 @@
+"""Adaptive page sizes for paginated list endpoints"""
+
+from collections import deque
+import threading
+
+
+class PageSizeTuner:
+    """Choose the count of the next page from the size and latency of previous
+    pages
+
+    Page latency is modelled as a fixed overhead plus a cost per record, fitted
+    over the last window pages.  Records per second grow with the page size, so
+    the tuner picks the largest count whose predicted latency stays under
+    target_seconds and whose predicted body stays under max_bytes, within
+    [min_count, max_count].  Counts at most double from one page to the next,
+    and a page that times out halves the count.
+
+    Parameters
+    ----------
+    min_count: int, default 50, optional
+        Smallest page size
+    max_count: int, default 1000, optional
+        Largest page size
+    initial: int, optional
+        Page size of the first page.  Defaults to max_count
+    target_seconds: float, default 5, optional
+        Latency a page should stay under
+    max_bytes: int, default 8388608, optional
+        Size, in bytes, a page body should stay under
+    window: int, default 8, optional
+        Number of recent pages the latency model is fitted over
+    """
+
+    def __init__(
+        self,
+        *,
+        min_count: int = 50,
+        max_count: int = 1000,
+        initial: int = None,
+        target_seconds: float = 5,
+        max_bytes: int = 8 * 2 ** 20,
+        window: int = 8,
+    ):
+        if not 0 < min_count <= max_count:
+            raise ValueError("min_count must be positive and at most max_count")
+        self.min_count = min_count
+        self.max_count = max_count
+        self.target_seconds = target_seconds
+        self.max_bytes = max_bytes
+        self.count = self._clamp(initial or max_count)
+        self.bytes_per_record = None
+        self._pages = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def _clamp(self, count: float) -> int:
+        return int(max(self.min_count, min(self.max_count, count)))
+
+    def _fit(self):
+        """(overhead, seconds per record) fitted over recent pages"""
+        n = len(self._pages)
+        mean_records = sum(r for r, _ in self._pages) / n
+        mean_seconds = sum(s for _, s in self._pages) / n
+        variance = sum((r - mean_records) ** 2 for r, _ in self._pages)
+        if variance > 0:
+            covariance = sum(
+                (r - mean_records) * (s - mean_seconds) for r, s in self._pages
+            )
+            per_record = covariance / variance
+            if per_record > 0:
+                overhead = max(mean_seconds - per_record * mean_records, 0.0)
+                return overhead, per_record
+        return 0.0, mean_seconds / mean_records
+
+    def record(self, records: int, seconds: float, size: int = None):
+        """Record a page and choose the count of the next one
+
+        Parameters
+        ----------
+        records: int, required
+            Number of records on the page
+        seconds: float, required
+            Time taken to fetch and decode the page
+        size: int, optional
+            Size of the page body, in bytes
+        """
+        if records <= 0:
+            return self.count
+        with self._lock:
+            self._pages.append((records, seconds))
+            if size:
+                observed = size / records
+                self.bytes_per_record = (
+                    observed
+                    if self.bytes_per_record is None
+                    else 0.7 * self.bytes_per_record + 0.3 * observed
+                )
+            overhead, per_record = self._fit()
+            best = self.max_count
+            if per_record > 0:
+                best = min(best, (self.target_seconds - overhead) / per_record)
+            if self.bytes_per_record:
+                best = min(best, self.max_bytes / self.bytes_per_record)
+            self.count = self._clamp(min(best, self.count * 2))
+            return self.count
+
+    def timed_out(self, count: int):
+        """Halve the count after a page of count records timed out
+
+        Parameters
+        ----------
+        count: int, required
+            Page size of the request that timed out
+        """
+        with self._lock:
+            self.count = self._clamp(min(self.count, count) // 2)
+            return self.count
@@ -0,0 +1,294 @@
+"""Inverted index of transaction participants"""
+
+from typing import Iterable
+import json
+import os
+import threading
+import time
+
+from .deadline import scope
+from .exceptions import DeadlineExceeded
+from .utils import concurrent_map, missing_as
+
+
+USER = "user"
+CONTACT = "contact"
+
+
+def split_participants(payload):
+    """Yield (kind, id, role) for every participant in a participants response
+
+    Parameters
+    ----------
+    payload: list or dict, required
+        Response from list_transaction_participants, either grouped into users
+        and contacts or a flat list of participants with a type
+    """
+    if isinstance(payload, dict):
+        groups = ((USER, payload.get("users")), (CONTACT, payload.get("contacts")))
+        for kind, participants in groups:
+            for p in participants or ():
+                yield kind, p["id"], p.get("role")
+    elif isinstance(payload, list):
+        for p in payload:
+            kind = CONTACT if str(p.get("type", "")).lower() == CONTACT else USER
+            yield kind, p["id"], p.get("role")
+
+
+class ParticipantIndex:
+    """Reverse lookups from users and contacts to the transactions they are on
+
+    The index maps each user_id and contact_id to the transactions they
+    participate in and their role on each.  It is built by crawling
+    list_transaction_participants concurrently, refreshed incrementally from
+    transactions updated since the last crawl and can be saved to disk.  The
+    list_transactions filters given to build are saved with the index and reused
+    by refresh.
+
+    Parameters
+    ----------
+    path: str, optional
+        File the index is loaded from, if it exists, and saved to
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path
+        self.updated_since = None
+        self.filters = {}
+        self._transactions = {}
+        self._reverse = {USER: {}, CONTACT: {}}
+        self._lock = threading.Lock()
+        if path is not None and os.path.exists(path):
+            self.load(path)
+
+    def __len__(self):
+        return len(self._transactions)
+
+    def transactions_for_user(self, user_id: int) -> dict:
+        """Transactions a user participates in, mapped to the user's role
+
+        Parameters
+        ----------
+        user_id: int, required
+            ID of user
+        """
+        return dict(self._reverse[USER].get(user_id, {}))
+
+    def transactions_for_contact(self, contact_id: int) -> dict:
+        """Transactions a contact participates in, mapped to the contact's role
+
+        Parameters
+        ----------
+        contact_id: int, required
+            ID of contact
+        """
+        return dict(self._reverse[CONTACT].get(contact_id, {}))
+
+    def participants(self, transaction_id: int) -> list:
+        """(kind, id, role) tuples for the participants of a transaction
+
+        Parameters
+        ----------
+        transaction_id: int, required
+            ID of transaction
+        """
+        return list(self._transactions.get(transaction_id, ()))
+
+    def update(self, transaction_id: int, participants: Iterable[tuple]):
+        """Replace the participants recorded for a transaction
+
+        Parameters
+        ----------
+        transaction_id: int, required
+            ID of transaction
+        participants: iterable, required
+            (kind, id, role) tuples
+        """
+        participants = [tuple(p) for p in participants]
+        with self._lock:
+            self._remove(transaction_id)
+            self._transactions[transaction_id] = participants
+            for kind, participant_id, role in participants:
+                self._reverse[kind].setdefault(participant_id, {})[
+                    transaction_id
+                ] = role
+
+    def remove(self, transaction_id: int):
+        """Forget a transaction
+
+        Parameters
+        ----------
+        transaction_id: int, required
+            ID of transaction
+        """
+        with self._lock:
+            self._remove(transaction_id)
+
+    def _remove(self, transaction_id: int):
+        for kind, participant_id, _ in self._transactions.pop(transaction_id, ()):
+            transactions = self._reverse[kind].get(participant_id)
+            if transactions is not None:
+                transactions.pop(transaction_id, None)
+                if not transactions:
+                    del self._reverse[kind][participant_id]
+
+    def crawl(
+        self,
+        client,
+        transaction_ids: Iterable[int],
+        *,
+        max_workers: int = 8,
+        partial: bool = True,
+    ):
+        """Fetch and index the participants of many transactions concurrently
+
+        Parameters
+        ----------
+        client: Client, required
+            Client used to make requests
+        transaction_ids: iterable, required
+            IDs of transactions
+        max_workers: int, default 8, optional
+            Maximum number of concurrent requests
+        partial: bool, default True, optional
+            Stop silently when the deadline passes.  With False,
+            DeadlineExceeded is raised unless every transaction was crawled
+        """
+        transaction_ids = list(transaction_ids)
+        crawled = done = 0
+        for transaction_id, payload in concurrent_map(
+            missing_as(client.list_transaction_participants),
+            transaction_ids,
+            max_workers=max_workers,
+        ):
+            done += 1
+            if payload is None:
+
+                # Transaction was deleted since it was listed
+                self.remove(transaction_id)
+                continue
+            self.update(transaction_id, split_participants(payload))
+            crawled += 1
+        if not partial and done < len(transaction_ids):
+            raise DeadlineExceeded()
+        return crawled
+
+    def build(self, client, *, max_workers: int = 8, overlap: int = 60000, **kwargs):
+        """Crawl the participants of every transaction, replacing the index
+
+        Parameters
+        ----------
+        client: Client, required
+            Client used to make requests
+        max_workers: int, default 8, optional
+            Maximum number of concurrent requests
+        overlap: int, default 60000, optional
+            Milliseconds subtracted from the crawl's start time when recording
+            updated_since, to tolerate clock skew
+        **kwargs
+            Keyword arguments passed to list_transactions, kept as the filters
+            of later refreshes.  A deadline applies to the whole build
+
+        updated_since is only recorded once every transaction has been listed and
+        crawled; when the deadline passes first, DeadlineExceeded is raised and
+        the next refresh builds the index again.
+        """
+        started = int(time.time() * 1000)
+        self.filters = kwargs
+        self.updated_since = None
+        with scope(kwargs.get("deadline")):
+            ids = self._list_ids(client)
+            self._prune(ids)
+            self.crawl(client, ids, max_workers=max_workers, partial=False)
+        self.updated_since = started - overlap
+        return self
+
+    def refresh(
+        self,
+        client,
+        *,
+        max_workers: int = 8,
+        overlap: int = 60000,
+        prune: bool = True,
+    ):
+        """Re-crawl only transactions updated since the last build or refresh
+
+        Parameters
+        ----------
+        client: Client, required
+            Client used to make requests
+        max_workers: int, default 8, optional
+            Maximum number of concurrent requests
+        overlap: int, default 60000, optional
+            Milliseconds subtracted from the refresh's start time when recording
+            updated_since, to tolerate clock skew
+        prune: bool, default True, optional
+            List the IDs of every transaction matching the filters and remove
+            those no longer listed, i.e. deleted or no longer matching.  Without
+            it they are kept until the next build
+
+        As with build, updated_since only advances once every updated
+        transaction has been listed and crawled.
+        """
+        if self.updated_since is None:
+            return self.build(
+                client, max_workers=max_workers, overlap=overlap, **self.filters
+            )
+        started = int(time.time() * 1000)
+        with scope(self.filters.get("deadline")):
+            if prune:
+                self._prune(self._list_ids(client))
+            ids = self._list_ids(client, updated_since=self.updated_since)
+            self.crawl(client, ids, max_workers=max_workers, partial=False)
+        self.updated_since = started - overlap
+        return self
+
+    def _list_ids(self, client, **kwargs) -> list:
+        """IDs of every transaction matching the filters, raising
+        DeadlineExceeded rather than returning a truncated listing"""
+        pages = client.paginate(
+            "list_transactions", partial=False, **{**self.filters, **kwargs}
+        )
+        return [t["id"] for page in pages for t in page]
+
+    def _prune(self, ids: Iterable[int]):
+        for stale in set(self._transactions) - set(ids):
+            self.remove(stale)
+
+    def save(self, path: str = None):
+        """Write the index to disk
+
+        Parameters
+        ----------
+        path: str, optional
+            Location of the file.  Defaults to the path the index was created with
+        """
+        path = path or self.path
+        tmp = f"{path}.tmp"
+        with self._lock:
+            state = {
+                "updated_since": self.updated_since,
+                "filters": self.filters,
+                "transactions": [[k, v] for k, v in self._transactions.items()],
+            }
+        with open(tmp, "w") as f:
+            json.dump(state, f, separators=(",", ":"))
+        os.replace(tmp, path)
+
+    def load(self, path: str = None):
+        """Read an index previously written with save
+
+        Parameters
+        ----------
+        path: str, optional
+            Location of the file.  Defaults to the path the index was created with
+        """
+        with open(path or self.path) as f:
+            state = json.load(f)
+        self._transactions = {}
+        self._reverse = {USER: {}, CONTACT: {}}
+        for transaction_id, participants in state["transactions"]:
+            self.update(transaction_id, participants)
+        self.updated_since = state["updated_since"]
+        self.filters = state.get("filters", {})
+        return self
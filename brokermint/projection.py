@@ -0,0 +1,102 @@
+"""Keep only requested fields of decoded records"""
+
+from typing import Iterable, Union
+
+from .utils import StripedLock
+
+
+def normalize_fields(fields: Union[str, Iterable[str]]) -> frozenset:
+    """Set of top-level fields to keep, always including id
+
+    Parameters
+    ----------
+    fields: str or iterable, required
+        Field names, as an iterable or a comma separated string
+    """
+    if isinstance(fields, str):
+        fields = fields.split(",")
+    return frozenset(f.strip() for f in fields if f.strip()) | {"id"}
+
+
+def _project_record(record, fields: frozenset):
+    if not isinstance(record, dict):
+        return record
+    return {k: record[k] for k in fields if k in record}
+
+
+def project(payload, fields: frozenset):
+    """Drop every key of a record, or of each record of a list, not in fields
+
+    Parameters
+    ----------
+    payload: list or dict, required
+        Decoded response
+    fields: frozenset, required
+        Fields to keep, see normalize_fields
+    """
+    if isinstance(payload, list):
+        return [_project_record(r, fields) for r in payload]
+    return _project_record(payload, fields)
+
+
+def record_keys(payload):
+    """Union of the keys of the records in a decoded response, or None when it
+    holds no records
+
+    Parameters
+    ----------
+    payload: list or dict, required
+        Decoded response
+    """
+    records = payload if isinstance(payload, list) else [payload]
+    keys = set()
+    for record in records:
+        if isinstance(record, dict):
+            keys.update(record)
+    return keys or None
+
+
+class ShortFields:
+    """Fields each endpoint returns without full_info, learnt from responses
+
+    Used to request short records when they hold every projected field and
+    full records otherwise.
+    """
+
+    def __init__(self):
+        self._known = {}
+        self._locks = StripedLock()
+
+    def full_info(self, endpoint: tuple, fields: frozenset):
+        """1 when full records are needed for fields, 0 when short records
+        suffice, or None when the endpoint has not been seen yet
+
+        Parameters
+        ----------
+        endpoint: tuple, required
+            (key, method) of the endpoint in Client.ENDPOINTS
+        fields: frozenset, required
+            Projected fields
+        """
+        known = self._known.get(endpoint)
+        if known is None:
+            return None
+        return 0 if fields <= known else 1
+
+    def learn(self, endpoint: tuple, payload) -> bool:
+        """Record the fields of a short response, returning whether it held any
+        records
+
+        Parameters
+        ----------
+        endpoint: tuple, required
+            (key, method) of the endpoint in Client.ENDPOINTS
+        payload: list or dict, required
+            Decoded short response
+        """
+        keys = record_keys(payload)
+        if keys is None:
+            return False
+        with self._locks(endpoint):
+            self._known[endpoint] = self._known.get(endpoint, set()) | keys
+        return True
@@ -0,0 +1,236 @@
+"""Refresh-ahead in-memory cache of slow-changing reference data"""
+
+import threading
+import time
+
+from .utils import as_records, concurrent_map, missing_as
+
+
+USERS = "users"
+COMMISSION_PLANS = "commission_plans"
+REPORTS = "reports"
+REPORT_FILTERS = "report_filters"
+
+TABLES = (USERS, COMMISSION_PLANS, REPORTS, REPORT_FILTERS)
+
+
+class _Table:
+    def __init__(self):
+        self.rows = {}
+        self.loaded_at = None
+        self.due = 0.0
+        self.failures = 0
+        self.error = None
+
+
+class ReferenceData:
+    """Users, commission plans, reports and report filters served from memory
+
+    Tables are loaded when the store starts and reloaded by a background thread
+    once refresh_ahead of their ttl has elapsed, before they expire.  Reads never
+    touch the network:  they look records up by ID in a dictionary that is
+    swapped whole when a reload completes, so readers always see a complete
+    table without taking a lock.  When a reload fails the previous rows keep
+    being served (stale-while-revalidate) and the reload is retried with
+    exponential backoff.
+
+    Report filters are keyed by report ID, each holding the filters of that
+    report, and are reloaded after reports.
+
+    Parameters
+    ----------
+    client: Client, required
+        Client used to make requests
+    tables: list, optional
+        Tables to keep, among users, commission_plans, reports and
+        report_filters.  Defaults to all of them
+    ttl: float, default 300, optional
+        Seconds after which a table is considered stale
+    refresh_ahead: float, default 0.8, optional
+        Fraction (0 - 1) of ttl after which a table is reloaded
+    max_workers: int, default 4, optional
+        Maximum number of concurrent requests when loading report filters
+    """
+
+    def __init__(
+        self,
+        client,
+        *,
+        tables: list = None,
+        ttl: float = 300,
+        refresh_ahead: float = 0.8,
+        max_workers: int = 4,
+    ):
+        tables = list(TABLES if tables is None else tables)
+        unknown = set(tables) - set(TABLES)
+        if unknown:
+            raise ValueError(f"Unknown tables:  {', '.join(sorted(unknown))}")
+        if REPORT_FILTERS in tables and REPORTS not in tables:
+            tables.insert(tables.index(REPORT_FILTERS), REPORTS)
+        if not 0 < refresh_ahead <= 1:
+            raise ValueError("refresh_ahead must be between 0 and 1")
+        self.client = client
+        self.ttl = ttl
+        self.refresh_ahead = refresh_ahead
+        self.max_workers = max_workers
+        self._tables = {name: _Table() for name in tables}
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _load(self, name: str) -> dict:
+        client = self.client
+        if name == USERS:
+            records = (u for page in client.paginate("list_users") for u in page)
+        elif name == COMMISSION_PLANS:
+            records = as_records(client.list_commission_plans())
+        elif name == REPORTS:
+            records = as_records(client.list_reports())
+        else:
+            list_filters = missing_as(client.list_report_filters)
+            return {
+                report_id: as_records(filters)
+                for report_id, filters in concurrent_map(
+                    list_filters,
+                    list(self._tables[REPORTS].rows),
+                    max_workers=self.max_workers,
+                )
+                if filters is not None
+            }
+        return {r["id"]: r for r in records}
+
+    def refresh(self, name: str = None):
+        """Reload a table now, or every table when name is None
+
+        Failures are recorded and the previous rows kept; the exception is only
+        raised when the table has never been loaded.
+
+        Parameters
+        ----------
+        name: str, optional
+            Table to reload
+        """
+        return self._refresh(name, raise_errors=True)
+
+    def _refresh(self, name: str, raise_errors: bool):
+        for table_name in [name] if name is not None else list(self._tables):
+            table = self._tables[table_name]
+            try:
+                rows = self._load(table_name)
+            except Exception as e:
+                table.failures += 1
+                table.error = e
+                backoff = min(2 ** table.failures, self.ttl * self.refresh_ahead)
+                table.due = time.monotonic() + backoff
+                if raise_errors and table.loaded_at is None:
+                    raise
+                continue
+            table.rows = rows
+            table.loaded_at = time.monotonic()
+            table.due = table.loaded_at + self.ttl * self.refresh_ahead
+            table.failures = 0
+            table.error = None
+        return self
+
+    def start(self):
+        """Load every table, then reload them in a background thread"""
+        if self._thread is None or not self._thread.is_alive():
+            self.refresh()
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="brokermint-reference-data", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: float = None):
+        """Stop the background thread
+
+        Parameters
+        ----------
+        timeout: float, optional
+            Seconds to wait for the thread to finish
+        """
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            now = time.monotonic()
+            for name, table in list(self._tables.items()):
+                if table.due <= now and not self._stop.is_set():
+                    self._refresh(name, raise_errors=False)
+            next_due = min(table.due for table in self._tables.values())
+            self._wake.wait(max(next_due - time.monotonic(), 0.01))
+            self._wake.clear()
+
+    def get(self, table: str, record_id: int, default=None):
+        """Record of a table by ID, without blocking on the network
+
+        Parameters
+        ----------
+        table: str, required
+            One of users, commission_plans, reports or report_filters
+        record_id: int, required
+            ID of the record, or of the report for report_filters
+        default: optional
+            Value returned when the record is unknown
+        """
+        return self._tables[table].rows.get(record_id, default)
+
+    def all(self, table: str) -> list:
+        """Every record of a table
+
+        Parameters
+        ----------
+        table: str, required
+            One of users, commission_plans, reports or report_filters
+        """
+        return list(self._tables[table].rows.values())
+
+    def user(self, user_id: int, default=None):
+        """User by ID"""
+        return self.get(USERS, user_id, default)
+
+    def commission_plan(self, plan_id: int, default=None):
+        """Commission plan by ID"""
+        return self.get(COMMISSION_PLANS, plan_id, default)
+
+    def report(self, report_id: int, default=None):
+        """Report by ID"""
+        return self.get(REPORTS, report_id, default)
+
+    def report_filters(self, report_id: int, default=None):
+        """Filters of a report"""
+        return self.get(REPORT_FILTERS, report_id, default)
+
+    def age(self, table: str):
+        """Seconds since a table was last loaded, or None if it never was
+
+        Parameters
+        ----------
+        table: str, required
+            One of users, commission_plans, reports or report_filters
+        """
+        loaded_at = self._tables[table].loaded_at
+        return None if loaded_at is None else time.monotonic() - loaded_at
+
+    def stale(self, table: str) -> bool:
+        """Whether a table is older than ttl, i.e. its reloads keep failing
+
+        Parameters
+        ----------
+        table: str, required
+            One of users, commission_plans, reports or report_filters
+        """
+        age = self.age(table)
+        return age is None or age > self.ttl
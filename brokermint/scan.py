@@ -0,0 +1,172 @@
+"""Parallel ID-range scans over paginated list endpoints"""
+
+from concurrent.futures import ThreadPoolExecutor
+import queue
+import threading
+
+from .deadline import resolve, scope
+from .exceptions import DeadlineExceeded
+
+
+_DONE = object()
+
+
+def _first_id(client, method: str, starting_from_id: int, **kwargs):
+    page = getattr(client, method)(count=1, starting_from_id=starting_from_id, **kwargs)
+    if isinstance(page, list) and page:
+        return page[0]["id"]
+    return None
+
+
+def estimate_id_range(
+    client, method: str, *, starting_from_id: int = None, resolution: int = None, **kwargs
+):
+    """Estimate the lowest and highest IDs matching the filters of a list method
+
+    The lowest ID comes from the first record.  The highest is bracketed by
+    exponentially growing probes with count=1 and narrowed by bisection until
+    within resolution of the true value.  The estimate never exceeds the real
+    highest ID.
+
+    Parameters
+    ----------
+    client: Client, required
+        Client used to make requests
+    method: str, required
+        Name of a paginated list method
+    starting_from_id: int, optional
+        Lowest ID to consider
+    resolution: int, optional
+        Acceptable error of the highest ID.  Defaults to 1/64th of the range
+    **kwargs
+        Filters passed to the list method
+
+    Returns
+    -------
+    tuple or None
+        (lowest, highest) IDs, or None when there are no records
+    """
+    low = _first_id(client, method, starting_from_id, **kwargs)
+    if low is None:
+        return None
+    last, step = low, 1024
+    while True:
+        found = _first_id(client, method, low + step, **kwargs)
+        if found is None:
+            high = low + step
+            break
+        last = found
+        step *= 4
+    resolution = resolution or max((high - low) // 64, 1)
+    while high - last > resolution:
+        middle = (last + high) // 2
+        found = _first_id(client, method, middle, **kwargs)
+        if found is None:
+            high = middle
+        else:
+            last = found
+    return low, last
+
+
+def split_range(low: int, high: int, shards: int):
+    """Split [low, high] into shards (start, stop) ranges; the last is open ended
+
+    Parameters
+    ----------
+    low: int, required
+        Lowest ID
+    high: int, required
+        Highest ID
+    shards: int, required
+        Number of ranges
+    """
+    shards = max(min(shards, high - low + 1), 1)
+    span = high - low + 1
+    starts = [low + span * i // shards for i in range(shards)]
+    return list(zip(starts, starts[1:] + [None]))
+
+
+def scan(
+    client,
+    method: str,
+    *,
+    shards: int = 8,
+    ordered: bool = False,
+    deadline: float = None,
+    **kwargs,
+):
+    """Iterate through every page of a paginated list method using parallel
+    ID-range shards
+
+    Parameters
+    ----------
+    client: Client, required
+        Client used to make requests
+    method: str, required
+        Name of a paginated list method, i.e. list_transactions, list_contacts
+        or list_users
+    shards: int, default 8, optional
+        Number of ID ranges read concurrently
+    ordered: bool, default False, optional
+        Yield pages in ID order instead of as soon as they arrive
+    deadline: float, optional
+        Budget, in seconds, for the whole scan
+    **kwargs
+        Keyword arguments passed to the list method
+    """
+    deadline = resolve(deadline)
+    starting_from_id = kwargs.pop("starting_from_id", None)
+    filters = {k: v for k, v in kwargs.items() if k != "count"}
+    try:
+        with scope(deadline):
+            estimate = estimate_id_range(
+                client, method, starting_from_id=starting_from_id, **filters
+            )
+    except DeadlineExceeded:
+        return
+    if estimate is None:
+        return
+    ranges = split_range(*estimate, shards)
+
+    pages = queue.Queue()
+    stop = threading.Event()
+
+    def read(index, start, before):
+        try:
+            for page in client.paginate(
+                method,
+                deadline=deadline,
+                starting_from_id=start,
+                before_id=before,
+                **kwargs,
+            ):
+                if stop.is_set():
+                    break
+                pages.put((index, page))
+        except BaseException as e:
+            pages.put((index, e))
+        pages.put((index, _DONE))
+
+    executor = ThreadPoolExecutor(max_workers=len(ranges))
+    try:
+        for index, (start, before) in enumerate(ranges):
+            executor.submit(read, index, start, before)
+        remaining = len(ranges)
+        current, finished, buffered = 0, set(), {i: [] for i in range(len(ranges))}
+        while remaining:
+            index, item = pages.get()
+            if item is _DONE:
+                remaining -= 1
+                finished.add(index)
+                while ordered and current in finished and current + 1 < len(ranges):
+                    current += 1
+                    yield from buffered.pop(current)
+            elif isinstance(item, BaseException):
+                raise item
+            elif not ordered or index == current:
+                yield item
+            else:
+                buffered[index].append(item)
+    finally:
+        stop.set()
+        executor.shutdown(wait=False)
@@ -0,0 +1,277 @@
+"""NDJSON snapshots with a memory-mapped id -> offset index"""
+
+from typing import Iterable
+import mmap
+import os
+import struct
+import time
+
+from . import decoding
+
+
+MAGIC = b"BMSNAP2\x00"
+
+# magic, number of entries, size and modification time (ns) of the data file
+HEADER = struct.Struct("<8sQQq")
+
+# id, offset of the record in the data file, length of the record in bytes
+ENTRY = struct.Struct("<qQI")
+
+
+def index_path(path: str) -> str:
+    """Location of the index of a snapshot"""
+    return f"{path}.idx"
+
+
+class SnapshotWriter:
+    """Write records to an NDJSON file and a sorted id -> offset index next to it
+
+    Records are appended to the data file as they are written; the index is
+    sorted and written on close.  Both files are written under temporary names
+    and moved into place on close, so readers never see a partial snapshot.  The
+    index records the size and modification time of its data file, so a reader
+    opening the snapshot while it is being replaced can tell the two files apart.
+    When several records share an ID, the last one written wins.
+
+    Parameters
+    ----------
+    path: str, required
+        Location of the NDJSON file.  The index is written to path + '.idx'
+    json_backend: str, default 'auto', optional
+        Library used to encode records, one of auto, json or orjson
+    """
+
+    def __init__(self, path: str, *, json_backend: str = "auto"):
+        self.path = path
+        self._dumps = decoding.get_dumps(json_backend)
+        self._offsets = {}
+        self._position = 0
+        self._file = open(f"{path}.tmp", "wb")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def write(self, record: dict):
+        """Append a record
+
+        Parameters
+        ----------
+        record: dict, required
+            Record with an integer id
+        """
+        line = self._dumps(record).encode() + b"\n"
+        self._file.write(line)
+        self._offsets[int(record["id"])] = (self._position, len(line) - 1)
+        self._position += len(line)
+
+    def write_many(self, records: Iterable[dict]):
+        """Append many records, or pages of records
+
+        Parameters
+        ----------
+        records: iterable, required
+            Records, or lists of records such as the pages of Client.paginate
+        """
+        for item in records:
+            if isinstance(item, list):
+                for record in item:
+                    self.write(record)
+            else:
+                self.write(item)
+        return self
+
+    def close(self):
+        """Write the index and move both files into place"""
+        if self._file.closed:
+            return
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        data = os.stat(f"{self.path}.tmp")
+        tmp = f"{index_path(self.path)}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(
+                HEADER.pack(
+                    MAGIC, len(self._offsets), data.st_size, data.st_mtime_ns
+                )
+            )
+            for record_id in sorted(self._offsets):
+                f.write(ENTRY.pack(record_id, *self._offsets[record_id]))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(f"{self.path}.tmp", self.path)
+        os.replace(tmp, index_path(self.path))
+
+    def abort(self):
+        """Discard the snapshot being written"""
+        if not self._file.closed:
+            self._file.close()
+        os.remove(f"{self.path}.tmp")
+
+
+def _map(path: str):
+    """Memory-map a file, returning the map (None when the file is empty) and
+    the file's stat"""
+    with open(path, "rb") as f:
+        stat = os.fstat(f.fileno())
+        if stat.st_size == 0:
+            return None, stat
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ), stat
+
+
+class Snapshot:
+    """Read records from a snapshot written by SnapshotWriter
+
+    Both the data file and its index are memory-mapped, so opening a snapshot
+    takes the same time whatever its size, and lookups and range scans only read
+    the pages of the files they touch.  Lookups are binary searches over the
+    sorted index.
+
+    Parameters
+    ----------
+    path: str, required
+        Location of the NDJSON file
+    json_backend: str, default 'auto', optional
+        Library used to decode records, one of auto, json, orjson or simdjson
+    timeout: float, default 1, optional
+        Seconds to wait for the data file and its index to match, when the
+        snapshot is being replaced
+    """
+
+    def __init__(
+        self, path: str, *, json_backend: str = "auto", timeout: float = 1
+    ):
+        self.path = path
+        self._loads = decoding.get_loads(json_backend)
+        self._index = self._data = None
+        give_up = time.monotonic() + timeout
+        while not self._open():
+            self.close()
+            if time.monotonic() >= give_up:
+                raise ValueError(f"{path} does not match its index")
+            time.sleep(0.01)
+
+    def _open(self) -> bool:
+        """Map the index and the data file, returning whether they match"""
+        self._index, _ = _map(index_path(self.path))
+        if self._index is None or self._index[:8] != MAGIC:
+            self.close()
+            raise ValueError(f"{index_path(self.path)} is not a snapshot index")
+        _, self._count, size, mtime_ns = HEADER.unpack_from(self._index, 0)
+        self._data, data = _map(self.path)
+        return data.st_size == size and data.st_mtime_ns == mtime_ns
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, record_id: int):
+        return self._find(record_id) is not None
+
+    def __iter__(self):
+        return self.range()
+
+    def close(self):
+        """Unmap the files"""
+        for mapped in (self._index, self._data):
+            if mapped is not None and not mapped.closed:
+                mapped.close()
+
+    def _entry(self, position: int):
+        return ENTRY.unpack_from(self._index, HEADER.size + position * ENTRY.size)
+
+    def _bisect(self, record_id: int) -> int:
+        """Position of the first entry with an ID greater than or equal to
+        record_id"""
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._entry(middle)[0] < record_id:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def _find(self, record_id: int):
+        position = self._bisect(record_id)
+        if position < self._count:
+            entry = self._entry(position)
+            if entry[0] == record_id:
+                return entry
+        return None
+
+    def _read(self, entry) -> dict:
+        _, offset, length = entry
+        return self._loads(self._data[offset:offset + length])
+
+    def get(self, record_id: int, default=None):
+        """Record with an ID, or default when the snapshot does not hold it
+
+        Parameters
+        ----------
+        record_id: int, required
+            ID of the record
+        default: optional
+            Value returned when the record is missing
+        """
+        entry = self._find(record_id)
+        return default if entry is None else self._read(entry)
+
+    def ids(self):
+        """Iterate through the IDs of the snapshot in ascending order"""
+        for position in range(self._count):
+            yield self._entry(position)[0]
+
+    def range(self, start: int = None, stop: int = None):
+        """Iterate through records with start <= id < stop in ascending ID order
+
+        Parameters
+        ----------
+        start: int, optional
+            Lowest ID.  Defaults to the first record
+        stop: int, optional
+            ID after the last record.  Defaults to past the last record
+        """
+        position = 0 if start is None else self._bisect(start)
+        while position < self._count:
+            entry = self._entry(position)
+            if stop is not None and entry[0] >= stop:
+                return
+            yield self._read(entry)
+            position += 1
+
+
+def write_snapshot(client, method: str, path: str, *args, **kwargs) -> Snapshot:
+    """Write every record of a paginated list method to a snapshot
+
+    Parameters
+    ----------
+    client: Client, required
+        Client used to make requests
+    method: str, required
+        Name of a paginated list method, i.e. list_transactions, list_contacts
+        or list_users
+    path: str, required
+        Location of the NDJSON file.  The index is written to path + '.idx'
+    *args
+        Positional arguments passed to the list method
+    **kwargs
+        Keyword arguments passed to Client.paginate
+    """
+    with SnapshotWriter(path, json_backend=client.json_backend) as writer:
+        writer.write_many(client.paginate(method, *args, **kwargs))
+    return Snapshot(path, json_backend=client.json_backend)
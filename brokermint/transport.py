@@ -0,0 +1,397 @@
+"""HTTP transports used by Client to send requests"""
+
+from typing import Callable, Tuple, Union
+from urllib.parse import urlencode, urlsplit, parse_qsl
+import importlib.util
+import json as _json
+import threading
+import weakref
+
+from .utils import import_optional
+
+
+class Response:
+    """Minimal response returned by transports without a response class of
+    their own
+
+    Parameters
+    ----------
+    status_code: int, required
+        HTTP status code
+    content: bytes, optional
+        Raw response body
+    headers: dict, optional
+        Response headers
+    """
+
+    def __init__(self, status_code: int, content: bytes = b"", headers: dict = None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self):
+        return _json.loads(self.content)
+
+    def __repr__(self):
+        return f"<Response [{self.status_code}]>"
+
+
+class Transport:
+    """Interface every transport implements
+
+    A transport sends one request and returns an object with status_code,
+    headers, content and text attributes and a json() method.  Exceptions raised
+    for timeouts must be listed in timeout_errors.
+    """
+
+    name = None
+    timeout_errors: Tuple[type, ...] = ()
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        params: dict = None,
+        json: dict = None,
+        files: dict = None,
+        headers: dict = None,
+        timeout: Union[float, Tuple[float, float]] = None,
+    ):
+        """Send a request
+
+        Parameters
+        ----------
+        method: str, required
+            HTTP method, e.g. GET
+        url: str, required
+            Fully constructed URL
+        params: dict, optional
+            Query parameters
+        json: dict, optional
+            Body sent as JSON
+        files: dict, optional
+            Files sent as multipart/form-data
+        headers: dict, optional
+            Request headers
+        timeout: float or tuple, optional
+            Seconds to wait, as a single number or a (connect, read) tuple
+        """
+        raise NotImplementedError
+
+    def close(self):
+        """Release any pooled connections"""
+
+
+class RequestsTransport(Transport):
+    """Transport backed by requests.Session objects
+
+    requests does not guarantee that a Session is thread-safe, so each thread
+    gets a session of its own, created on its first request.  Every session
+    mounts the same HTTPAdapter, whose urllib3 connection pools are
+    thread-safe, so open connections are reused by all threads, including
+    short-lived worker threads, instead of each thread opening its own.
+
+    Parameters
+    ----------
+    session: requests.Session, optional
+        Session used by every thread instead of one session per thread
+    max_connections: int, default 10, optional
+        Maximum number of connections kept open to each host
+    """
+
+    name = "requests"
+
+    def __init__(self, session=None, *, max_connections: int = 10):
+        requests = import_optional("requests", "requests")
+        self._requests = requests
+        self.timeout_errors = (requests.Timeout,)
+        self._shared = session
+        self.adapter = requests.adapters.HTTPAdapter(pool_maxsize=max_connections)
+        self._local = threading.local()
+        self._sessions = weakref.WeakSet()
+        self._lock = threading.Lock()
+
+    @property
+    def session(self):
+        """Session of the calling thread"""
+        if self._shared is not None:
+            return self._shared
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = self._requests.Session()
+            session.mount("https://", self.adapter)
+            session.mount("http://", self.adapter)
+            with self._lock:
+                self._sessions.add(session)
+        return session
+
+    def request(
+        self, method, url, *, params=None, json=None, files=None, headers=None, timeout=None
+    ):
+        return self.session.request(
+            method,
+            url,
+            params=params,
+            json=json,
+            files=files,
+            headers=headers,
+            timeout=timeout,
+        )
+
+    def close(self):
+        if self._shared is not None:
+            self._shared.close()
+        with self._lock:
+            sessions = list(self._sessions)
+        for session in sessions:
+            session.close()
+        self.adapter.close()
+
+
+class HttpxTransport(Transport):
+    """Transport backed by an httpx.Client, optionally using HTTP/2
+
+    With HTTP/2, concurrent requests from many threads are multiplexed as
+    streams over a few connections instead of each needing its own socket and
+    TLS handshake.  When the h2 package is missing, or the server does not
+    negotiate HTTP/2, requests fall back to HTTP/1.1.
+
+    Parameters
+    ----------
+    http2: bool, default False, optional
+        Negotiate HTTP/2
+    max_connections: int, default 10, optional
+        Maximum number of open connections
+    client: httpx.Client, optional
+        Client used to make requests
+    """
+
+    name = "httpx"
+
+    def __init__(self, *, http2: bool = False, max_connections: int = 10, client=None):
+        httpx = import_optional("httpx", "httpx")
+        self._httpx = httpx
+        self.timeout_errors = (httpx.TimeoutException,)
+        self.http2 = http2 and _h2_available()
+        self.client = client or httpx.Client(
+            http2=self.http2, limits=httpx.Limits(max_connections=max_connections)
+        )
+
+    def request(
+        self, method, url, *, params=None, json=None, files=None, headers=None, timeout=None
+    ):
+        return self.client.request(
+            method,
+            url,
+            params=params,
+            json=json,
+            files=files,
+            headers=headers,
+            timeout=_httpx_timeout(self._httpx, timeout),
+        )
+
+    def close(self):
+        self.client.close()
+
+
+class AsyncHttpxTransport(HttpxTransport):
+    """Asynchronous transport backed by an httpx.AsyncClient, optionally using
+    HTTP/2
+
+    Parameters
+    ----------
+    http2: bool, default False, optional
+        Negotiate HTTP/2, falling back to HTTP/1.1 when unavailable
+    max_connections: int, default 10, optional
+        Maximum number of open connections
+    client: httpx.AsyncClient, optional
+        Client used to make requests
+    """
+
+    name = "httpx-async"
+
+    def __init__(self, *, http2: bool = False, max_connections: int = 10, client=None):
+        httpx = import_optional("httpx", "httpx")
+        super().__init__(
+            http2=http2,
+            max_connections=max_connections,
+            client=client
+            or httpx.AsyncClient(
+                http2=http2 and _h2_available(),
+                limits=httpx.Limits(max_connections=max_connections),
+            ),
+        )
+
+    async def request(
+        self, method, url, *, params=None, json=None, files=None, headers=None, timeout=None
+    ):
+        return await self.client.request(
+            method,
+            url,
+            params=params,
+            json=json,
+            files=files,
+            headers=headers,
+            timeout=_httpx_timeout(self._httpx, timeout),
+        )
+
+    def close(self):
+        raise TypeError("Use 'await transport.aclose()' with asynchronous transports")
+
+    async def aclose(self):
+        await self.client.aclose()
+
+
+class Urllib3Transport(Transport):
+    """Transport backed by a raw urllib3.PoolManager
+
+    Parameters
+    ----------
+    pool: urllib3.PoolManager, optional
+        Pool used to make requests
+    maxsize: int, default 10, optional
+        Number of connections kept per host
+    """
+
+    name = "urllib3"
+
+    def __init__(self, *, pool=None, maxsize: int = 10):
+        urllib3 = import_optional("urllib3", "urllib3")
+        self._urllib3 = urllib3
+        self.timeout_errors = (urllib3.exceptions.TimeoutError,)
+        self.pool = pool or urllib3.PoolManager(maxsize=maxsize)
+
+    def request(
+        self, method, url, *, params=None, json=None, files=None, headers=None, timeout=None
+    ):
+        urllib3 = self._urllib3
+        headers = dict(headers or {})
+        if params:
+            url = f"{url}{'&' if '?' in url else '?'}{urlencode(params)}"
+        body = None
+        if files:
+            fields = {
+                name: _file_field(value) for name, value in files.items()
+            }
+            body, headers["Content-Type"] = urllib3.encode_multipart_formdata(fields)
+        elif json is not None:
+            body = _json.dumps(json).encode()
+            headers["Content-Type"] = "application/json"
+        if isinstance(timeout, tuple):
+            timeout = urllib3.Timeout(connect=timeout[0], read=timeout[1])
+        response = self.pool.request(
+            method,
+            url,
+            body=body,
+            headers=headers,
+            timeout=timeout,
+            retries=False,
+            preload_content=True,
+        )
+        return Response(response.status, response.data, dict(response.headers))
+
+    def close(self):
+        self.pool.clear()
+
+
+class InMemoryTransport(Transport):
+    """Transport answering requests from Python, for tests and benchmarks
+
+    Parameters
+    ----------
+    handler: callable or dict, required
+        Either a function called with (method, path, params, json) or a
+        dictionary keyed by (method, path).  Paths exclude the base URL and query
+        string, e.g. ('GET', '/v2/transactions').  The result is either the body
+        to return with a 200 status, or a (status, body) or
+        (status, body, headers) tuple.  Bodies that are not bytes or str are
+        encoded as JSON.
+    """
+
+    name = "memory"
+
+    def __init__(self, handler: Union[Callable, dict]):
+        self.handler = handler
+        self.requests = []
+
+    def request(
+        self, method, url, *, params=None, json=None, files=None, headers=None, timeout=None
+    ):
+        parts = urlsplit(url)
+        path = parts.path
+        if path.startswith("/api/"):
+            path = path[len("/api"):]
+        params = {**dict(parse_qsl(parts.query)), **(params or {})}
+        self.requests.append((method, path, params, json))
+        if callable(self.handler):
+            result = self.handler(method, path, params, json)
+        else:
+            try:
+                result = self.handler[(method, path)]
+            except KeyError:
+                result = (404, {"error": "Not found"})
+        status, body, response_headers = 200, result, {}
+        if isinstance(result, tuple):
+            status, body, *rest = result
+            response_headers = rest[0] if rest else {}
+        if isinstance(body, str):
+            body = body.encode()
+        elif not isinstance(body, bytes):
+            body = _json.dumps(body).encode()
+            response_headers.setdefault("Content-Type", "application/json")
+        return Response(status, body, response_headers)
+
+
+TRANSPORTS = {
+    "requests": RequestsTransport,
+    "httpx": HttpxTransport,
+    "urllib3": Urllib3Transport,
+}
+
+
+def get_transport(transport: Union[str, Transport] = None) -> Transport:
+    """Return a transport instance
+
+    Parameters
+    ----------
+    transport: str or Transport, optional
+        A Transport instance, or the name of a built-in transport:  requests
+        (default), httpx, http2 (httpx with HTTP/2) or urllib3
+    """
+    if transport is None:
+        return RequestsTransport()
+    if isinstance(transport, str):
+        if transport == "http2":
+            return HttpxTransport(http2=True)
+        try:
+            return TRANSPORTS[transport]()
+        except KeyError:
+            raise ValueError(
+                f"transport must be one of:  {', '.join([*TRANSPORTS, 'http2'])}"
+            ) from None
+    return transport
+
+
+def _h2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+def _httpx_timeout(httpx, timeout):
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+        return httpx.Timeout(read, connect=connect)
+    return timeout
+
+
+def _file_field(value):
+    if isinstance(value, tuple):
+        filename, fileobj, *rest = value
+        content = fileobj.read() if hasattr(fileobj, "read") else fileobj
+        return (filename, content, *rest[:1])
+    name = getattr(value, "name", "file")
+    return (name, value.read())
@@ -0,0 +1,178 @@
+"""Create-or-update of users, contacts and transactions by an external key"""
+
+from typing import Iterable, NamedTuple
+
+from .coalesce import _normalize
+from .deadline import resolve
+from .exceptions import BrokermintError, DeadlineExceeded
+from .utils import as_records, concurrent_map
+
+
+CREATED = "created"
+UPDATED = "updated"
+UNCHANGED = "unchanged"
+FAILED = "failed"
+
+# resource -> (list method, create method, update method, fields required on update)
+RESOURCES = {
+    "users": (
+        "list_users",
+        "create_user",
+        "update_user",
+        ("email", "first_name", "last_name"),
+    ),
+    "contacts": ("list_contacts", "create_contact", "update_contact", ("email",)),
+    "transactions": (
+        "list_transactions",
+        "create_transactions",
+        "update_transaction",
+        (),
+    ),
+}
+
+# Resources whose list method returns short records unless full_info is set
+FULL_INFO = {"users", "contacts"}
+
+# key field -> list filter accepting a comma separated list of values
+FILTERS = {
+    "external_id": "external_ids",
+    "email": "emails",
+}
+
+
+class UpsertResult(NamedTuple):
+    """Outcome of upserting one record
+
+    key is the record's key value, action one of created, updated, unchanged or
+    failed, and result the API response, the existing record when unchanged, or
+    the exception when failed.
+    """
+
+    key: str
+    action: str
+    result: object
+
+
+def _matches(existing: dict, data: dict) -> bool:
+    return all(k in existing and existing[k] == v for k, v in data.items())
+
+
+def upsert(
+    client,
+    resource: str,
+    records: Iterable[dict],
+    *,
+    key: str = "external_id",
+    batch_size: int = 100,
+    max_workers: int = 8,
+    deadline: float = None,
+    raise_errors: bool = True,
+):
+    """Create records that do not exist yet and update those that changed
+
+    Existing records are found with one list request per batch_size keys, using
+    the comma separated external_ids (or emails) filter.  Creates and updates
+    are then sent concurrently, and updates whose fields already match the
+    server are skipped.  Records sharing a key are merged, later ones winning,
+    so a key is never created twice by the same call.
+
+    Parameters
+    ----------
+    client: Client, required
+        Client used to make requests
+    resource: str, required
+        One of users, contacts or transactions
+    records: iterable, required
+        Data of each record, including its key
+    key: str, default 'external_id', optional
+        Field identifying records, external_id or, for users and contacts, email
+    batch_size: int, default 100, optional
+        Number of keys looked up per list request
+    max_workers: int, default 8, optional
+        Maximum number of concurrent requests
+    deadline: float, optional
+        Budget, in seconds, for the whole upsert.  Results obtained before it
+        passes are still yielded
+    raise_errors: bool, default True, optional
+        Stop at the first failed create or update.  When False, failures are
+        yielded with the failed action
+
+    Yields
+    ------
+    UpsertResult
+        One per distinct key, in completion order
+    """
+    try:
+        list_method, create_method, update_method, required = RESOURCES[resource]
+    except KeyError:
+        raise ValueError(
+            f"resource must be one of:  {', '.join(RESOURCES)}"
+        ) from None
+    if key not in FILTERS or (resource == "transactions" and key != "external_id"):
+        raise ValueError(f"{resource} cannot be upserted by {key}")
+    by = FILTERS[key]
+    deadline = resolve(deadline)
+
+    wanted = {}
+    for record in records:
+        if record.get(key) in (None, ""):
+            raise ValueError(f"Every record must have a {key}")
+        value = _normalize(by, record[key])
+        wanted[value] = {**wanted.get(value, {}), **record}
+
+    filters = {"full_info": 1} if resource in FULL_INFO else {}
+
+    def lookup(batch):
+        found = {}
+        pages = client.paginate(list_method, **{by: ",".join(batch)}, **filters)
+        for page in pages:
+            for existing in as_records(page):
+                if existing.get(key) is not None:
+                    found.setdefault(_normalize(by, existing[key]), existing)
+        return found
+
+    values = list(wanted)
+    batches = [
+        tuple(values[i:i + batch_size]) for i in range(0, len(values), batch_size)
+    ]
+    existing, looked_up = {}, 0
+    for _, found in concurrent_map(
+        lookup, batches, max_workers=max_workers, deadline=deadline
+    ):
+        existing.update(found)
+        looked_up += 1
+    if looked_up < len(batches):
+
+        # Deadline passed:  records not looked up could be created twice
+        return
+
+    operations = []
+    for value, data in wanted.items():
+        current = existing.get(value)
+        if current is None:
+            operations.append((value, CREATED, data))
+        elif _matches(current, data):
+            yield UpsertResult(value, UNCHANGED, current)
+        else:
+            missing = {k: current[k] for k in required if k not in data and k in current}
+            operations.append((value, UPDATED, (current["id"], {**missing, **data})))
+
+    def apply(operation):
+        value, action, payload = operation
+        try:
+            if action == CREATED:
+                return getattr(client, create_method)(payload)
+            return getattr(client, update_method)(*payload)
+        except DeadlineExceeded:
+            raise
+        except BrokermintError as e:
+            if raise_errors:
+                raise
+            return e
+
+    for (value, action, _), result in concurrent_map(
+        apply, operations, max_workers=max_workers, deadline=deadline
+    ):
+        if isinstance(result, BrokermintError):
+            action = FAILED
+        yield UpsertResult(value, action, result)
@@ -0,0 +1,138 @@
+from typing import Iterable
+import importlib
+import itertools
+import threading
+
+
+def import_optional(name: str, extra: str):
+    """Import an optional dependency, raising a helpful error when missing
+
+    Parameters
+    ----------
+    name: str, required
+        Name of the module to import
+    extra: str, required
+        Name of the brokermint extra that installs the module
+    """
+    try:
+        return importlib.import_module(name)
+    except ImportError as e:
+        raise ImportError(
+            f"{name} is required for this feature.  Install it with:  "
+            f"pip install brokermint[{extra}]"
+        ) from e
+
+
+class StripedLock:
+    """Fixed set of locks, one picked per key by hash
+
+    Guards per-key state (endpoint groups, resources, ...) so that threads
+    working on different keys rarely wait on each other, without creating a
+    lock per key.
+
+    Parameters
+    ----------
+    stripes: int, default 16, optional
+        Number of locks
+    """
+
+    def __init__(self, stripes: int = 16):
+        self._locks = [threading.Lock() for _ in range(stripes)]
+
+    def __call__(self, key) -> threading.Lock:
+        return self._locks[hash(key) % len(self._locks)]
+
+
+def as_records(payload):
+    """Normalize an API response into a list of records
+
+    Parameters
+    ----------
+    payload: list or dict, required
+        Decoded response from the API
+    """
+    if payload is None:
+        return []
+    if isinstance(payload, list):
+        return payload
+    return [payload]
+
+
+def concurrent_map(func, items: Iterable, *, max_workers: int = 8, deadline=None):
+    """Apply a function to items across a thread pool
+
+    At most max_workers calls are in flight at once and results are yielded as
+    soon as they complete, not in input order.  The calling thread's deadline (see
+    brokermint.deadline) applies to every call; once it passes, outstanding calls
+    are abandoned and iteration stops, leaving the caller with partial results.
+
+    Parameters
+    ----------
+    func: callable, required
+        Function applied to each item
+    items: iterable, required
+        Items passed to func
+    max_workers: int, default 8, optional
+        Maximum number of concurrent calls
+    deadline: float, optional
+        Budget, in seconds, for all calls.  Can only shorten the current deadline
+    """
+    from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+    from .deadline import resolve, scope
+    from .exceptions import DeadlineExceeded
+
+    deadline = resolve(deadline)
+
+    def call(item):
+        with scope(deadline):
+            return func(item)
+
+    items = iter(items)
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    pending = {}
+    try:
+        for item in itertools.islice(items, max_workers):
+            pending[executor.submit(call, item)] = item
+        while pending:
+            timeout = deadline.remaining() if deadline is not None else None
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                return
+            for future in done:
+                item = pending.pop(future)
+                try:
+                    result = future.result()
+                except DeadlineExceeded:
+                    return
+                yield item, result
+                for nxt in itertools.islice(items, 1):
+                    pending[executor.submit(call, nxt)] = nxt
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=not pending)
+
+
+def missing_as(func, default=None):
+    """Wrap a function so NotFound errors return a default instead of raising
+
+    Bulk helpers use this so that a record deleted while they run is skipped
+    rather than aborting the whole job.
+
+    Parameters
+    ----------
+    func: callable, required
+        Function making a request
+    default: optional
+        Value returned when the API responds with 404
+    """
+    from .exceptions import NotFound
+
+    def wrapper(*args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        except NotFound:
+            return default
+
+    return wrapper
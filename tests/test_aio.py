@@ -0,0 +1,63 @@
+import asyncio
+import json
+
+import pytest
+
+pytest.importorskip("httpx")
+
+from brokermint import AsyncClient, Client, NotFound  # noqa: E402
+from brokermint.transport import Response  # noqa: E402
+
+
+class FakeAsyncTransport:
+    def __init__(self, pages):
+        self.pages = pages
+        self.requests = []
+        self.closed = False
+
+    async def request(self, method, url, *, params=None, **kwargs):
+        self.requests.append((method, url, params))
+        if url.endswith("/missing"):
+            return Response(404, b'{"message": "not found"}')
+        start = int(params.get("starting_from_id") or 0)
+        page = [r for r in self.pages if r["id"] >= start][: params["count"]]
+        return Response(200, json.dumps(page).encode())
+
+    async def aclose(self):
+        self.closed = True
+
+
+@pytest.mark.parametrize("option", ["journal", "hedge", "adaptive_paging", "session"])
+def test_client_only_options_are_rejected(option):
+    with pytest.raises(TypeError, match=option):
+        AsyncClient("key", **{option: True})
+
+
+@pytest.mark.parametrize(
+    "method",
+    ["walk_tasks", "scan", "to_frame", "snapshot", "upsert_users", "deadline"],
+)
+def test_synchronous_helpers_are_not_inherited(method):
+    assert hasattr(Client, method)
+    assert not hasattr(AsyncClient, method)
+
+
+def test_endpoint_methods_are_awaitable():
+    records = [{"id": i, "name": f"user {i}", "email": f"{i}@x"} for i in range(1, 6)]
+    transport = FakeAsyncTransport(records)
+
+    async def run():
+        async with AsyncClient("key", transport=transport) as client:
+            pages = [page async for page in client.paginate("list_users", count=2)]
+            with pytest.raises(NotFound):
+                await client.get_user("missing")
+            projected = await client.list_users(count=10, fields="name")
+        return pages, projected
+
+    pages, projected = asyncio.run(run())
+    assert [len(p) for p in pages] == [2, 2, 1]
+    assert [r["id"] for p in pages for r in p] == [1, 2, 3, 4, 5]
+    assert projected == [{"id": r["id"], "name": r["name"]} for r in records]
+    assert transport.requests[0][0] == "GET"
+    assert transport.requests[0][2]["api_key"] == "key"
+    assert transport.closed
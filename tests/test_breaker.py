@@ -0,0 +1,109 @@
+import time
+
+import pytest
+
+from brokermint import Client, InMemoryTransport, deadline
+from brokermint.breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from brokermint.exceptions import CircuitOpenError, DeadlineExceeded
+
+
+def open_breaker():
+    breaker = CircuitBreaker("transactions", min_requests=1, reset_timeout=0)
+    breaker.release(breaker.acquire(), False)
+    assert breaker.state == OPEN
+    return breaker
+
+
+def test_opens_on_failures():
+    breaker = CircuitBreaker("transactions", min_requests=4, reset_timeout=60)
+    for success in (True, False, True, False):
+        breaker.release(breaker.acquire(), success)
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.acquire()
+
+
+def test_probe_closes_circuit():
+    breaker = open_breaker()
+    probe = breaker.acquire()
+    assert breaker.state == HALF_OPEN
+    breaker.release(probe, True)
+    assert breaker.state == CLOSED
+
+
+def test_request_from_closed_circuit_does_not_close_half_open():
+    breaker = CircuitBreaker("transactions", min_requests=1, reset_timeout=0)
+    slow = breaker.acquire()
+    breaker.release(breaker.acquire(), False)
+    probe = breaker.acquire()
+    assert breaker.state == HALF_OPEN
+
+    breaker.release(slow, True)
+    assert breaker.state == HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.acquire()
+
+    breaker.release(probe, True)
+    assert breaker.state == CLOSED
+    assert breaker._probes == 0
+    assert breaker._in_flight == 0
+
+
+def test_stale_failure_does_not_reopen_half_open():
+    breaker = CircuitBreaker("transactions", min_requests=1, reset_timeout=0)
+    slow = breaker.acquire()
+    breaker.release(breaker.acquire(), False)
+    probe = breaker.acquire()
+
+    breaker.release(slow, False)
+    assert breaker.state == HALF_OPEN
+
+    breaker.release(probe, True)
+    assert breaker.state == CLOSED
+
+
+def test_probe_from_previous_half_open_is_ignored():
+    breaker = CircuitBreaker(
+        "transactions", min_requests=1, reset_timeout=0, half_open_max=2
+    )
+    breaker.release(breaker.acquire(), False)
+    slow_probe = breaker.acquire()
+    breaker.release(breaker.acquire(), False)
+    assert breaker.state == OPEN
+    probe = breaker.acquire()
+
+    breaker.release(slow_probe, True)
+    assert breaker.state == HALF_OPEN
+    assert breaker._probes == 1
+
+    breaker.release(probe, True)
+    assert breaker.state == CLOSED
+
+
+def test_release_without_outcome():
+    breaker = CircuitBreaker("transactions", min_requests=1, reset_timeout=0)
+    breaker.release(breaker.acquire(), None)
+    assert breaker.state == CLOSED
+
+    breaker.release(breaker.acquire(), False)
+    probe = breaker.acquire()
+    breaker.release(probe, None)
+    assert breaker.state == HALF_OPEN
+    breaker.release(breaker.acquire(), True)
+    assert breaker.state == CLOSED
+
+
+def test_deadline_timeout_is_not_a_failure():
+    class Transport(InMemoryTransport):
+        timeout_errors = (TimeoutError,)
+
+    def handler(method, path, params, body):
+        time.sleep(0.02)
+        raise TimeoutError()
+
+    client = Client(
+        "key", transport=Transport(handler), circuit_breaker={"min_requests": 1}
+    )
+    with deadline.scope(0.01), pytest.raises(DeadlineExceeded):
+        client.get_transaction(1)
+    assert client._breaker("transactions").state == CLOSED
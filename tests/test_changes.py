@@ -0,0 +1,92 @@
+import time
+
+import pytest
+
+from brokermint import ChangeDetector, Client, DeadlineExceeded, InMemoryTransport
+from brokermint.exceptions import ServerError
+
+
+RECORDS = [
+    {"id": 1, "status": "active", "updated_at": 1},
+    {"id": 2, "status": "closed", "updated_at": 1},
+]
+
+
+def handler(method, path, params, body):
+    if int(params.get("starting_from_id", 0)):
+        return []
+    statuses = params.get("statuses")
+    return [r for r in RECORDS if statuses is None or r["status"] in statuses]
+
+
+@pytest.fixture
+def client():
+    return Client("key", transport=InMemoryTransport(handler))
+
+
+def test_full_pull_detects_deletes(client):
+    detector = ChangeDetector()
+    detector.pull(client, "list_transactions")
+    RECORDS.append({"id": 3, "status": "active", "updated_at": 1})
+    try:
+        changes = detector.pull(client, "list_transactions", count=50)
+    finally:
+        RECORDS.pop()
+    assert [r["id"] for r in changes.inserts] == [3]
+    changes = detector.pull(client, "list_transactions")
+    assert changes.deletes == [3]
+
+
+def test_filtered_pull_does_not_report_deletes(client):
+    detector = ChangeDetector()
+    detector.pull(client, "list_transactions")
+    changes = detector.pull(client, "list_transactions", statuses="active")
+    assert not changes
+    assert len(detector) == 2
+
+
+def test_save_and_load_keep_ignored_fields(tmp_path, client):
+    path = str(tmp_path / "state.json")
+    detector = ChangeDetector(ignore=["updated_at"])
+    detector.pull(client, "list_transactions")
+    detector.save(path)
+
+    loaded = ChangeDetector.load(path)
+    assert loaded.ignore == {"updated_at"}
+    RECORDS[0]["updated_at"] = 2
+    try:
+        assert not loaded.pull(client, "list_transactions")
+    finally:
+        RECORDS[0]["updated_at"] = 1
+
+
+def test_failed_pull_leaves_state_untouched():
+    def failing(method, path, params, body):
+        if int(params.get("starting_from_id", 0)):
+            return 503, {"error": "Unavailable"}
+        return [{"id": 1}, {"id": 2}]
+
+    client = Client("key", transport=InMemoryTransport(failing))
+    detector = ChangeDetector()
+    with pytest.raises(ServerError):
+        detector.pull(client, "list_transactions", count=2)
+    assert len(detector) == 0
+
+
+def test_full_pull_cut_short_by_deadline_raises(client):
+    detector = ChangeDetector()
+    detector.pull(client, "list_transactions")
+
+    def slow(method, path, params, body):
+        time.sleep(0.05)
+        return handler(method, path, params, body)
+
+    client = Client("key", transport=InMemoryTransport(slow))
+    with client.deadline(0.02), pytest.raises(DeadlineExceeded):
+        detector.pull(client, "list_transactions", count=1)
+    assert len(detector) == 2
+
+
+def test_projected_pull_is_rejected(client):
+    with pytest.raises(ValueError):
+        ChangeDetector().pull(client, "list_transactions", fields="status")
@@ -0,0 +1,98 @@
+import threading
+import time
+
+import pytest
+
+from brokermint import Client, InMemoryTransport, LookupCoalescer, ServerError
+
+
+USERS = {f"user{i}@x.com": {"id": i, "email": f"User{i}@x.com"} for i in range(300)}
+
+
+def handler(method, path, params, body):
+    if int(params.get("starting_from_id", 0)):
+        return []
+    if "fail" in params["emails"]:
+        return 500, {"message": "boom"}
+    return [USERS[e] for e in params["emails"].split(",") if e in USERS]
+
+
+def make_client():
+    return Client("key", transport=InMemoryTransport(handler))
+
+
+def batches(client):
+    return [p["emails"].split(",") for _, _, p, _ in client.transport.requests]
+
+
+def test_lookups_within_window_share_a_request():
+    client = make_client()
+    emails = ["user1@x.com", "USER2@x.com", "user1@x.com", "nobody@x.com"]
+    results = [None] * len(emails)
+    start = threading.Barrier(len(emails))
+
+    def work(i):
+        start.wait()
+        results[i] = coalescer.get("users", "emails", emails[i], timeout=5)
+
+    with LookupCoalescer(client, window=0.2) as coalescer:
+        threads = [threading.Thread(target=work, args=(i,)) for i in range(len(emails))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert results == [USERS[e] if e in USERS else None for e in map(str.lower, emails)]
+    assert coalescer.requests == 1
+    assert sorted(batches(client)[0]) == ["nobody@x.com", "user1@x.com", "user2@x.com"]
+
+
+def test_lookups_after_window_get_a_new_request():
+    client = make_client()
+    with LookupCoalescer(client, window=0.01) as coalescer:
+        assert coalescer.get("users", "emails", "user1@x.com", timeout=5)["id"] == 1
+        time.sleep(0.05)
+        assert coalescer.get("users", "emails", "user2@x.com", timeout=5)["id"] == 2
+
+    assert batches(client) == [["user1@x.com"], ["user2@x.com"]]
+
+
+def test_full_batch_is_sent_before_window_ends():
+    client = make_client()
+    with LookupCoalescer(client, window=30, max_batch=100) as coalescer:
+        futures = [
+            coalescer.lookup("users", "emails", f"user{i}@x.com") for i in range(250)
+        ]
+        assert futures[0].result(timeout=5)["id"] == 0
+        assert futures[99].result(timeout=5)["id"] == 99
+        started = time.monotonic()
+
+    # Closing flushes what is left of the window
+    assert time.monotonic() - started < 5
+    assert [f.result()["id"] for f in futures] == list(range(250))
+    assert all(len(batch) <= 100 for batch in batches(client))
+    assert sum(len(batch) for batch in batches(client)) == 250
+
+
+def test_errors_reach_every_waiting_caller():
+    client = make_client()
+    with LookupCoalescer(client, window=0.1) as coalescer:
+        futures = [
+            coalescer.lookup("users", "emails", email)
+            for email in ("user1@x.com", "fail@x.com", "user1@x.com")
+        ]
+        for future in futures:
+            with pytest.raises(ServerError):
+                future.result(timeout=5)
+
+    assert coalescer.requests == 1
+
+
+def test_invalid_lookups_are_rejected():
+    with LookupCoalescer(make_client()) as coalescer:
+        with pytest.raises(ValueError, match="users by phones"):
+            coalescer.lookup("users", "phones", "555")
+        with pytest.raises(ValueError, match="commas"):
+            coalescer.lookup("users", "emails", "a@x.com,b@x.com")
+    with pytest.raises(RuntimeError):
+        coalescer.lookup("users", "emails", "user1@x.com")
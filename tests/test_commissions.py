@@ -0,0 +1,54 @@
+import pytest
+
+from brokermint import CommissionRollup
+
+np = pytest.importorskip("numpy")
+
+
+def ms(date: str) -> int:
+    return int(np.datetime64(date, "ms").astype(np.int64))
+
+
+def test_weeks_start_on_monday():
+    rollup = CommissionRollup(
+        [
+            {"user_id": 1, "amount": 1, "closing_date": ms("2024-01-07")},
+            {"user_id": 1, "amount": 2, "closing_date": ms("2024-01-08")},
+            {"user_id": 1, "amount": 4, "closing_date": ms("2024-01-14")},
+        ]
+    )
+    result = rollup.by_period("week")
+    assert result["period"].tolist() == [
+        np.datetime64("2024-01-01"),
+        np.datetime64("2024-01-08"),
+    ]
+    assert result["amount"].tolist() == [1, 6]
+
+
+def test_missing_keys_keep_integer_dtype():
+    rollup = CommissionRollup(
+        [
+            {"user_id": 7, "amount": 1},
+            {"user_id": None, "amount": 2},
+            {"user_id": 7, "amount": 4},
+            {"user_id": 12, "amount": 8},
+        ]
+    )
+    result = rollup.by_agent()
+    agents = result["agent"]
+    assert agents.dtype.kind == "i"
+    assert agents.mask.tolist() == [False, False, True]
+    assert agents.compressed().tolist() == [7, 12]
+    assert result["amount"].tolist() == [5, 8, 2]
+
+
+def test_keys_without_missing_values_are_plain_arrays():
+    rollup = CommissionRollup([{"user_id": 7, "commission_plan_id": 3, "amount": 1}])
+    result = rollup.group_by("agent", "plan")
+    assert not isinstance(result["agent"], np.ma.MaskedArray)
+    assert result["plan"].tolist() == [3]
+
+
+def test_unknown_period():
+    with pytest.raises(ValueError):
+        CommissionRollup([]).by_period("decade")
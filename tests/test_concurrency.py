@@ -0,0 +1,62 @@
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from brokermint import Client, InMemoryTransport
+from brokermint.breaker import CLOSED
+
+
+IDS = list(range(1, 301))
+
+
+def handler(method, path, params, body):
+    time.sleep(random.random() * 0.002)
+    if path == "/v2/transactions":
+        start, count = int(params.get("starting_from_id", 0)), int(params["count"])
+        return [{"id": i, "status": "closed"} for i in IDS if i >= start][:count]
+    if path.startswith("/v2/transactions/"):
+        return {"id": int(path.rsplit("/", 1)[1]), "status": "closed"}
+    return {"id": 1, "first_name": "Ann"}
+
+
+def test_shared_client_state_stays_consistent():
+    client = Client(
+        "key",
+        transport=InMemoryTransport(handler),
+        circuit_breaker=True,
+        hedge=True,
+        adaptive_paging=True,
+        intern_strings=True,
+    )
+    threads, gets = 32, 20
+    start = threading.Barrier(threads)
+
+    def work(worker):
+        start.wait()
+        for i in range(gets):
+            if i % 2:
+                assert client.get_transaction(i)["id"] == i
+            else:
+                assert client.get_user(i)["id"] == 1
+        pages = list(client.paginate("list_transactions"))
+        assert [r["id"] for page in pages for r in page] == IDS
+        return len(pages)
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        pages = sum(executor.map(work, range(threads)))
+
+    for breaker in client._breakers.values():
+        assert breaker.state == CLOSED
+        assert breaker._in_flight == 0
+        assert breaker._probes == 0
+
+    hedge = client.hedge
+    assert hedge.sent == threads * gets + pages
+    assert hedge.sent <= len(client.transport.requests) <= hedge.sent + hedge.hedged
+    assert hedge.hedged <= hedge.sent * hedge.budget + hedge.burst * len(client._breakers)
+    assert hedge.hedges_won <= hedge.hedged
+
+    for tuner in client._page_tuners.values():
+        assert tuner.min_count <= tuner.count <= tuner.max_count
+    hedge.close()
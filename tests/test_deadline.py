@@ -0,0 +1,36 @@
+import time
+
+import pytest
+
+from brokermint import Client, DeadlineExceeded, InMemoryTransport
+
+
+def test_unbounded_timeouts_use_remaining_budget():
+    for timeout in (None, (3, None)):
+        client = Client("key", transport=InMemoryTransport(lambda *a: {"id": 1}))
+        client.timeout = timeout
+        with client.deadline(5):
+            bounded = client._request_timeout()
+            assert client.get_transaction(1) == {"id": 1}
+        if timeout is None:
+            assert 0 < bounded <= 5
+        else:
+            assert bounded[0] == 3 and 0 < bounded[1] <= 5
+
+
+def slow_pages(method, path, params, body):
+    time.sleep(0.03)
+    start = int(params.get("starting_from_id", 0)) or 1
+    return [{"id": i} for i in range(start, start + int(params["count"]))]
+
+
+def test_paginate_stops_or_raises_at_deadline():
+    client = Client("key", transport=InMemoryTransport(slow_pages))
+    pages = list(client.paginate("list_transactions", count=2, deadline=0.1))
+    assert 1 <= len(pages) < 5
+
+    with pytest.raises(DeadlineExceeded):
+        for _ in client.paginate(
+            "list_transactions", count=2, deadline=0.1, partial=False
+        ):
+            pass
@@ -0,0 +1,16 @@
+from brokermint import Client, InMemoryTransport
+
+
+def handler(method, path, params, body):
+    return [{"id": i, "status": "closed", "city": f"city-{i}"} for i in range(1, 4)]
+
+
+def test_projected_fields_are_not_pooled():
+    client = Client("key", transport=InMemoryTransport(handler), intern_strings=True)
+    records = client.list_transactions(fields="status")
+    assert records == [{"id": i, "status": "closed"} for i in range(1, 4)]
+    assert "city-1" not in client.strings._strings
+    assert len(client.strings) == 3
+
+    client.list_transactions()
+    assert len(client.strings) == 7
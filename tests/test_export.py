@@ -0,0 +1,80 @@
+import json
+import os
+
+import pytest
+
+from brokermint import Client, InMemoryTransport
+
+
+def handler(method, path, params, body):
+    parts = path.strip("/").split("/")
+    if parts == ["v2", "transactions"]:
+        if int(params.get("starting_from_id", 0)):
+            return []
+        return [{"id": 1, "status": "closed"}, {"id": 2, "status": "closed"}]
+    transaction_id = int(parts[2])
+    if parts[-1] == "participants":
+        return {"users": [{"id": 10, "role": "agent"}], "contacts": []}
+    if parts[-1] == "checklists":
+        return [{"id": 100 + transaction_id, "name": "Closing"}]
+    if parts[-1] == "tasks":
+        return [{"id": 1000 + transaction_id, "name": "Sign"}]
+    if parts[-1] == "commissions":
+
+        # The amount is an integer for one transaction and a string for the
+        # other, so the two shards infer different types
+        amount = 5 if transaction_id == 1 else "5.5"
+        return [{"id": transaction_id, "amount": amount}]
+    return 404, {"error": "Not found"}
+
+
+def make_client():
+    return Client("key", transport=InMemoryTransport(handler), timeout=7)
+
+
+def test_worker_options_keep_client_settings():
+    options = Client(
+        "key", transport=InMemoryTransport(handler), circuit_breaker=True, timeout=7
+    )._worker_options()
+    assert isinstance(options["transport"], InMemoryTransport)
+    assert options["timeout"] == 7
+    assert options["circuit_breaker"] == {}
+
+    options = Client("key", transport="requests", hedge=True)._worker_options()
+    assert options["transport"] == "requests"
+    assert options["hedge"]["budget"] == 0.05
+
+
+def test_ndjson_export(tmp_path):
+    manifest = make_client().dump_account(str(tmp_path), workers=2)
+    assert manifest["totals"] == {
+        "transactions": 2,
+        "participants": 2,
+        "checklists": 2,
+        "tasks": 2,
+        "commissions": 2,
+    }
+    with open(tmp_path / "manifest.json") as f:
+        assert json.load(f)["totals"] == manifest["totals"]
+    tasks = []
+    for shard in manifest["shards"]:
+        with open(os.path.join(tmp_path, shard["files"]["tasks"]["path"])) as f:
+            tasks.extend(json.loads(line) for line in f)
+    assert sorted((t["transaction_id"], t["checklist_id"]) for t in tasks) == [
+        (1, 101),
+        (2, 102),
+    ]
+
+
+def test_parquet_shards_share_one_schema(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    manifest = make_client().dump_account(str(tmp_path), workers=2, format="parquet")
+    paths = [
+        os.path.join(tmp_path, shard["files"]["commissions"]["path"])
+        for shard in manifest["shards"]
+    ]
+    schemas = [pq.read_schema(path) for path in paths]
+    assert schemas[0].equals(schemas[1])
+    amounts = [pq.read_table(p).column("amount").to_pylist() for p in paths]
+    amounts = sorted(v for values in amounts for v in values)
+    assert amounts == ["5", "5.5"]
@@ -0,0 +1,78 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from brokermint import ChangeFeed, Client, InMemoryTransport
+
+
+def make_feed(records, overlap=1000):
+    def handler(method, path, params, body):
+        if int(params.get("starting_from_id", 0)):
+            return []
+        return records
+
+    client = Client("key", transport=InMemoryTransport(handler))
+    return ChangeFeed(client, overlap=overlap)
+
+
+def test_failing_subscriber_does_not_block_others(caplog):
+    feed = make_feed([{"id": 1, "status": "active"}])
+    received = []
+
+    def broken(changes):
+        raise RuntimeError("boom")
+
+    feed.subscribe("transactions", broken)
+    feed.subscribe("transactions", received.append)
+    changes = feed.poll("transactions")
+
+    assert received == [changes]
+    assert [r["id"] for r in changes.inserts] == [1]
+    assert "boom" in caplog.text
+
+
+def test_duplicates_within_overlap_window_are_dropped():
+    records = [{"id": 1, "status": "active"}]
+    feed = make_feed(records, overlap=60000)
+    feed.subscribe("transactions", lambda changes: None)
+
+    assert feed.poll("transactions").inserts == records
+    assert not feed.poll("transactions")
+    records[0] = {"id": 1, "status": "closed"}
+    assert [u.record for u in feed.poll("transactions").updates] == records
+
+
+def test_records_outside_overlap_window_are_forgotten():
+    feed = make_feed([{"id": 1, "status": "active"}], overlap=0)
+    feed.subscribe("transactions", lambda changes: None)
+    subscription = feed._subscriptions["transactions"]
+
+    feed.poll("transactions")
+    time.sleep(0.002)
+    feed.poll("transactions")
+    assert subscription.detector.state == {}
+    assert subscription.seen == {}
+
+
+def test_queue_outside_running_loop_requires_loop():
+    feed = make_feed([{"id": 1, "status": "active"}])
+    with pytest.raises(ValueError, match="loop="):
+        feed.subscribe("transactions", asyncio.Queue())
+    assert "transactions" not in feed._subscriptions
+
+
+def test_queue_receives_changes_on_its_loop():
+    feed = make_feed([{"id": 1, "status": "active"}])
+
+    async def run():
+        queue = feed.subscribe("transactions", asyncio.Queue())
+        poller = threading.Thread(target=feed.poll, args=("transactions",))
+        poller.start()
+        changes = await asyncio.wait_for(queue.get(), 5)
+        poller.join()
+        return changes
+
+    changes = asyncio.run(run())
+    assert [r["id"] for r in changes.inserts] == [1]
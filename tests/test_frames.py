@@ -0,0 +1,52 @@
+import pytest
+
+from brokermint.frames import ColumnBuilder, flatten_record
+
+
+def test_flatten_record():
+    record = {"id": 1, "address": {"city": "Denver", "geo": {"lat": 1.5}}}
+    assert flatten_record(record) == {
+        "id": 1,
+        "address.city": "Denver",
+        "address.geo.lat": 1.5,
+    }
+    assert flatten_record(record, sep="_")["address_city"] == "Denver"
+
+
+def test_empty_objects_are_missing():
+    builder = ColumnBuilder().add_batch(
+        [{"id": 1, "address": {}}, {"id": 2, "address": {"city": "Denver"}}]
+    )
+    assert builder.columns == {"id": [1, 2], "address.city": [None, "Denver"]}
+
+
+def test_columns_are_padded_across_batches():
+    builder = ColumnBuilder()
+    builder.add_batch([{"id": 1, "a": 1}])
+    builder.add_batch([{"id": 2, "b": 2}])
+    assert builder.columns == {"id": [1, 2], "a": [1, None], "b": [None, 2]}
+
+
+def test_timestamp_columns():
+    builder = ColumnBuilder().add_batch(
+        [
+            {"closing_date": 1700000000000, "price": 1700000000000},
+            {"closing_date": None},
+        ]
+    )
+    assert builder.timestamp_columns() == ["closing_date"]
+
+
+def test_arrow_mixed_values_keep_strings_unquoted():
+    pa = pytest.importorskip("pyarrow")
+    table = ColumnBuilder().add_batch(
+        [{"id": 1, "v": "x"}, {"id": 2, "v": 5}, {"id": 3, "v": None}]
+    ).to_arrow()
+    assert table.schema.field("v").type == pa.string()
+    assert table.column("v").to_pylist() == ["x", "5", None]
+
+
+def test_pandas_converts_timestamps():
+    pytest.importorskip("pandas")
+    df = ColumnBuilder().add_batch([{"id": 1, "created_at": 1700000000000}]).to_pandas()
+    assert "UTC" in str(df["created_at"].dtype)
@@ -0,0 +1,82 @@
+import threading
+import time
+
+import pytest
+
+from brokermint.hedge import HedgePolicy
+
+
+def warm(policy, group="transactions", seconds=0.001):
+    for _ in range(policy.min_samples):
+        policy.record(group, seconds)
+
+
+def test_slow_request_is_answered_by_hedge():
+    policy = HedgePolicy(min_samples=2, budget=1, min_delay=0.05)
+    warm(policy)
+    calls = []
+
+    def send():
+        calls.append(None)
+        if len(calls) == 1:
+            time.sleep(1)
+            return "slow"
+        return "hedge"
+
+    started = time.monotonic()
+    assert policy.send("transactions", send) == "hedge"
+    assert time.monotonic() - started < 0.5
+    assert policy.hedged == policy.hedges_won == 1
+    policy.close()
+
+
+def test_fast_request_is_not_hedged():
+    policy = HedgePolicy(min_samples=2, budget=1, min_delay=0.5)
+    warm(policy)
+    assert policy.send("transactions", lambda: "response") == "response"
+    assert policy.hedged == 0
+    policy.close()
+
+
+def test_request_without_budget_is_sent_from_calling_thread():
+    policy = HedgePolicy(min_samples=2, budget=0)
+    warm(policy)
+    threads = []
+
+    def send():
+        threads.append(threading.current_thread())
+        return "response"
+
+    assert policy.send("transactions", send) == "response"
+    assert threads == [threading.current_thread()]
+    policy.close()
+
+
+def test_hedge_answers_failed_request():
+    policy = HedgePolicy(min_samples=2, budget=1, min_delay=0.01)
+    warm(policy)
+    calls = []
+
+    def send():
+        calls.append(None)
+        if len(calls) == 1:
+            time.sleep(0.05)
+            raise ConnectionError()
+        time.sleep(0.1)
+        return "hedge"
+
+    assert policy.send("transactions", send) == "hedge"
+    policy.close()
+
+
+def test_error_raised_when_both_fail():
+    policy = HedgePolicy(min_samples=2, budget=1, min_delay=0.01)
+    warm(policy)
+
+    def send():
+        time.sleep(0.02)
+        raise ConnectionError()
+
+    with pytest.raises(ConnectionError):
+        policy.send("transactions", send)
+    policy.close()
@@ -0,0 +1,99 @@
+import pytest
+
+from brokermint import Client, InMemoryTransport, Journal, ValidationError
+from brokermint.journal import operation_key
+
+
+def make_client(journal, failing=()):
+    def handler(method, path, params, body):
+        contact_id = int(path.rsplit("/", 1)[1])
+        if contact_id in failing:
+            return 422, {"message": "invalid"}
+        return {"id": contact_id, **body}
+
+    return Client("key", transport=InMemoryTransport(handler), journal=journal)
+
+
+def updates(*ids):
+    return [("update_contact", (i,), {"data": {"email": f"{i}@x"}}) for i in ids]
+
+
+def test_resume_skips_completed_operations(tmp_path):
+    path = str(tmp_path / "journal.ndjson")
+    with Journal(path) as journal:
+        list(journal.resume(make_client(journal), updates(1, 2)))
+
+    with Journal(path) as journal:
+        client = make_client(journal)
+        results = list(journal.resume(client, updates(1, 2, 3)))
+
+    assert [r["id"] for _, r in results] == [3]
+    assert [r[1] for r in client.transport.requests] == ["/v1/contacts/3"]
+
+
+def test_resume_retries_failed_operations(tmp_path):
+    path = str(tmp_path / "journal.ndjson")
+    with Journal(path) as journal:
+        client = make_client(journal, failing={2})
+        results = list(journal.resume(client, updates(1, 2), raise_errors=False))
+        assert isinstance(results[1][1], ValidationError)
+        assert set(journal.failed()) == {operation_key(*updates(2)[0])}
+
+    with Journal(path) as journal:
+        skipped = make_client(journal)
+        assert list(journal.resume(skipped, updates(1, 2), retry_failed=False)) == []
+        client = make_client(journal)
+        results = list(journal.resume(client, updates(1, 2)))
+        assert [r["id"] for _, r in results] == [2]
+        assert journal.failed() == {}
+        assert skipped.transport.requests == []
+
+
+def test_resume_raises_at_first_failure(tmp_path):
+    with Journal(str(tmp_path / "journal.ndjson")) as journal:
+        client = make_client(journal, failing={1})
+        with pytest.raises(ValidationError):
+            list(journal.resume(client, updates(1, 2)))
+        assert len(client.transport.requests) == 1
+
+
+def test_replay_resends_unfinished_operations(tmp_path):
+    path = str(tmp_path / "journal.ndjson")
+    url = f"{Client.BASE_URL}/v1/contacts/7"
+    with Journal(path) as journal:
+        list(journal.resume(make_client(journal), updates(1)))
+
+        # Crash after the request was recorded but before its outcome
+        journal.start("crashed", "PUT", url, {"email": "7@x"})
+
+    with Journal(path) as journal:
+        assert list(journal.unfinished()) == ["crashed"]
+        client = make_client(journal)
+        assert list(journal.replay(client)) == [("crashed", {"id": 7, "email": "7@x"})]
+        assert client.transport.requests == [
+            ("PUT", "/v1/contacts/7", {"api_key": "key"}, {"email": "7@x"})
+        ]
+        assert journal.unfinished() == {}
+        assert "crashed" in journal.completed()
+
+
+def test_compact_keeps_state_across_reopen(tmp_path):
+    path = str(tmp_path / "journal.ndjson")
+    with Journal(path) as journal:
+        client = make_client(journal, failing={2})
+        list(journal.resume(client, updates(1, 2, 1), raise_errors=False))
+        journal.start("crashed", "DELETE", f"{Client.BASE_URL}/v1/contacts/9")
+        completed, failed = journal.completed(), journal.failed()
+        journal.compact()
+        entries = list(journal.entries())
+
+    assert len(entries) == 3
+    done = next(e for e in entries if e["e"] == "done")
+    assert "d" not in done and "u" not in done
+    with Journal(path) as journal:
+        assert journal.completed() == completed
+        assert journal.failed().keys() == failed.keys()
+        assert journal.failed()[next(iter(failed))]["d"] == {"email": "2@x"}
+        assert list(journal.unfinished()) == ["crashed"]
+        client = make_client(journal)
+        assert list(journal.resume(client, updates(1, 2), retry_failed=False)) == []
@@ -0,0 +1,64 @@
+import time
+
+import pytest
+
+from brokermint import Client, DeadlineExceeded, InMemoryTransport, ParticipantIndex
+
+
+TRANSACTIONS = {
+    1: {"id": 1, "status": "active"},
+    2: {"id": 2, "status": "active"},
+    3: {"id": 3, "status": "closed"},
+}
+
+
+def handler(method, path, params, body):
+    if path == "/v2/transactions":
+        if int(params.get("starting_from_id", 0)):
+            return []
+        return [
+            t
+            for t in TRANSACTIONS.values()
+            if t["status"] == params.get("statuses", t["status"])
+            and t.get("updated_at", 0) >= int(params.get("updated_since", 0))
+        ]
+    transaction_id = int(path.split("/")[3])
+    if transaction_id not in TRANSACTIONS:
+        return 404, {"error": "Not found"}
+    return {"users": [{"id": 10 + transaction_id, "role": "agent"}], "contacts": []}
+
+
+def test_refresh_reuses_filters_and_removes_deleted(tmp_path):
+    client = Client("key", transport=InMemoryTransport(handler))
+    path = str(tmp_path / "participants.json")
+    index = ParticipantIndex(path).build(client, statuses="active")
+    assert sorted(index._transactions) == [1, 2]
+    index.save()
+
+    index = ParticipantIndex(path)
+    assert index.filters == {"statuses": "active"}
+    TRANSACTIONS[4] = {"id": 4, "status": "active", "updated_at": 2 ** 62}
+    TRANSACTIONS[5] = {"id": 5, "status": "closed", "updated_at": 2 ** 62}
+    removed = TRANSACTIONS.pop(2)
+    try:
+        index.refresh(client)
+    finally:
+        TRANSACTIONS[2] = removed
+        del TRANSACTIONS[4], TRANSACTIONS[5]
+    assert sorted(index._transactions) == [1, 4]
+    assert index.transactions_for_user(12) == {}
+    assert index.transactions_for_user(14) == {4: "agent"}
+
+
+def test_build_cut_short_does_not_record_updated_since():
+    def slow(method, path, params, body):
+        if "participants" in path:
+            time.sleep(0.05)
+        return handler(method, path, params, body)
+
+    client = Client("key", transport=InMemoryTransport(slow))
+    index = ParticipantIndex()
+    with pytest.raises(DeadlineExceeded):
+        index.build(client, max_workers=1, deadline=0.08)
+    assert 0 < len(index) < 3
+    assert index.updated_since is None
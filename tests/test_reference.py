@@ -0,0 +1,113 @@
+import time
+
+import pytest
+
+from brokermint import Client, InMemoryTransport, ReferenceData, ServerError
+from brokermint.reference import USERS
+
+
+def make_store(state, **kwargs):
+    def handler(method, path, params, body):
+        if state.get("fail"):
+            return 500, {"message": "down"}
+        if path == "/v1/users":
+            if int(params.get("starting_from_id", 0)):
+                return []
+            return state["users"]
+        if path == "/v1/commission_plans":
+            return [{"id": 1, "name": "Standard"}]
+        if path == "/v2/reports":
+            return state["reports"]
+        report_id = int(path.split("/")[3])
+        if report_id not in state["filters"]:
+            return 404, {"message": "not found"}
+        return state["filters"][report_id]
+
+    client = Client("key", transport=InMemoryTransport(handler))
+    return ReferenceData(client, **kwargs)
+
+
+def make_state():
+    return {
+        "users": [{"id": 1, "first_name": "Ann"}],
+        "reports": [{"id": 10}, {"id": 11}, {"id": 12}],
+        "filters": {10: [{"name": "status"}], 11: [{"name": "price"}]},
+    }
+
+
+def test_failed_reload_keeps_serving_stale_rows():
+    state = make_state()
+    store = make_store(state, ttl=0.05).refresh()
+    state["fail"] = True
+    store.refresh(USERS)
+
+    assert store.user(1) == {"id": 1, "first_name": "Ann"}
+    assert isinstance(store._tables[USERS].error, ServerError)
+    time.sleep(0.06)
+    assert store.stale(USERS)
+    assert store.user(1) == {"id": 1, "first_name": "Ann"}
+
+    state["fail"] = False
+    state["users"] = [{"id": 1, "first_name": "Anne"}]
+    store.refresh(USERS)
+    assert store.user(1)["first_name"] == "Anne"
+    assert store._tables[USERS].error is None
+    assert not store.stale(USERS)
+
+
+def test_first_load_failure_raises():
+    store = make_store({"fail": True}, tables=["users"])
+
+    with pytest.raises(ServerError):
+        store.refresh()
+    assert store.age("users") is None
+
+
+def test_failed_reloads_back_off_exponentially():
+    state = make_state()
+    store = make_store(state, tables=["users"], ttl=10, refresh_ahead=0.5).refresh()
+    table = store._tables["users"]
+    state["fail"] = True
+
+    delays = []
+    for _ in range(4):
+        store.refresh("users")
+        delays.append(table.due - time.monotonic())
+    assert [round(d) for d in delays] == [2, 4, 5, 5]
+    assert table.failures == 4
+
+    state["fail"] = False
+    store.refresh("users")
+    assert table.failures == 0
+    assert round(table.due - time.monotonic()) == 5
+
+
+def test_report_filters_load_after_reports():
+    state = make_state()
+    store = make_store(state, tables=["report_filters"]).refresh()
+    paths = [path for _, path, _, _ in store.client.transport.requests]
+
+    assert paths[0] == "/v2/reports"
+    assert sorted(paths[1:]) == [f"/v2/reports/{i}/filters" for i in (10, 11, 12)]
+    assert store.report(12) == {"id": 12}
+    assert store.report_filters(10) == [{"name": "status"}]
+
+    # Reports deleted while their filters load are left out
+    assert store.report_filters(12) is None
+
+    state["reports"].append({"id": 13})
+    state["filters"][13] = [{"name": "agent"}]
+    store.refresh()
+    assert store.report_filters(13) == [{"name": "agent"}]
+
+
+def test_background_thread_reloads_tables():
+    state = make_state()
+    with make_store(state, tables=["users"], ttl=0.05, refresh_ahead=0.5) as store:
+        state["users"] = [{"id": 2, "first_name": "Bo"}]
+        for _ in range(100):
+            if store.user(2):
+                break
+            time.sleep(0.01)
+        assert store.user(2) == {"id": 2, "first_name": "Bo"}
+        assert store.user(1) is None
@@ -0,0 +1,76 @@
+import random
+import time
+
+import pytest
+
+from brokermint import Client, InMemoryTransport
+from brokermint.scan import estimate_id_range, split_range
+
+
+IDS = list(range(5, 20000, 7))
+
+
+def handler(method, path, params, body):
+    time.sleep(random.random() * 0.001)
+    start, count = int(params.get("starting_from_id") or 0), int(params["count"])
+    return [{"id": i} for i in IDS if i >= start][:count]
+
+
+def make_client():
+    return Client("key", transport=InMemoryTransport(handler))
+
+
+def test_unordered_scan_yields_every_record_once():
+    client = make_client()
+    pages = list(client.scan("list_contacts", shards=6, count=100))
+    ids = [r["id"] for page in pages for r in page]
+
+    assert sorted(ids) == IDS
+    assert len(ids) == len(IDS)
+
+    # Each shard stops at the start of the next, reading at most one page past it
+    reads = [p for _, _, p, _ in client.transport.requests if p["count"] == 100]
+    assert len(reads) <= len(IDS) // 100 + 2 * 6
+
+
+def test_ordered_scan_yields_records_in_id_order():
+    pages = list(make_client().scan("list_contacts", shards=6, ordered=True, count=100))
+
+    assert [r["id"] for page in pages for r in page] == IDS
+
+
+def test_scan_respects_starting_from_id():
+    pages = list(
+        make_client().scan("list_contacts", shards=4, count=50, starting_from_id=10000)
+    )
+
+    assert sorted(r["id"] for page in pages for r in page) == [
+        i for i in IDS if i >= 10000
+    ]
+
+
+def test_scan_of_empty_listing_yields_nothing():
+    client = Client("key", transport=InMemoryTransport(lambda *args: []))
+
+    assert list(client.scan("list_contacts")) == []
+
+
+def test_estimate_never_exceeds_highest_id():
+    low, high = estimate_id_range(make_client(), "list_contacts", resolution=10)
+
+    assert low == IDS[0]
+    assert IDS[-1] - 10 <= high <= IDS[-1]
+    assert high in IDS
+
+
+@pytest.mark.parametrize(
+    "low, high, shards", [(1, 100, 8), (5, 19997, 6), (10, 12, 8), (7, 7, 3)]
+)
+def test_split_range_covers_ids_without_overlap(low, high, shards):
+    ranges = split_range(low, high, shards)
+
+    assert len(ranges) == min(shards, high - low + 1)
+    assert ranges[0][0] == low
+    assert ranges[-1][1] is None
+    for (start, stop), (following, _) in zip(ranges, ranges[1:]):
+        assert start < stop == following
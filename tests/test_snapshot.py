@@ -0,0 +1,51 @@
+import os
+import threading
+
+import pytest
+
+from brokermint import Snapshot, SnapshotWriter
+from brokermint.snapshot import index_path
+
+
+def write(path, records):
+    with SnapshotWriter(path) as writer:
+        writer.write_many(records)
+
+
+def test_get_and_range(tmp_path):
+    path = str(tmp_path / "transactions.ndjson")
+    write(path, [[{"id": 3, "a": 1}, {"id": 1, "a": 2}], [{"id": 2, "a": 3}]])
+    with Snapshot(path) as snapshot:
+        assert len(snapshot) == 3
+        assert snapshot.get(1) == {"id": 1, "a": 2}
+        assert snapshot.get(4) is None
+        assert [r["id"] for r in snapshot.range(2)] == [2, 3]
+
+
+def replace_data_only(path, records):
+    """Leave the snapshot as a reader sees it between the writer's two renames"""
+    staging = f"{path}.new"
+    write(staging, records)
+    os.replace(staging, path)
+    return staging
+
+
+def test_data_replaced_before_index_is_rejected(tmp_path):
+    path = str(tmp_path / "transactions.ndjson")
+    write(path, [{"id": 1, "a": "old"}])
+    replace_data_only(path, [{"id": 1, "a": "new"}, {"id": 2, "a": "new"}])
+    with pytest.raises(ValueError):
+        Snapshot(path, timeout=0.05)
+
+
+def test_open_waits_for_index(tmp_path):
+    path = str(tmp_path / "transactions.ndjson")
+    write(path, [{"id": 1, "a": "old"}])
+    staging = replace_data_only(path, [{"id": 1, "a": "new"}, {"id": 2, "a": "new"}])
+    timer = threading.Timer(
+        0.05, os.replace, (index_path(staging), index_path(path))
+    )
+    timer.start()
+    with Snapshot(path) as snapshot:
+        assert snapshot.get(2) == {"id": 2, "a": "new"}
+    timer.join()
@@ -0,0 +1,60 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip("requests")
+
+from brokermint.transport import RequestsTransport  # noqa: E402
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    connections = 0
+    lock = threading.Lock()
+
+    def setup(self):
+        super().setup()
+        with self.lock:
+            type(self).connections += 1
+
+    def do_GET(self):
+        body = b'{"id": 1}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_threads_reuse_pooled_connections():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/v1/users/1"
+    transport = RequestsTransport()
+    threads = 4
+
+    def work(_):
+        for _ in range(5):
+            assert transport.request("GET", url, timeout=5).status_code == 200
+        return transport.session
+
+    try:
+
+        # Each executor starts threads, and sessions, of its own
+        sessions = set()
+        for _ in range(2):
+            with ThreadPoolExecutor(max_workers=threads) as executor:
+                sessions.update(executor.map(work, range(threads)))
+    finally:
+        transport.close()
+        server.shutdown()
+        server.server_close()
+
+    assert len(sessions) > threads
+    assert all(s.get_adapter(url) is transport.adapter for s in sessions)
+    assert Handler.connections <= threads
@@ -0,0 +1,25 @@
+from brokermint import Client, InMemoryTransport
+from brokermint.upsert import UNCHANGED, UPDATED
+
+
+CONTACT = {"id": 7, "email": "ann@example.com", "first_name": "Ann", "phone": "555"}
+
+
+def handler(method, path, params, body):
+    if method == "GET" and path == "/v1/contacts":
+        if int(params.get("starting_from_id", 0)):
+            return []
+        if int(params.get("full_info", 0)):
+            return [CONTACT]
+        return [{"id": 7, "email": "ann@example.com"}]
+    return {**CONTACT, **body}
+
+
+def test_lookup_compares_full_records():
+    client = Client("key", transport=InMemoryTransport(handler))
+    record = {"email": "ann@example.com", "phone": "555"}
+    [result] = client.upsert_contacts([record], key="email")
+    assert result.action == UNCHANGED
+
+    [result] = client.upsert_contacts([{**record, "phone": "556"}], key="email")
+    assert result.action == UPDATED